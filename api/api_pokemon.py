@@ -1,99 +1,157 @@
-import requests
+import sys
 from typing import Optional, Dict, Any
+from funciones.metricas import contar, medido
+from funciones.persistencia import avisador
 
-def obtener_generacion_pokemon(pokemon_data: Dict[str, Any]) -> str:
+# requests se importa dentro de cada función que consulta la PokéAPI: cargarlo tarda
+# y las operaciones locales (listar, buscar, filtrar) no lo necesitan
+
+
+def obtener_datos_especie(pokemon_data: Dict[str, Any], silencioso: bool = False) -> Dict[str, Any]:
     """
-    Obtiene la generación del Pokémon desde la species URL.
+    Obtiene la generación y los nombres localizados del Pokémon desde la species URL.
+    Ambos datos vienen en la misma respuesta, así que se hace una sola petición.
     
     Args:
         pokemon_data: Diccionario con los datos del Pokémon
+        silencioso: True para no mostrar mensajes
         
     Returns:
-        str: Nombre de la generación o "unknown" si no se puede obtener
+        dict: {"generacion": str, "nombres_localizados": {idioma: nombre}}
+              con "unknown" y {} si no se puede obtener
     """
+    import requests
+    
+    avisar = avisador(silencioso)
+    datos = {"generacion": "unknown", "nombres_localizados": {}}
+    
     try:
         # Validar que pokemon_data no sea None o vacío
         if not pokemon_data:
-            print("  [Advertencia] Datos del Pokémon vacíos")
-            return "unknown"
+            avisar("  [Advertencia] Datos del Pokémon vacíos", file=sys.stderr)
+            return datos
         
         # Validar que existe la estructura species
         if "species" not in pokemon_data:
-            print("  [Advertencia] No se encontró información de especies")
-            return "unknown"
+            avisar("  [Advertencia] No se encontró información de especies", file=sys.stderr)
+            return datos
         
         species_url = pokemon_data.get("species", {}).get("url")
         
         # Validar que la URL existe y es válida
         if not species_url or not isinstance(species_url, str):
-            print("  [Advertencia] URL de especies no válida")
-            return "unknown"
+            avisar("  [Advertencia] URL de especies no válida", file=sys.stderr)
+            return datos
         
         # Realizar petición con timeout
         response = requests.get(species_url, timeout=10)
+        contar("api.peticiones_http")
+        contar("api.bytes_descargados", len(response.content))
         response.raise_for_status()  # Lanza excepción si hay error HTTP
         
         species_data = response.json()
         
         # Validar estructura de la respuesta
         if not isinstance(species_data, dict):
-            print("  [Advertencia] Respuesta de especies con formato inválido")
-            return "unknown"
+            avisar("  [Advertencia] Respuesta de especies con formato inválido", file=sys.stderr)
+            return datos
         
         generation = species_data.get("generation", {}).get("name", "unknown")
         
         # Validar que la generación es un string
-        if not isinstance(generation, str):
-            return "unknown"
+        if isinstance(generation, str):
+            datos["generacion"] = generation
+        
+        # Nombres localizados: [{"language": {"name": "es"}, "name": "Pikachu"}, ...]
+        for entrada in species_data.get("names", []) or []:
+            try:
+                idioma = entrada["language"]["name"]
+                nombre = entrada["name"]
+                if isinstance(idioma, str) and isinstance(nombre, str) and nombre.strip():
+                    datos["nombres_localizados"][idioma] = nombre.strip()
+            except (KeyError, TypeError):
+                continue
         
-        return generation
+        return datos
         
     except requests.exceptions.Timeout:
-        print("  [Error] Timeout al obtener información de la generación")
-        return "unknown"
+        avisar("  [Error] Timeout al obtener información de la generación", file=sys.stderr)
+        return datos
     except requests.exceptions.ConnectionError:
-        print("  [Error] Error de conexión al obtener la generación")
-        return "unknown"
+        avisar("  [Error] Error de conexión al obtener la generación", file=sys.stderr)
+        return datos
     except requests.exceptions.HTTPError as e:
-        print(f"  [Error] Error HTTP al obtener la generación: {e}")
-        return "unknown"
+        avisar(f"  [Error] Error HTTP al obtener la generación: {e}", file=sys.stderr)
+        return datos
     except requests.exceptions.RequestException as e:
-        print(f"  [Error] Error en la petición de generación: {e}")
-        return "unknown"
+        avisar(f"  [Error] Error en la petición de generación: {e}", file=sys.stderr)
+        return datos
     except (ValueError, KeyError) as e:
-        print(f"  [Error] Error al procesar datos de generación: {e}")
-        return "unknown"
+        avisar(f"  [Error] Error al procesar datos de generación: {e}", file=sys.stderr)
+        return datos
     except Exception as e:
-        print(f"  [Error] Error inesperado al obtener generación: {e}")
-        return "unknown"
+        avisar(f"  [Error] Error inesperado al obtener generación: {e}", file=sys.stderr)
+        return datos
+
+
+def obtener_generacion_pokemon(pokemon_data: Dict[str, Any]) -> str:
+    """
+    Obtiene la generación del Pokémon desde la species URL.
+    
+    Args:
+        pokemon_data: Diccionario con los datos del Pokémon
+        
+    Returns:
+        str: Nombre de la generación o "unknown" si no se puede obtener
+    """
+    return obtener_datos_especie(pokemon_data)["generacion"]
 
 
-def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
+def formatear_nombres_localizados(nombres: Dict[str, str]) -> str:
+    """
+    Convierte los nombres localizados al texto que se guarda en el CSV.
+    
+    Args:
+        nombres: {idioma: nombre}
+        
+    Returns:
+        str: Por ejemplo "es:Pikachu|fr:Pikachu|ja:ピカチュウ"
+    """
+    return "|".join(f"{idioma}:{nombre.replace('|', ' ')}" for idioma, nombre in sorted(nombres.items()))
+
+
+@medido("api.obtener_pokemon")
+def obtener_pokemon(nombre: str, silencioso: bool = False) -> Optional[Dict[str, Any]]:
     """
     Obtiene los datos del Pokémon desde la PokéAPI.
     Detecta automáticamente la generación.
     
     Args:
         nombre: Nombre o ID del Pokémon a buscar
+        silencioso: True para no mostrar mensajes (consultas en segundo plano)
         
     Returns:
         Dict con los datos del Pokémon o None si no se encuentra/hay error
     """
+    import requests
+    
+    avisar = avisador(silencioso)
+    
     try:
         # Validar que el nombre no esté vacío
         if not nombre or not isinstance(nombre, str):
-            print("[Error] El nombre del Pokémon no puede estar vacío")
+            avisar("[Error] El nombre del Pokémon no puede estar vacío", file=sys.stderr)
             return None
         
         # Limpiar y validar el nombre
         nombre = nombre.strip()
         if not nombre:
-            print("[Error] El nombre del Pokémon no puede estar vacío")
+            avisar("[Error] El nombre del Pokémon no puede estar vacío", file=sys.stderr)
             return None
         
         # Validar longitud razonable del nombre
         if len(nombre) > 50:
-            print("[Error] El nombre del Pokémon es demasiado largo")
+            avisar("[Error] El nombre del Pokémon es demasiado largo", file=sys.stderr)
             return None
         
         # Construir URL
@@ -101,10 +159,12 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
         
         # Realizar petición con timeout
         response = requests.get(url, timeout=10)
+        contar("api.peticiones_http")
+        contar("api.bytes_descargados", len(response.content))
         
         # Verificar el código de estado
         if response.status_code == 404:
-            print(f"[Error] No se encontró el Pokémon '{nombre}' en la PokéAPI")
+            avisar(f"[Error] No se encontró el Pokémon '{nombre}' en la PokéAPI", file=sys.stderr)
             return None
         
         response.raise_for_status()  # Lanza excepción para otros errores HTTP
@@ -114,7 +174,7 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
         
         # Validar que la respuesta tiene la estructura esperada
         if not isinstance(data, dict):
-            print("[Error] Respuesta de la API con formato inválido")
+            avisar("[Error] Respuesta de la API con formato inválido", file=sys.stderr)
             return None
         
         # Validar campos obligatorios
@@ -122,25 +182,35 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
         campos_faltantes = [campo for campo in campos_requeridos if campo not in data]
         
         if campos_faltantes:
-            print(f"[Error] Faltan campos en la respuesta: {', '.join(campos_faltantes)}")
+            avisar(f"[Error] Faltan campos en la respuesta: {', '.join(campos_faltantes)}", file=sys.stderr)
             return None
         
         # Validar que types no esté vacío
         if not data["types"] or not isinstance(data["types"], list):
-            print("[Error] El Pokémon no tiene tipos definidos")
+            avisar("[Error] El Pokémon no tiene tipos definidos", file=sys.stderr)
             return None
         
-        # Obtener tipo principal con validación
+        # Obtener todos los tipos (ordenados por slot) con validación
         try:
-            tipo = data["types"][0]["type"]["name"]
-            if not isinstance(tipo, str):
-                tipo = "unknown"
-        except (KeyError, IndexError, TypeError):
-            print("  [Advertencia] No se pudo obtener el tipo, usando 'unknown'")
+            tipos = [
+                t["type"]["name"]
+                for t in sorted(data["types"], key=lambda t: t.get("slot", 0))
+                if isinstance(t, dict) and isinstance(t.get("type", {}).get("name"), str)
+            ]
+        except (KeyError, TypeError, AttributeError):
+            tipos = []
+        
+        # El tipo principal define la carpeta donde se guarda el Pokémon
+        if tipos:
+            tipo = tipos[0]
+        else:
+            avisar("  [Advertencia] No se pudo obtener el tipo, usando 'unknown'", file=sys.stderr)
             tipo = "unknown"
+            tipos = [tipo]
         
-        # Obtener generación automáticamente
-        generacion = obtener_generacion_pokemon(data)
+        # Obtener generación y nombres localizados (misma petición de especie)
+        especie = obtener_datos_especie(data, silencioso)
+        generacion = especie["generacion"]
         
         # Validar y convertir valores numéricos
         try:
@@ -148,12 +218,12 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
             altura = int(data["height"])
             peso = int(data["weight"])
         except (ValueError, TypeError) as e:
-            print(f"[Error] Error al convertir valores numéricos: {e}")
+            avisar(f"[Error] Error al convertir valores numéricos: {e}", file=sys.stderr)
             return None
         
         # Validar valores numéricos positivos
         if pokemon_id <= 0 or altura < 0 or peso < 0:
-            print("[Error] Los valores numéricos deben ser positivos")
+            avisar("[Error] Los valores numéricos deben ser positivos", file=sys.stderr)
             return None
         
         # Obtener base_experience con validación
@@ -162,7 +232,7 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
             if base_experience < 0:
                 base_experience = 0
         except (ValueError, TypeError):
-            print("  [Advertencia] Base experience inválida, usando 0")
+            avisar("  [Advertencia] Base experience inválida, usando 0", file=sys.stderr)
             base_experience = 0
         
         # Obtener habilidades con validación
@@ -178,7 +248,7 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
             else:
                 habilidades = "sin habilidades"
         except (KeyError, TypeError) as e:
-            print(f"  [Advertencia] Error al procesar habilidades: {e}")
+            avisar(f"  [Advertencia] Error al procesar habilidades: {e}", file=sys.stderr)
             habilidades = "sin habilidades"
         
         # Crear diccionario del Pokémon
@@ -186,35 +256,37 @@ def obtener_pokemon(nombre: str) -> Optional[Dict[str, Any]]:
             "id": pokemon_id,
             "nombre": data["name"],
             "tipo": tipo,
+            "tipos": ", ".join(tipos),
             "altura": altura,
             "peso": peso,
             "base_experience": base_experience,
             "habilidades": habilidades,
             "areas_encuentro": "",  # Se puede llenar después si se desea
-            "generacion": generacion
+            "generacion": generacion,
+            "nombres_localizados": formatear_nombres_localizados(especie["nombres_localizados"])
         }
         
-        print("\n✓ Pokémon agregado a la Pokédex correctamente:")
+        avisar("\n✓ Pokémon agregado a la Pokédex correctamente:")
         for k, v in pokemon.items():
-            print(f"  {k.capitalize()}: {v}")
+            avisar(f"  {k.capitalize()}: {v}")
         
         return pokemon
         
     except requests.exceptions.Timeout:
-        print(f"[Error] Timeout al buscar el Pokémon '{nombre}'")
+        avisar(f"[Error] Timeout al buscar el Pokémon '{nombre}'", file=sys.stderr)
         return None
     except requests.exceptions.ConnectionError:
-        print(f"[Error] Error de conexión. Verifica tu conexión a internet")
+        avisar(f"[Error] Error de conexión. Verifica tu conexión a internet", file=sys.stderr)
         return None
     except requests.exceptions.HTTPError as e:
-        print(f"[Error] Error HTTP al buscar el Pokémon: {e}")
+        avisar(f"[Error] Error HTTP al buscar el Pokémon: {e}", file=sys.stderr)
         return None
     except requests.exceptions.RequestException as e:
-        print(f"[Error] Error en la petición: {e}")
+        avisar(f"[Error] Error en la petición: {e}", file=sys.stderr)
         return None
     except (ValueError, KeyError, TypeError) as e:
-        print(f"[Error] Error al procesar los datos del Pokémon: {e}")
+        avisar(f"[Error] Error al procesar los datos del Pokémon: {e}", file=sys.stderr)
         return None
     except Exception as e:
-        print(f"[Error] Error inesperado: {e}")
+        avisar(f"[Error] Error inesperado: {e}", file=sys.stderr)
         return None
\ No newline at end of file
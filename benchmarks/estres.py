@@ -0,0 +1,398 @@
+import os
+import io
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import traceback
+from contextlib import redirect_stdout
+
+# Prueba de estrés de la persistencia con varios hilos.
+#
+# Genera una pokédex sintética en una carpeta temporal y, durante un tiempo fijo,
+# ejecuta a la vez N hilos que escriben (altas, modificaciones y bajas) y M hilos
+# que leen (búsquedas, filtros, listados ordenados, lectura de los CSV y consultas
+# del modo servidor). Al terminar comprueba que:
+#   - el índice en memoria coincide, Pokémon por Pokémon y campo por campo, con
+#     lo que quedó en los CSV (sin volver a cargarlo);
+#   - las permutaciones y los índices invertidos coinciden con los registros;
+#   - cada Pokémon tocado quedó como lo dejó su escritor (cada escritor trabaja
+#     sobre nombres propios, así el resultado final no depende del intercalado);
+#   - no hay nombres repetidos, el manifiesto cuenta las mismas filas y no quedan
+#     archivos temporales.
+# Termina con código 1 si algo no coincide o alguna operación lanzó una excepción.
+#
+#   python -m benchmarks.estres                                   # 4 escritores, 8 lectores, 10 s
+#   python -m benchmarks.estres --escritores 8 --lectores 16 --segundos 30 --semilla 7
+#
+# La misma semilla genera los mismos datos y la misma secuencia de operaciones de
+# cada hilo; el intercalado entre hilos lo decide el sistema operativo.
+
+# Permite también `python benchmarks/estres.py` desde cualquier carpeta
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from benchmarks.rendimiento import (
+    GENERACIONES, TIPOS_PRINCIPALES, generar_pokedex, termino_con_error, reiniciar_estado
+)
+from funciones.persistencia import (
+    CAMPOS, leer_recursivo, iterar_recursivo, guardar_pokemon, modificar_pokemon, eliminar_pokemon, cargar_indice
+)
+from funciones.concurrencia import BLOQUEO_POKEDEX, lectura
+from funciones.indice import (
+    INDICE, clave_pokemon, clave_id, tipos_de, habilidades_de, obtener_registros,
+    ordenar_pokemon, pokemon_de_tipos
+)
+from funciones.busqueda import buscar_pokemon_por_similitud, buscar_por_habilidad, buscar_por_id
+from funciones.particiones import listar_particiones
+from funciones.servidor import resolver_consulta
+
+# Reparto de las operaciones de cada escritor (alta, modificación, baja)
+PESOS_ESCRITURA = {"guardar": 4, "modificar": 4, "eliminar": 2}
+
+# Cuántos errores mostrar como máximo por cada comprobación
+MAXIMO_ERRORES_MOSTRADOS = 10
+
+
+def fila_nueva(nombre, numero, azar):
+    """
+    Datos de un Pokémon agregado durante la prueba (como los de generar_pokedex).
+    """
+    tipo = azar.choice(list(TIPOS_PRINCIPALES))
+    return {
+        "id": str(numero), "nombre": nombre, "tipo": tipo, "tipos": tipo,
+        "altura": str(azar.randint(1, 200)), "peso": str(azar.randint(1, 9999)),
+        "base_experience": str(azar.randint(36, 390)), "habilidades": "estres-habilidad",
+        "areas_encuentro": "", "generacion": azar.choice(list(GENERACIONES)),
+        "nombres_localizados": "",
+    }
+
+
+def escritor(numero, propios, esperado, contexto):
+    """
+    Hilo escritor: altas, modificaciones y bajas sobre sus propios nombres.
+
+    Args:
+        numero: Número del escritor (se usa en los nombres nuevos y en la semilla)
+        propios: Nombres originales que solo modifica o elimina este escritor
+        esperado: dict nombre -> campos esperados al final (None si se eliminó)
+        contexto: Estado compartido de la prueba
+    """
+    azar = random.Random(contexto["semilla"] * 1000 + numero)
+    vivos = list(propios)
+    agregados = 0
+    operaciones = list(PESOS_ESCRITURA)
+    pesos = list(PESOS_ESCRITURA.values())
+
+    while not contexto["fin"].is_set():
+        operacion = azar.choices(operaciones, pesos)[0]
+        try:
+            if operacion == "guardar" or not vivos:
+                agregados += 1
+                nombre = f"estres{numero}x{agregados}"
+                fila = fila_nueva(nombre, 100000 * (numero + 1) + agregados, azar)
+                guardar_pokemon(fila, "pokedex", silencioso=True)
+                esperado[nombre] = dict(fila)
+                vivos.append(nombre)
+                operacion = "guardar"
+
+            elif operacion == "modificar":
+                nombre = azar.choice(vivos)
+                campo, valor = azar.choice([
+                    ("peso", str(azar.randint(1, 9999))),
+                    ("altura", str(azar.randint(1, 200))),
+                    ("habilidades", f"estres-{azar.randint(1, 5)}, estres-comun"),
+                ])
+                if not modificar_pokemon(nombre, campo, valor, "pokedex"):
+                    raise AssertionError(f"modificar_pokemon({nombre!r}) devolvió False")
+                if esperado.get(nombre) is None:
+                    esperado[nombre] = {}
+                esperado[nombre][campo] = valor
+
+            else:
+                nombre = vivos.pop(azar.randrange(len(vivos)))
+                if not eliminar_pokemon(nombre, "pokedex"):
+                    raise AssertionError(f"eliminar_pokemon({nombre!r}) devolvió False")
+                esperado[nombre] = None
+
+            contexto["contar"](f"escritura.{operacion}")
+
+        except Exception:
+            contexto["error"](f"escritor {numero} ({operacion})", traceback.format_exc())
+
+
+def lector(numero, contexto):
+    """
+    Hilo lector: consultas variadas; cada una comprueba lo que puede de su resultado.
+    """
+    azar = random.Random(contexto["semilla"] * 1000 + 500 + numero)
+    nombres = contexto["nombres"]
+    tipos = list(TIPOS_PRINCIPALES)
+
+    def buscar_nombre():
+        for pokemon, similitud in buscar_pokemon_por_similitud(termino_con_error(azar.choice(nombres), azar), 60):
+            assert isinstance(pokemon, dict) and similitud >= 60, (pokemon, similitud)
+
+    def buscar_habilidad():
+        for pokemon, habilidad, _ in buscar_por_habilidad("estres-comun", 80):
+            assert isinstance(pokemon, dict) and habilidad, pokemon
+
+    def buscar_ids():
+        desde = azar.randint(1, len(nombres))
+        filas = buscar_por_id(f"{desde}-{desde + 50}")
+        ids = [clave_id(p) for p in filas]
+        assert ids == sorted(ids) and all(desde <= i <= desde + 50 for i in ids), ids
+
+    def listado_ordenado():
+        # Dentro de una misma lectura el índice no puede estar a medio actualizar
+        with lectura(BLOQUEO_POKEDEX):
+            registros = obtener_registros()
+            por_nombre = ordenar_pokemon(registros, "nombre", azar.random() < 0.5, completa=True)
+            assert len(por_nombre) == len(registros) == len(INDICE["orden_id"]), \
+                (len(por_nombre), len(registros), len(INDICE["orden_id"]))
+
+    def filtrar_tipo():
+        tipo = azar.choice(tipos)
+        assert all(tipo in tipos_de(p) for p in pokemon_de_tipos([tipo])), tipo
+
+    def consulta_servidor():
+        codigo, datos = resolver_consulta("/filtrar", {"tipo": [azar.choice(tipos)], "orden": ["3"]})
+        assert codigo == 200 and datos["total"] >= len(datos["resultados"]), (codigo, datos)
+
+    def leer_csv():
+        # Sin el índice: las filas de los CSV nunca se ven a medio escribir
+        for fila in iterar_recursivo("pokedex"):
+            assert clave_pokemon(fila), fila
+
+    consultas = [
+        (buscar_nombre, 4), (buscar_habilidad, 2), (buscar_ids, 3), (listado_ordenado, 3),
+        (filtrar_tipo, 3), (consulta_servidor, 2), (leer_csv, 1),
+    ]
+    funciones = [c for c, _ in consultas]
+    pesos = [p for _, p in consultas]
+
+    while not contexto["fin"].is_set():
+        consulta = azar.choices(funciones, pesos)[0]
+        try:
+            cargar_indice("pokedex")
+            consulta()
+            contexto["contar"](f"lectura.{consulta.__name__}")
+        except Exception:
+            contexto["error"](f"lector {numero} ({consulta.__name__})", traceback.format_exc())
+
+
+def comparar_indice_con_csv():
+    """
+    Compara el índice en memoria (tal como lo dejaron las escrituras) con los CSV.
+
+    Returns:
+        list: Diferencias encontradas (vacía si coinciden)
+    """
+    diferencias = []
+    filas = leer_recursivo("pokedex")
+    en_disco = {}
+    for fila in filas:
+        clave = clave_pokemon(fila)
+        if clave in en_disco:
+            diferencias.append(f"{clave}: repetido en los CSV")
+        en_disco[clave] = fila
+
+    with lectura(BLOQUEO_POKEDEX):
+        registros = INDICE["registros"]
+
+        for clave in sorted(set(en_disco) - set(registros)):
+            diferencias.append(f"{clave}: está en los CSV y no en el índice")
+        for clave in sorted(set(registros) - set(en_disco)):
+            diferencias.append(f"{clave}: está en el índice y no en los CSV")
+
+        for clave in sorted(set(registros) & set(en_disco)):
+            for campo in CAMPOS:
+                en_indice = str(registros[clave].get(campo) or "")
+                en_csv = str(en_disco[clave].get(campo) or "")
+                if en_indice != en_csv:
+                    diferencias.append(f"{clave}.{campo}: índice {en_indice!r}, CSV {en_csv!r}")
+
+        # Permutaciones e índices invertidos armados de nuevo desde los registros
+        if INDICE["orden_nombre"] != sorted(registros):
+            diferencias.append("orden_nombre no coincide con los registros")
+        if INDICE["orden_id"] != sorted((clave_id(p), c) for c, p in registros.items()):
+            diferencias.append("orden_id no coincide con los registros")
+
+        por_tipo = {}
+        por_habilidad = {}
+        for clave, pokemon in registros.items():
+            for tipo in tipos_de(pokemon):
+                por_tipo.setdefault(tipo, set()).add(clave)
+            for habilidad in habilidades_de(pokemon):
+                por_habilidad.setdefault(habilidad, set()).add(clave)
+        if {t: set(c) for t, c in INDICE["por_tipo"].items()} != por_tipo:
+            diferencias.append("por_tipo no coincide con los registros")
+        if {h: set(c) for h, c in INDICE["por_habilidad"].items()} != por_habilidad:
+            diferencias.append("por_habilidad no coincide con los registros")
+
+    return diferencias
+
+
+def comparar_esperado(esperados):
+    """
+    Compara lo que cada escritor dejó con lo que hay en los CSV.
+
+    Returns:
+        list: Diferencias encontradas
+    """
+    diferencias = []
+    en_disco = {clave_pokemon(fila): fila for fila in leer_recursivo("pokedex")}
+
+    for esperado in esperados:
+        for nombre, campos in esperado.items():
+            fila = en_disco.get(nombre)
+            if campos is None:
+                if fila is not None:
+                    diferencias.append(f"{nombre}: se eliminó y sigue en los CSV")
+            elif fila is None:
+                diferencias.append(f"{nombre}: falta en los CSV")
+            else:
+                for campo, valor in campos.items():
+                    if str(fila.get(campo) or "") != valor:
+                        diferencias.append(f"{nombre}.{campo}: esperado {valor!r}, CSV {fila.get(campo)!r}")
+
+    return diferencias
+
+
+def comparar_manifiesto():
+    """
+    Compara las filas contadas en el manifiesto con las de los CSV y busca temporales.
+
+    Returns:
+        list: Diferencias encontradas
+    """
+    diferencias = []
+    total_manifiesto = sum(datos["filas"] for datos in listar_particiones("pokedex").values())
+    total_csv = len(leer_recursivo("pokedex"))
+    if total_manifiesto != total_csv:
+        diferencias.append(f"manifiesto: {total_manifiesto} filas, CSV: {total_csv}")
+
+    for carpeta, _, archivos in os.walk("pokedex"):
+        for archivo in archivos:
+            if archivo.endswith(".tmp"):
+                diferencias.append(f"archivo temporal sin borrar: {os.path.join(carpeta, archivo)}")
+
+    return diferencias
+
+
+def ejecutar_estres(args):
+    """
+    Genera la pokédex, corre los hilos durante el tiempo pedido y comprueba el resultado.
+
+    Returns:
+        dict: {"operaciones", "errores", "diferencias"}
+    """
+    carpeta = tempfile.mkdtemp(prefix="pokedex_estres_", dir=args.carpeta)
+    anterior = os.getcwd()
+
+    try:
+        nombres = generar_pokedex(carpeta, args.filas, args.semilla)
+
+        # Las funciones del sistema trabajan sobre ./pokedex
+        os.chdir(carpeta)
+        reiniciar_estado()
+        cargar_indice("pokedex")
+
+        bloqueo = threading.Lock()
+        operaciones = {}
+        errores = []
+
+        def contar(nombre):
+            with bloqueo:
+                operaciones[nombre] = operaciones.get(nombre, 0) + 1
+
+        def error(quien, detalle):
+            with bloqueo:
+                errores.append((quien, detalle))
+
+        contexto = {"semilla": args.semilla, "nombres": nombres, "fin": threading.Event(),
+                    "contar": contar, "error": error}
+
+        # Cada escritor modifica y elimina solo sus nombres: el resultado final es conocido
+        azar = random.Random(args.semilla)
+        elegidos = azar.sample(nombres, min(len(nombres), 20 * args.escritores))
+        esperados = [{} for _ in range(args.escritores)]
+        hilos = [threading.Thread(target=escritor, args=(i, elegidos[i::args.escritores], esperados[i], contexto))
+                 for i in range(args.escritores)]
+        hilos += [threading.Thread(target=lector, args=(i, contexto)) for i in range(args.lectores)]
+
+        print(f"{args.filas} Pokémon, {args.escritores} escritores, {args.lectores} lectores, "
+              f"{args.segundos:g} s...", file=sys.stderr)
+
+        # Los mensajes de las operaciones no interesan aquí; los avisos sí
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            for hilo in hilos:
+                hilo.start()
+            time.sleep(args.segundos)
+            contexto["fin"].set()
+            for hilo in hilos:
+                hilo.join()
+
+            diferencias = comparar_indice_con_csv() + comparar_esperado(esperados) + comparar_manifiesto()
+
+        for linea in salida.getvalue().splitlines():
+            if "AVISO" in linea:
+                errores.append(("aviso", linea.strip()))
+
+        return {"operaciones": operaciones, "errores": errores, "diferencias": diferencias}
+
+    finally:
+        os.chdir(anterior)
+        reiniciar_estado()
+        if args.conservar:
+            print(f"Pokédex conservada en {carpeta}", file=sys.stderr)
+        else:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.estres",
+        description="Prueba de estrés de la persistencia con escritores y lectores concurrentes."
+    )
+    parser.add_argument("--filas", type=int, default=2000, help="Pokémon de la pokédex generada (default: 2000)")
+    parser.add_argument("--escritores", type=int, default=4, help="hilos que escriben (default: 4)")
+    parser.add_argument("--lectores", type=int, default=8, help="hilos que leen (default: 8)")
+    parser.add_argument("--segundos", type=float, default=10, help="duración de la prueba (default: 10)")
+    parser.add_argument("--semilla", type=int, default=42, help="semilla de los datos y las operaciones (default: 42)")
+    parser.add_argument("--carpeta", help="dónde generar la pokédex (default: carpeta temporal)")
+    parser.add_argument("--conservar", action="store_true", help="no borrar la pokédex generada")
+    return parser
+
+
+def main(argumentos=None):
+    args = construir_parser().parse_args(argumentos)
+    args.escritores = max(1, args.escritores)
+    args.lectores = max(0, args.lectores)
+
+    resultado = ejecutar_estres(args)
+
+    print("\nOperaciones:", file=sys.stderr)
+    for nombre, cantidad in sorted(resultado["operaciones"].items()):
+        print(f"  {nombre:<32}{cantidad:>8}", file=sys.stderr)
+
+    for titulo, problemas in (("Errores", resultado["errores"]), ("Diferencias", resultado["diferencias"])):
+        print(f"\n{titulo}: {len(problemas)}", file=sys.stderr)
+        for problema in problemas[:MAXIMO_ERRORES_MOSTRADOS]:
+            print(f"  {problema if isinstance(problema, str) else ': '.join(problema)}", file=sys.stderr)
+
+    if resultado["errores"] or resultado["diferencias"]:
+        print("\nEl índice, los CSV o las operaciones no son consistentes.", file=sys.stderr)
+        return 1
+
+    print("\nÍndice y CSV consistentes.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
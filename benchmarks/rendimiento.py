@@ -0,0 +1,530 @@
+import os
+import io
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+from contextlib import redirect_stdout
+
+# Benchmarks de la Pokédex con datos sintéticos.
+#
+# Genera carpetas pokedex/ de distintos tamaños (con generaciones y tipos repartidos
+# como en la Pokédex real), mide las operaciones de persistencia, filtros, búsqueda
+# y estadísticas, y guarda los tiempos en JSON. Con --comparar se contrastan contra
+# un resultado anterior y el programa termina con código 1 si algo empeoró.
+#
+#   python -m benchmarks.rendimiento                              # 1.000, 10.000 y 100.000 filas
+#   python -m benchmarks.rendimiento --filas 1000 1000000 --salida actual.json
+#   python -m benchmarks.rendimiento --comparar base.json --tolerancia 0.25
+#
+# Con 1.000.000 de filas, leer_recursivo arma un millón de diccionarios: hace falta
+# alrededor de 1,5 GB de memoria libre.
+
+# Permite también `python benchmarks/rendimiento.py` desde cualquier carpeta
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from funciones.persistencia import CAMPOS, leer_recursivo, guardar_pokemon, modificar_pokemon, eliminar_pokemon, cargar_indice
+from funciones.filtros import filtrar_por_criterio_recursivo, obtener_valores_unicos_recursivo
+from funciones.busqueda import buscar_pokemon_por_similitud, CACHE_BUSQUEDAS
+from funciones.indice import reiniciar_indice
+from funciones.crud import estadisticas
+
+# Cantidad de Pokémon por generación en la Pokédex real (se usa como peso)
+GENERACIONES = {
+    "generation-i": 151, "generation-ii": 100, "generation-iii": 135,
+    "generation-iv": 107, "generation-v": 156, "generation-vi": 72,
+    "generation-vii": 88, "generation-viii": 96, "generation-ix": 120,
+}
+
+# Frecuencia aproximada de cada tipo como tipo principal y como secundario
+TIPOS_PRINCIPALES = {
+    "water": 134, "normal": 118, "grass": 103, "bug": 84, "fire": 72, "psychic": 70,
+    "electric": 61, "rock": 58, "dark": 46, "fighting": 43, "poison": 42, "ghost": 42,
+    "ground": 41, "dragon": 39, "ice": 36, "steel": 34, "fairy": 30, "flying": 9,
+}
+TIPOS_SECUNDARIOS = {
+    "flying": 98, "poison": 35, "ground": 35, "psychic": 34, "fairy": 30, "steel": 27,
+    "fighting": 27, "dragon": 26, "dark": 24, "ghost": 22, "grass": 20, "water": 18,
+    "rock": 15, "ice": 15, "normal": 12, "fire": 12, "electric": 11, "bug": 5,
+}
+PROBABILIDAD_DOBLE_TIPO = 0.45
+
+SILABAS = ["ba", "be", "bu", "cha", "chu", "da", "do", "fe", "ga", "go", "ki", "ko",
+           "la", "lu", "ma", "mi", "mo", "na", "ni", "no", "pa", "pi", "po", "ra",
+           "ri", "ro", "sa", "se", "so", "ta", "te", "to", "tu", "va", "vi", "za",
+           "ze", "zo", "ly", "rex"]
+
+# Los tiempos menores a esto (en segundos) son ruido: no se marcan como regresión
+MINIMO_COMPARABLE = 0.001
+
+# Los filtros recursivos hacen una llamada por fila: se miden en un hilo con una pila
+# más grande y el límite de recursión subido a las filas más este margen
+MARGEN_RECURSION = 1000
+PILA_RECURSIVA = 512 * 1024 * 1024
+# Cada llamada guarda su propia copia del resto de la lista (datos[1:]): la memoria
+# crece con el cuadrado de las filas, así que por encima de esto no se ejecutan
+FILAS_MAXIMAS_RECURSIVAS = 20000
+
+
+def nombre_sintetico(numero):
+    """
+    Nombre pronunciable y único para cada número (de 1 a 4 sílabas).
+    La multiplicación por un primo reparte los nombres para que no salgan en orden.
+    """
+    espacio = len(SILABAS) ** 4
+    codigo = (numero * 7919 + 13) % espacio
+    partes = []
+    while True:
+        codigo, resto = divmod(codigo, len(SILABAS))
+        partes.append(SILABAS[resto])
+        if not codigo:
+            break
+    return "".join(partes)
+
+
+def generar_pokedex(destino, filas, semilla=42):
+    """
+    Escribe una pokédex sintética (destino/pokedex/<generacion>/<tipo>/pokemon.csv).
+
+    Args:
+        destino: Carpeta donde crear pokedex/
+        filas: Cantidad de Pokémon
+        semilla: Semilla del generador aleatorio (misma semilla = mismos datos)
+
+    Returns:
+        list: Nombres generados (para elegir términos de búsqueda y filas a modificar)
+    """
+    azar = random.Random(semilla)
+    generaciones, pesos_gen = list(GENERACIONES), list(GENERACIONES.values())
+    principales, pesos_principales = list(TIPOS_PRINCIPALES), list(TIPOS_PRINCIPALES.values())
+    secundarios, pesos_secundarios = list(TIPOS_SECUNDARIOS), list(TIPOS_SECUNDARIOS.values())
+    habilidades = [f"{nombre_sintetico(i)}-{azar.choice(SILABAS)}" for i in range(250)]
+
+    archivos = {}
+    nombres = []
+
+    try:
+        for numero in range(1, filas + 1):
+            generacion = azar.choices(generaciones, pesos_gen)[0]
+            tipo = azar.choices(principales, pesos_principales)[0]
+            tipos = [tipo]
+            if azar.random() < PROBABILIDAD_DOBLE_TIPO:
+                secundario = azar.choices(secundarios, pesos_secundarios)[0]
+                if secundario != tipo:
+                    tipos.append(secundario)
+
+            nombre = nombre_sintetico(numero)
+            nombres.append(nombre)
+
+            localizados = ""
+            if azar.random() < 0.3:
+                localizados = f"es:{nombre.capitalize()}|fr:{nombre.capitalize()}e"
+
+            fila = {
+                "id": str(numero),
+                "nombre": nombre,
+                "tipo": tipo,
+                "tipos": ", ".join(tipos),
+                "altura": str(azar.randint(1, 200)),
+                "peso": str(azar.randint(1, 9999)),
+                "base_experience": "" if azar.random() < 0.05 else str(azar.randint(36, 390)),
+                "habilidades": ", ".join(azar.sample(habilidades, azar.randint(1, 3))),
+                "areas_encuentro": ", ".join(f"ruta-{azar.randint(1, 230)}" for _ in range(azar.randint(0, 2))),
+                "generacion": generacion,
+                "nombres_localizados": localizados,
+            }
+
+            clave = (generacion, tipo)
+            if clave not in archivos:
+                carpeta = os.path.join(destino, "pokedex", generacion, tipo)
+                os.makedirs(carpeta, exist_ok=True)
+                f = open(os.path.join(carpeta, "pokemon.csv"), "w", newline="", encoding="utf-8")
+                escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+                escritor.writeheader()
+                archivos[clave] = (f, escritor)
+
+            archivos[clave][1].writerow(fila)
+
+    finally:
+        for f, _ in archivos.values():
+            f.close()
+
+    return nombres
+
+
+def reiniciar_estado():
+    """
+    Vacía el índice en memoria y la caché de búsquedas (como al abrir el programa).
+    """
+    reiniciar_indice()
+    CACHE_BUSQUEDAS.clear()
+
+
+def termino_con_error(nombre, azar):
+    """
+    Cambia una letra del nombre: obliga a pasar por la búsqueda difusa.
+    """
+    posicion = azar.randrange(len(nombre))
+    letra = "x" if nombre[posicion] != "x" else "q"
+    return nombre[:posicion] + letra + nombre[posicion + 1:]
+
+
+def construir_operaciones(contexto):
+    """
+    Define las operaciones a medir, en el orden en que se ejecutan.
+
+    Returns:
+        list: Tuplas (nombre, preparar, medir, recursiva). preparar() no se mide; medir()
+              devuelve un número que resume el resultado (filas, encontrados, ...);
+              recursiva indica que medir() hace una llamada recursiva por fila
+    """
+    azar = contexto["azar"]
+    nombres = contexto["nombres"]
+
+    def preparar_nada():
+        pass
+
+    def leer():
+        contexto["datos"] = leer_recursivo("pokedex")
+        return len(contexto["datos"])
+
+    def filtrar():
+        return len(filtrar_por_criterio_recursivo(contexto["datos"], "tipo", "water"))
+
+    def valores_unicos():
+        return len(obtener_valores_unicos_recursivo(contexto["datos"], "generacion"))
+
+    def buscar():
+        return len(buscar_pokemon_por_similitud(termino_con_error(azar.choice(nombres), azar), 60))
+
+    def preparar_indice_caliente():
+        cargar_indice("pokedex")
+
+    def guardar():
+        contexto["nuevos"] += 1
+        numero = len(nombres) + contexto["nuevos"]
+        guardar_pokemon({
+            "id": str(numero), "nombre": f"nuevo{nombre_sintetico(numero)}", "tipo": "water",
+            "tipos": "water", "altura": "10", "peso": "100", "base_experience": "64",
+            "habilidades": "torrent", "areas_encuentro": "", "generacion": "generation-i",
+            "nombres_localizados": "",
+        })
+        return 1
+
+    def modificar():
+        return int(modificar_pokemon(contexto["pendientes"].pop(), "peso", "1"))
+
+    def eliminar():
+        return int(eliminar_pokemon(contexto["pendientes"].pop()))
+
+    def mostrar_estadisticas():
+        return int(estadisticas())
+
+    return [
+        ("leer_recursivo", preparar_nada, leer, False),
+        ("filtrar_por_criterio_recursivo", preparar_nada, filtrar, True),
+        ("obtener_valores_unicos_recursivo", preparar_nada, valores_unicos, True),
+        # Primera búsqueda de la sesión: incluye cargar el índice y el índice difuso
+        ("buscar_pokemon_por_similitud (frío)", reiniciar_estado, buscar, False),
+        ("buscar_pokemon_por_similitud", preparar_indice_caliente, buscar, False),
+        ("guardar_pokemon", preparar_nada, guardar, False),
+        ("modificar_pokemon", preparar_nada, modificar, False),
+        ("eliminar_pokemon", preparar_nada, eliminar, False),
+        ("estadisticas", preparar_nada, mostrar_estadisticas, False),
+    ]
+
+
+def cronometrar(medir):
+    """
+    Returns:
+        tuple: (resultado de medir(), segundos que tardó)
+    """
+    inicio = time.perf_counter()
+    resultado = medir()
+    return resultado, time.perf_counter() - inicio
+
+
+def cronometrar_recursiva(medir, profundidad):
+    """
+    Cronometra medir() en un hilo con pila grande y el límite de recursión subido
+    a `profundidad` más un margen (el límite se restaura al terminar).
+
+    Returns:
+        tuple: (resultado de medir(), segundos que tardó)
+    """
+    salida = {}
+
+    def ejecutar():
+        limite_anterior = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limite_anterior, profundidad + MARGEN_RECURSION))
+        try:
+            salida["valor"] = cronometrar(medir)
+        except Exception as e:
+            salida["error"] = e
+        finally:
+            sys.setrecursionlimit(limite_anterior)
+
+    pila_anterior = threading.stack_size(PILA_RECURSIVA)
+    try:
+        hilo = threading.Thread(target=ejecutar)
+        hilo.start()
+    finally:
+        threading.stack_size(pila_anterior)
+    hilo.join()
+
+    if "error" in salida:
+        raise salida["error"]
+    return salida["valor"]
+
+
+def medicion_fallida(motivo, avisos=()):
+    """
+    Resultado de una operación que no se pudo medir: sin tiempos, fuera de las comparaciones.
+    """
+    return {
+        "fallida": True,
+        "motivo": motivo,
+        "mediana_s": None,
+        "minimo_s": None,
+        "tiempos_s": [],
+        "resultado": None,
+        "avisos": sorted(avisos),
+    }
+
+
+def medir_operacion(preparar, medir, repeticiones, limite_segundos, profundidad=None):
+    """
+    Ejecuta una operación varias veces con la salida de consola capturada.
+
+    Args:
+        profundidad: Llamadas recursivas que necesita medir() (None si no es recursiva)
+
+    Returns:
+        dict: {"fallida", "mediana_s", "minimo_s", "tiempos_s", "resultado", "avisos"};
+              si la operación no llegó a terminar, "fallida" es True, trae "motivo"
+              y no tiene tiempos
+    """
+    if profundidad is not None and profundidad > FILAS_MAXIMAS_RECURSIVAS:
+        return medicion_fallida(f"no se ejecuta con más de {FILAS_MAXIMAS_RECURSIVAS} filas "
+                                f"(memoria cuadrática por la recursión)")
+
+    tiempos = []
+    avisos = set()
+    resultado = None
+
+    for _ in range(repeticiones):
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            preparar()
+            if profundidad is None:
+                resultado, segundos = cronometrar(medir)
+            else:
+                resultado, segundos = cronometrar_recursiva(medir, profundidad)
+            tiempos.append(segundos)
+
+        for linea in salida.getvalue().splitlines():
+            if "AVISO" in linea:
+                avisos.add(linea.replace("AVISO:", "").strip())
+
+        # Los filtros atrapan RecursionError y devuelven una lista vacía: ese tiempo
+        # es el del error, no el de la operación
+        if any("recursión" in aviso for aviso in avisos):
+            return medicion_fallida("límite de recursión alcanzado", avisos)
+
+        # Operaciones muy lentas: no repetir hasta pasar el límite
+        if sum(tiempos) > limite_segundos:
+            break
+
+    return {
+        "fallida": False,
+        "mediana_s": statistics.median(tiempos),
+        "minimo_s": min(tiempos),
+        "tiempos_s": tiempos,
+        "resultado": resultado,
+        "avisos": sorted(avisos),
+    }
+
+
+def medir_tamano(filas, repeticiones, semilla, limite_segundos, carpeta_base=None, conservar=False):
+    """
+    Genera una pokédex de `filas` Pokémon y mide todas las operaciones sobre ella.
+
+    Returns:
+        dict: {"generacion_s", "operaciones": {nombre: medición}}
+    """
+    carpeta = tempfile.mkdtemp(prefix=f"pokedex_{filas}_", dir=carpeta_base)
+    anterior = os.getcwd()
+
+    try:
+        inicio = time.perf_counter()
+        nombres = generar_pokedex(carpeta, filas, semilla)
+        generacion = time.perf_counter() - inicio
+
+        # Las funciones del sistema trabajan sobre ./pokedex
+        os.chdir(carpeta)
+        reiniciar_estado()
+
+        azar = random.Random(semilla)
+        contexto = {
+            "azar": azar,
+            "nombres": nombres,
+            "datos": [],
+            "nuevos": 0,
+            # Pokémon a modificar y eliminar (distintos en cada repetición)
+            "pendientes": azar.sample(nombres, min(len(nombres), 4 * repeticiones)),
+        }
+
+        resultados = {}
+        for nombre, preparar, medir, recursiva in construir_operaciones(contexto):
+            print(f"  {filas:>9} filas · {nombre}...", file=sys.stderr)
+            resultados[nombre] = medir_operacion(preparar, medir, repeticiones, limite_segundos,
+                                                 filas if recursiva else None)
+
+        return {"generacion_s": generacion, "operaciones": resultados}
+
+    finally:
+        os.chdir(anterior)
+        reiniciar_estado()
+        if conservar:
+            print(f"  Pokédex de {filas} filas conservada en {carpeta}", file=sys.stderr)
+        else:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+
+def comparar_resultados(actual, base, tolerancia):
+    """
+    Compara dos ejecuciones por el tiempo mínimo de cada operación, que es el
+    menos afectado por otros procesos del equipo. Las operaciones fallidas (en
+    cualquiera de las dos) no se comparan.
+
+    Args:
+        actual / base: Resultados con el formato de este programa
+        tolerancia: Aumento relativo permitido (0.25 = hasta 25 % más lento)
+
+    Returns:
+        list: Filas {"filas", "operacion", "base_s", "actual_s", "cambio", "regresion"}
+    """
+    comparacion = []
+    for filas, medido in actual["resultados"].items():
+        anteriores = base.get("resultados", {}).get(filas, {}).get("operaciones", {})
+        for operacion, datos in medido["operaciones"].items():
+            if operacion not in anteriores:
+                continue
+            if datos.get("fallida") or anteriores[operacion].get("fallida"):
+                continue
+            base_s = anteriores[operacion]["minimo_s"]
+            actual_s = datos["minimo_s"]
+            cambio = (actual_s - base_s) / base_s if base_s > 0 else 0.0
+            comparacion.append({
+                "filas": int(filas),
+                "operacion": operacion,
+                "base_s": base_s,
+                "actual_s": actual_s,
+                "cambio": cambio,
+                "regresion": cambio > tolerancia and max(base_s, actual_s) >= MINIMO_COMPARABLE,
+            })
+    return comparacion
+
+
+def mostrar_tabla(actual, comparacion=None):
+    """
+    Muestra un resumen legible en la salida de errores (la salida estándar queda para el JSON).
+    """
+    cambios = {(c["filas"], c["operacion"]): c for c in comparacion or []}
+
+    print(f"\n{'Filas':>9}  {'Operación':<38}{'Mediana':>12}{'Mínimo':>12}  Cambio", file=sys.stderr)
+    for filas, medido in actual["resultados"].items():
+        for operacion, datos in medido["operaciones"].items():
+            if datos.get("fallida"):
+                print(f"{filas:>9}  {operacion:<38}{'FALLIDA':>24}  {datos['motivo']}", file=sys.stderr)
+                continue
+            cambio = cambios.get((int(filas), operacion))
+            texto = ""
+            if cambio:
+                texto = f"{cambio['cambio']:+.0%}" + ("  ← REGRESIÓN" if cambio["regresion"] else "")
+            if datos["avisos"]:
+                texto += f"  ({'; '.join(datos['avisos'])})"
+            print(f"{filas:>9}  {operacion:<38}{datos['mediana_s'] * 1000:>10.2f}ms"
+                  f"{datos['minimo_s'] * 1000:>10.2f}ms  {texto}", file=sys.stderr)
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.rendimiento",
+        description="Benchmarks de la Pokédex con datos sintéticos."
+    )
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="tamaños de pokédex a generar (default: 1000 10000 100000)")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="veces que se mide cada operación (default: 3)")
+    parser.add_argument("--semilla", type=int, default=42, help="semilla de los datos (default: 42)")
+    parser.add_argument("--limite-segundos", type=float, default=60,
+                        help="no repetir una operación cuando ya tardó esto en total (default: 60)")
+    parser.add_argument("--salida", metavar="ARCHIVO",
+                        help="archivo JSON de resultados (default: salida estándar)")
+    parser.add_argument("--comparar", metavar="BASE",
+                        help="JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento relativo permitido antes de marcar regresión (default: 0.25)")
+    parser.add_argument("--carpeta", help="dónde generar las pokédex (default: carpeta temporal)")
+    parser.add_argument("--conservar", action="store_true", help="no borrar las pokédex generadas")
+    return parser
+
+
+def main(argumentos=None):
+    args = construir_parser().parse_args(argumentos)
+
+    base = None
+    if args.comparar:
+        try:
+            with open(args.comparar, encoding="utf-8") as f:
+                base = json.load(f)
+        except (IOError, ValueError) as e:
+            print(f"AVISO: No se pudo leer la base {args.comparar}: {e}", file=sys.stderr)
+            return 2
+
+    actual = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "resultados": {},
+    }
+
+    for filas in args.filas:
+        actual["resultados"][str(filas)] = medir_tamano(
+            filas, max(1, args.repeticiones), args.semilla, args.limite_segundos, args.carpeta, args.conservar
+        )
+
+    comparacion = comparar_resultados(actual, base, args.tolerancia) if base else None
+    if comparacion is not None:
+        actual["comparacion"] = {"base": args.comparar, "tolerancia": args.tolerancia, "filas": comparacion}
+
+    mostrar_tabla(actual, comparacion)
+
+    texto = json.dumps(actual, ensure_ascii=False, indent=1)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+        print(f"\nResultados guardados en {args.salida}", file=sys.stderr)
+    else:
+        print(texto)
+
+    if comparacion and any(c["regresion"] for c in comparacion):
+        print(f"\nHay regresiones (más de {args.tolerancia:.0%} más lento que {args.comparar}).", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import tempfile
+from .persistencia import cargar_indice
+from .concurrencia import BLOQUEO_POKEDEX, lectura, escritura
+from .indice import INDICE
+from .indice_prefijos import PREFIJOS, construir_prefijos, completar
+
+# readline es opcional (no existe en algunas instalaciones de Windows):
+# sin él los nombres se piden con input() normal
+try:
+    import readline
+except ImportError:
+    readline = None
+
+# Lista de nombres de la Pokédex nacional en caché (dentro de la pokédex)
+ARCHIVO_NOMBRES = "nombres_nacionales.json"
+
+# Máximo de sugerencias que se muestran al presionar Tab
+LIMITE_SUGERENCIAS = 50
+
+
+def cargar_nombres_nacionales(base_dir="pokedex"):
+    """
+    Lee la lista de nombres de la Pokédex nacional guardada en caché.
+
+    Returns:
+        list: Nombres (vacía si el archivo no existe o es inválido)
+    """
+    try:
+        archivo = os.path.join(base_dir, ARCHIVO_NOMBRES)
+
+        if not os.path.isfile(archivo):
+            return []
+
+        with open(archivo, encoding="utf-8") as f:
+            nombres = json.load(f)
+
+        if not isinstance(nombres, list):
+            return []
+
+        return [n for n in nombres if isinstance(n, str) and n.strip()]
+
+    except (IOError, ValueError):
+        return []
+
+
+def guardar_nombres_nacionales(nombres, base_dir="pokedex"):
+    """
+    Guarda la lista de nombres de la Pokédex nacional de forma atómica.
+    El temporal tiene un nombre único: la precarga y `agregar` no se pisan.
+
+    Args:
+        nombres: Lista de nombres
+        base_dir: Directorio base de la pokédex
+
+    Returns:
+        bool: True si se guardó
+    """
+    temporal = None
+    try:
+        if not isinstance(nombres, list) or not nombres:
+            return False
+
+        os.makedirs(base_dir, exist_ok=True)
+        archivo = os.path.join(base_dir, ARCHIVO_NOMBRES)
+        descriptor, temporal = tempfile.mkstemp(prefix=ARCHIVO_NOMBRES + ".", suffix=".tmp", dir=base_dir)
+
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump(nombres, f, ensure_ascii=False)
+
+        # Con el mismo bloqueo que preparar_prefijos: el trie se vuelve a construir
+        # con la lista nueva y nadie lo arma a medias con la anterior
+        with escritura(BLOQUEO_POKEDEX):
+            os.replace(temporal, archivo)
+            temporal = None
+            PREFIJOS["construido"] = False
+        return True
+
+    except (IOError, OSError) as e:
+        print(f"\nAVISO: No se pudo guardar la lista de nombres: {e}", file=sys.stderr)
+        return False
+    finally:
+        if temporal is not None and os.path.exists(temporal):
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+
+
+def preparar_prefijos(base_dir="pokedex"):
+    """
+    Construye el trie con los nombres guardados y la lista nacional en caché,
+    si todavía no está construido.
+    """
+    if PREFIJOS["construido"] and INDICE["ruta"] == os.path.normpath(base_dir):
+        return
+
+    cargar_indice(base_dir)
+
+    with escritura(BLOQUEO_POKEDEX):
+        # Otro hilo pudo construirlo mientras se esperaba el bloqueo
+        if not (PREFIJOS["construido"] and INDICE["ruta"] == os.path.normpath(base_dir)):
+            construir_prefijos(INDICE["registros"], cargar_nombres_nacionales(base_dir))
+
+
+def pedir_nombre(mensaje, origen=None):
+    """
+    Pide un nombre de Pokémon con autocompletado (Tab) si readline está disponible.
+
+    Args:
+        mensaje: Texto del input
+        origen: Nombres a sugerir: ORIGEN_POKEDEX (guardados), ORIGEN_NACIONAL
+                o None para ambos
+
+    Returns:
+        str: Texto ingresado
+    """
+    if readline is None:
+        return input(mensaje)
+
+    sugerencias = []
+
+    def completador(texto, estado):
+        # readline llama con estado 0, 1, 2... hasta recibir None
+        if estado == 0:
+            try:
+                preparar_prefijos()
+                with lectura(BLOQUEO_POKEDEX):
+                    sugerencias[:] = completar(texto, origen, LIMITE_SUGERENCIAS)
+            except Exception:
+                sugerencias[:] = []
+        return sugerencias[estado] if estado < len(sugerencias) else None
+
+    anterior = readline.get_completer()
+    separadores = readline.get_completer_delims()
+
+    try:
+        readline.set_completer(completador)
+        # Los nombres pueden llevar guiones ("mr-mime"): no cortar palabras
+        readline.set_completer_delims("\t\n")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+
+        return input(mensaje)
+
+    finally:
+        readline.set_completer(anterior)
+        readline.set_completer_delims(separadores)
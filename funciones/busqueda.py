@@ -1,15 +1,71 @@
 import os
-from .persistencia import leer_recursivo
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from .persistencia import cargar_indice
+from .concurrencia import BLOQUEO_POKEDEX, lectura, escritura
+from .indice import (
+    INDICE, clave_pokemon, version_datos, listar_habilidades, pokemon_con_habilidad, textos_buscables, claves_de_texto,
+    pokemon_por_id, pokemon_en_rango_id
+)
+from .instantanea import instantanea_adjunta, indices_instantanea, pokemon_instantanea, pokemon_en_rango_id_instantanea
+from .indice_difuso import DIFUSO, distancia_levenshtein, distancia_maxima, construir_difuso, candidatos_similares
+from .indice_prefijos import completar, ORIGEN_POKEDEX
+from .autocompletado import preparar_prefijos
 from .paginador import paginar_pokemon
+from .metricas import contar
+from .flujo import canalizar, mapear, sin_repetir
 
+# A partir de cuántos términos la búsqueda por lote reparte el cálculo en procesos
+MINIMO_TERMINOS_PROCESOS = 64
 
-def calcular_similitud(str1, str2):
+# Caché LRU de búsquedas: (término normalizado, umbral) -> (versión de datos, resultados)
+CACHE_BUSQUEDAS = OrderedDict()
+MAXIMO_CACHE_BUSQUEDAS = 128
+
+# Varias búsquedas pueden leer a la vez: la caché se modifica de a una
+BLOQUEO_CACHE = threading.Lock()
+
+# Pares de nombres cuya similitud se recuerda (lru_cache de _similitud_normalizada)
+MAXIMO_CACHE_SIMILITUDES = 65536
+
+
+@lru_cache(maxsize=MAXIMO_CACHE_SIMILITUDES)
+def _similitud_normalizada(str1, str2, umbral):
+    """
+    Calcula la similitud de dos strings ya validados y en minúsculas.
+    Se memoriza por par de nombres (y umbral), ya que es una función pura.
+    """
+    # Si una cadena está contenida en la otra, alta similitud
+    if str1 in str2 or str2 in str1:
+        return 90
+    
+    # Convertir distancia a porcentaje de similitud
+    max_len = max(len(str1), len(str2))
+    
+    # Algoritmo de distancia de Levenshtein (acotado por el umbral si se indica)
+    if umbral is not None:
+        maximo = distancia_maxima(max_len, umbral)
+        distancia = distancia_levenshtein(str1, str2, maximo)
+        if distancia > maximo:
+            return 0
+    else:
+        distancia = distancia_levenshtein(str1, str2)
+    
+    return ((max_len - distancia) / max_len) * 100
+
+
+def calcular_similitud(str1, str2, umbral=None):
     """
     Calcula la similitud entre dos strings usando el algoritmo de Levenshtein.
     
     Args:
         str1: Primera cadena
         str2: Segunda cadena
+        umbral: Similitud mínima que interesa (opcional). Si se indica, la
+                distancia se calcula acotada y los pares que no lo alcanzan
+                devuelven 0; los que sí, el mismo porcentaje que sin umbral.
     
     Returns:
         float: Porcentaje de similitud (0-100)
@@ -23,51 +79,86 @@ def calcular_similitud(str1, str2):
         if not str1 or not str2:
             return 0
         
-        str1, str2 = str1.lower(), str2.lower()
-        
-        # Si una cadena está contenida en la otra, alta similitud
-        if str1 in str2 or str2 in str1:
-            return 90
-        
-        # Algoritmo de distancia de Levenshtein
-        if len(str1) < len(str2):
-            str1, str2 = str2, str1
-        
-        if len(str2) == 0:
-            return 0
-        
-        # Crear matriz de distancias
-        previous_row = range(len(str2) + 1)
-        for i, c1 in enumerate(str1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(str2):
-                # Calcular costo de operaciones
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        # Convertir distancia a porcentaje de similitud
-        distancia = previous_row[-1]
-        max_len = max(len(str1), len(str2))
-        
-        # Validar división por cero
-        if max_len == 0:
-            return 0
+        if not isinstance(umbral, (int, float)):
+            umbral = None
         
-        similitud = ((max_len - distancia) / max_len) * 100
+        # La similitud es simétrica: ordenar el par para compartir la entrada en caché
+        str1, str2 = sorted((str1.lower(), str2.lower()))
         
-        return similitud
+        return _similitud_normalizada(str1, str2, umbral)
         
     except (TypeError, ValueError) as e:
-        print(f"\nAVISO: Error al calcular similitud: {e}")
+        print(f"\nAVISO: Error al calcular similitud: {e}", file=sys.stderr)
         return 0
     except Exception as e:
-        print(f"\nAVISO: Error inesperado en cálculo de similitud: {e}")
+        print(f"\nAVISO: Error inesperado en cálculo de similitud: {e}", file=sys.stderr)
         return 0
 
 
+def obtener_de_cache(termino_busqueda, umbral_similitud, version_actual=None):
+    """
+    Devuelve los resultados guardados de una búsqueda si siguen vigentes.
+    
+    Args:
+        version_actual: Versión de los datos buscados (None para la del índice)
+    
+    Returns:
+        list: Copia de los resultados o None si no están o los datos cambiaron
+    """
+    clave = (termino_busqueda.strip().lower(), umbral_similitud)
+    if version_actual is None:
+        version_actual = version_datos()
+    
+    with BLOQUEO_CACHE:
+        entrada = CACHE_BUSQUEDAS.get(clave)
+        
+        if entrada is None:
+            contar("busqueda.cache_fallos")
+            return None
+        
+        version, resultados = entrada
+        if version != version_actual:
+            # Hubo escrituras (o se publicó otra instantánea) desde que se calculó
+            del CACHE_BUSQUEDAS[clave]
+            contar("busqueda.cache_fallos")
+            return None
+        
+        contar("busqueda.cache_aciertos")
+        CACHE_BUSQUEDAS.move_to_end(clave)
+        return list(resultados)
+
+
+def guardar_en_cache(termino_busqueda, umbral_similitud, resultados, version_actual=None):
+    """
+    Guarda los resultados de una búsqueda, descartando la menos usada si se llena.
+    version_actual es la de los datos buscados (None para la del índice).
+    """
+    clave = (termino_busqueda.strip().lower(), umbral_similitud)
+    if version_actual is None:
+        version_actual = version_datos()
+    
+    with BLOQUEO_CACHE:
+        CACHE_BUSQUEDAS[clave] = (version_actual, list(resultados))
+        CACHE_BUSQUEDAS.move_to_end(clave)
+        
+        while len(CACHE_BUSQUEDAS) > MAXIMO_CACHE_BUSQUEDAS:
+            CACHE_BUSQUEDAS.popitem(last=False)
+
+
+def preparar_difuso():
+    """
+    Construye el índice difuso en la primera búsqueda que lo necesita; luego
+    se mantiene con cada alta, modificación y baja.
+    """
+    if DIFUSO["construido"]:
+        return
+    
+    with escritura(BLOQUEO_POKEDEX):
+        # Otro hilo pudo construirlo mientras se esperaba el bloqueo
+        if not DIFUSO["construido"]:
+            construir_difuso(textos_buscables())
+
+
 def buscar_csv_recursivo(ruta):
     """
     Busca archivos CSV de forma recursiva en una estructura de directorios.
@@ -99,10 +190,10 @@ def buscar_csv_recursivo(ruta):
         try:
             elementos = os.listdir(ruta)
         except PermissionError:
-            print(f"\nAVISO: Sin permisos para acceder a: {ruta}")
+            print(f"\nAVISO: Sin permisos para acceder a: {ruta}", file=sys.stderr)
             return False
         except OSError as e:
-            print(f"\nAVISO: Error al listar directorio {ruta}: {e}")
+            print(f"\nAVISO: Error al listar directorio {ruta}: {e}", file=sys.stderr)
             return False
         
         # Validar que elementos sea una lista
@@ -128,10 +219,103 @@ def buscar_csv_recursivo(ruta):
         return False
         
     except Exception as e:
-        print(f"\nAVISO: Error inesperado en búsqueda recursiva: {e}")
+        print(f"\nAVISO: Error inesperado en búsqueda recursiva: {e}", file=sys.stderr)
         return False
 
 
+def coincidencias_por_prefijo(termino_busqueda, umbral_similitud, registros):
+    """
+    Busca en el trie los Pokémon guardados cuyo nombre empieza con el término.
+    Su similitud es la de calcular_similitud para un texto contenido en otro,
+    así que no hace falta calcular ninguna distancia de Levenshtein.
+
+    Args:
+        termino_busqueda: Término de búsqueda
+        umbral_similitud: Porcentaje mínimo de similitud
+        registros: Diccionario nombre -> Pokémon del índice
+
+    Returns:
+        list: Tuplas (pokemon_dict, porcentaje_similitud) ordenadas por similitud,
+              vacía si ningún nombre empieza con el término
+    """
+    resultados = []
+    claves = completar(termino_busqueda, ORIGEN_POKEDEX)
+    contar("busqueda.filas_recorridas", len(claves))
+    for clave in claves:
+        pokemon = registros.get(clave)
+        if not isinstance(pokemon, dict):
+            continue
+        similitud = calcular_similitud(termino_busqueda, pokemon.get("nombre", ""))
+        if similitud >= umbral_similitud:
+            resultados.append((pokemon, similitud))
+    resultados.sort(key=lambda x: (-x[1], x[0].get("nombre", "")))
+    return resultados
+
+
+def coincidencias_localizadas(termino_busqueda, umbral_similitud, registros):
+    """
+    Busca los Pokémon cuyo nombre en otro idioma es exactamente el término
+    (por ejemplo, el nombre en español), con una consulta directa al índice.
+
+    Args:
+        termino_busqueda: Término de búsqueda
+        umbral_similitud: Porcentaje mínimo de similitud
+        registros: Diccionario nombre -> Pokémon del índice
+
+    Returns:
+        list: Tuplas (pokemon_dict, porcentaje_similitud), vacía si no hay coincidencia
+    """
+    texto = termino_busqueda.strip().lower()
+    similitud = calcular_similitud(termino_busqueda, texto)
+    if similitud < umbral_similitud:
+        return []
+
+    resultados = []
+    for clave in INDICE["por_nombre_localizado"].get(texto, {}):
+        pokemon = registros.get(clave)
+        if isinstance(pokemon, dict):
+            resultados.append((pokemon, similitud))
+    resultados.sort(key=lambda x: x[0].get("nombre", ""))
+    return resultados
+
+
+def similares_en_instantanea(termino_busqueda, umbral_similitud):
+    """
+    Búsqueda por nombre sobre la instantánea adjunta (ver instantanea.py), con el
+    índice difuso que se arma una vez por instantánea: solo se miden los nombres
+    candidatos y se decodifican los Pokémon que alcanzan el umbral. Los resultados
+    van a la caché con la versión de la instantánea.
+
+    Returns:
+        list: Tuplas (pokemon_dict, porcentaje_similitud) ordenadas por similitud
+    """
+    instantanea, indices = indices_instantanea()
+    if instantanea is None:
+        return []
+
+    resultados = obtener_de_cache(termino_busqueda, umbral_similitud, indices["version"])
+    if resultados is not None:
+        return resultados
+
+    # Mejor similitud de cada posición entre su nombre y sus nombres localizados
+    mejores = {}
+    candidatos = candidatos_similares(termino_busqueda, umbral_similitud, indices["difuso"])
+    contar("busqueda.filas_recorridas", len(candidatos))
+    for texto in candidatos:
+        similitud = calcular_similitud(termino_busqueda, texto, umbral_similitud)
+        if similitud < umbral_similitud:
+            continue
+        for posicion in indices["textos"].get(texto, ()):
+            if similitud > mejores.get(posicion, -1):
+                mejores[posicion] = similitud
+
+    resultados = [(pokemon_instantanea(instantanea, posicion), similitud)
+                  for posicion, similitud in mejores.items()]
+    resultados.sort(key=lambda x: (-x[1], x[0].get("nombre", "")))
+    guardar_en_cache(termino_busqueda, umbral_similitud, resultados, indices["version"])
+    return resultados
+
+
 def buscar_pokemon_por_similitud(termino_busqueda, umbral_similitud=60):
     """
     Busca Pokémon por similitud de nombre.
@@ -146,83 +330,252 @@ def buscar_pokemon_por_similitud(termino_busqueda, umbral_similitud=60):
     try:
         # Validar que termino_busqueda sea un string
         if not isinstance(termino_busqueda, str):
-            print("\nAVISO: El término de búsqueda debe ser un texto")
+            print("\nAVISO: El término de búsqueda debe ser un texto", file=sys.stderr)
             return []
         
         # Limpiar y validar el término
         termino_busqueda = termino_busqueda.strip()
         
         if not termino_busqueda:
-            print("\nAVISO: El término de búsqueda no puede estar vacío")
+            print("\nAVISO: El término de búsqueda no puede estar vacío", file=sys.stderr)
             return []
         
         # Validar longitud mínima
         if len(termino_busqueda) < 3:
-            print("Debes ingresar al menos 3 caracteres para buscar.\n")
+            print("Debes ingresar al menos 3 caracteres para buscar.\n", file=sys.stderr)
             return []
         
         # Validar umbral de similitud
         if not isinstance(umbral_similitud, (int, float)):
-            print("\nAVISO: Umbral inválido, usando 60 por defecto")
+            print("\nAVISO: Umbral inválido, usando 60 por defecto", file=sys.stderr)
             umbral_similitud = 60
         
         # Asegurar que el umbral esté en rango válido
         umbral_similitud = max(0, min(100, umbral_similitud))
         
-        # Verificar que exista la Pokédex usando función recursiva
-        if not buscar_csv_recursivo("pokedex"):
-            print("No hay datos en la Pokédex.\n")
-            return []
-        
-        # Leer todos los Pokémon
-        datos = leer_recursivo("pokedex")
+        # Con una instantánea adjunta se busca en ella (con su propia versión en la caché)
+        if instantanea_adjunta():
+            return similares_en_instantanea(termino_busqueda, umbral_similitud)
         
-        if not datos:
-            print("No hay Pokémon guardados.\n")
-            return []
+        # Búsqueda repetida sin escrituras de por medio: responder desde la caché
+        resultados = obtener_de_cache(termino_busqueda, umbral_similitud)
+        if resultados is not None:
+            return resultados
         
-        # Validar que datos sea una lista
-        if not isinstance(datos, list):
-            print("\nAVISO: Formato de datos inválido")
+        # Verificar que exista la Pokédex usando función recursiva
+        if not buscar_csv_recursivo("pokedex"):
+            print("No hay datos en la Pokédex.\n", file=sys.stderr)
             return []
         
-        # Calcular similitud para cada Pokémon
-        resultados = []
-        for pokemon in datos:
-            try:
-                # Validar que pokemon sea un diccionario
-                if not isinstance(pokemon, dict):
-                    continue
-                
-                nombre = pokemon.get("nombre", "")
-                
-                # Validar que el nombre sea válido
-                if not nombre or not isinstance(nombre, str):
-                    continue
-                
-                similitud = calcular_similitud(termino_busqueda, nombre)
-                
-                # Solo incluir si cumple el umbral
-                if similitud >= umbral_similitud:
-                    resultados.append((pokemon, similitud))
+        # Cargar la Pokédex en el índice en memoria (una vez por sesión) y el trie.
+        # Se preparan antes de leer: dentro de una lectura no se puede escribir.
+        cargar_indice("pokedex")
+        preparar_prefijos("pokedex")
+        
+        with lectura(BLOQUEO_POKEDEX):
+            registros = INDICE["registros"]
+            
+            if not registros:
+                print("No hay Pokémon guardados.\n", file=sys.stderr)
+                return []
+            
+            # Cada Pokémon queda con su mejor similitud entre todas las fuentes:
+            # nombre localizado exacto (índice), prefijo (trie) y candidatos difusos
+            mejores = {}
+            for pokemon, similitud in (coincidencias_localizadas(termino_busqueda, umbral_similitud, registros)
+                                       + coincidencias_por_prefijo(termino_busqueda, umbral_similitud, registros)):
+                clave = clave_pokemon(pokemon)
+                if similitud > mejores.get(clave, -1):
+                    mejores[clave] = similitud
+        
+        # Aunque haya coincidencias por prefijo se buscan también los nombres que
+        # contienen el término en el medio o están dentro del umbral de similitud
+        preparar_difuso()
+        
+        with lectura(BLOQUEO_POKEDEX):
+            registros = INDICE["registros"]
+            
+            # Calcular similitud solo para los candidatos del índice difuso
+            # (nombres y nombres localizados)
+            candidatos = candidatos_similares(termino_busqueda, umbral_similitud)
+            contar("busqueda.filas_recorridas", len(candidatos))
+            for texto in candidatos:
+                try:
+                    similitud = calcular_similitud(termino_busqueda, texto, umbral_similitud)
                     
-            except Exception as e:
-                # Continuar con el siguiente pokémon si hay error
-                continue
-        
-        # Ordenar por similitud descendente (mayor similitud primero)
-        try:
-            resultados.sort(key=lambda x: x[1], reverse=True)
-        except (TypeError, ValueError) as e:
-            print(f"\nAVISO: Error al ordenar resultados: {e}")
-        
-        return resultados
+                    # Solo incluir si cumple el umbral
+                    if similitud < umbral_similitud:
+                        continue
+                    
+                    for clave in claves_de_texto(texto):
+                        if similitud > mejores.get(clave, -1):
+                            mejores[clave] = similitud
+                        
+                except Exception as e:
+                    # Continuar con el siguiente candidato si hay error
+                    continue
+            
+            # Validar que cada Pokémon siga en el índice (pudo borrarse entre las dos lecturas)
+            resultados = [(registros[clave], similitud) for clave, similitud in mejores.items()
+                          if isinstance(registros.get(clave), dict)]
+            
+            # Ordenar por similitud descendente (mayor similitud primero)
+            try:
+                resultados.sort(key=lambda x: (-x[1], x[0].get("nombre", "")))
+            except (TypeError, ValueError) as e:
+                print(f"\nAVISO: Error al ordenar resultados: {e}", file=sys.stderr)
+            
+            # Dentro de la lectura: la versión guardada es la de estos datos
+            guardar_en_cache(termino_busqueda, umbral_similitud, resultados)
+            return resultados
         
     except Exception as e:
-        print(f"\nAVISO: Error inesperado en búsqueda por similitud: {e}")
+        print(f"\nAVISO: Error inesperado en búsqueda por similitud: {e}", file=sys.stderr)
         return []
 
 
+def puntuar_lote(tareas, umbral_similitud):
+    """
+    Calcula la similitud de varios términos contra sus nombres candidatos.
+    Solo usa datos recibidos por parámetro, así que puede ejecutarse en otro proceso.
+
+    Args:
+        tareas: Lista de tuplas (termino, [textos candidatos])
+        umbral_similitud: Porcentaje mínimo de similitud
+
+    Returns:
+        list: Por cada tarea, lista de tuplas (posición del nombre, similitud)
+              que alcanzan el umbral
+    """
+    resultados = []
+    for termino, nombres in tareas:
+        coincidencias = []
+        for i, nombre in enumerate(nombres):
+            similitud = calcular_similitud(termino, nombre, umbral_similitud)
+            if similitud >= umbral_similitud:
+                coincidencias.append((i, similitud))
+        resultados.append(coincidencias)
+    return resultados
+
+
+def buscar_pokemon_lote(terminos, umbral_similitud=60, procesos=None):
+    """
+    Busca muchos términos a la vez (por ejemplo, un equipo o una importación).
+    La Pokédex y el índice difuso se cargan una sola vez para todo el lote y,
+    con muchos términos, el cálculo de similitud se reparte en varios procesos.
+
+    Args:
+        terminos: Lista de strings a buscar (mínimo 3 caracteres cada uno)
+        umbral_similitud: Porcentaje mínimo de similitud (default: 60)
+        procesos: Cantidad de procesos (None = según la CPU, 1 = sin procesos)
+
+    Returns:
+        dict: {termino: [(pokemon_dict, porcentaje_similitud)]} en el orden de entrada,
+              cada lista ordenada por similitud. Los términos inválidos quedan con [].
+    """
+    resultados = {}
+
+    try:
+        # Validar que terminos sea una lista
+        if isinstance(terminos, str) or not isinstance(terminos, (list, tuple)):
+            print("\nAVISO: Los términos deben ser una lista de textos", file=sys.stderr)
+            return {}
+
+        # Validar umbral de similitud
+        if not isinstance(umbral_similitud, (int, float)):
+            print("\nAVISO: Umbral inválido, usando 60 por defecto", file=sys.stderr)
+            umbral_similitud = 60
+
+        umbral_similitud = max(0, min(100, umbral_similitud))
+
+        # Términos a buscar, sin repetidos ni demasiado cortos
+        validos = {}
+        for termino in terminos:
+            if not isinstance(termino, str):
+                continue
+            resultados[termino] = []
+            if len(termino.strip()) >= 3:
+                validos[termino.strip()] = None
+
+        if not validos:
+            return resultados
+
+        # Verificar que exista la Pokédex usando función recursiva
+        if not buscar_csv_recursivo("pokedex"):
+            print("No hay datos en la Pokédex.\n", file=sys.stderr)
+            return resultados
+
+        # Cargar la tabla de nombres una sola vez para todo el lote
+        cargar_indice("pokedex")
+        preparar_difuso()
+        preparar_prefijos("pokedex")
+
+        # Candidatos de cada término (rápido, con el índice difuso), más las
+        # coincidencias directas (nombre localizado y prefijo en el trie)
+        por_termino = {}
+        directos = {}
+        pendientes = []
+        candidatos = []
+        tareas = []
+        with lectura(BLOQUEO_POKEDEX):
+            registros = INDICE["registros"]
+            for termino in validos:
+                directos[termino] = (coincidencias_localizadas(termino, umbral_similitud, registros)
+                                     + coincidencias_por_prefijo(termino, umbral_similitud, registros))
+
+                pendientes.append(termino)
+                textos = list(candidatos_similares(termino, umbral_similitud))
+                candidatos.append(textos)
+                tareas.append((termino, textos))
+
+        # Calcular similitudes: en procesos si el lote es grande
+        puntajes = None
+        if procesos != 1 and len(tareas) >= MINIMO_TERMINOS_PROCESOS:
+            try:
+                # Se importa aquí: cargar concurrent.futures solo hace falta en lotes grandes
+                from concurrent.futures import ProcessPoolExecutor
+                cantidad = procesos or os.cpu_count() or 1
+                # Varios bloques por proceso para repartir bien la carga
+                tamano = -(-len(tareas) // (cantidad * 4))
+                bloques = [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+                with ProcessPoolExecutor(max_workers=cantidad) as ejecutor:
+                    puntajes = []
+                    for parcial in ejecutor.map(puntuar_lote, bloques, [umbral_similitud] * len(bloques)):
+                        puntajes.extend(parcial)
+            except (OSError, RuntimeError, ValueError) as e:
+                print(f"\nAVISO: No se pudieron usar procesos ({e}), calculando en este proceso", file=sys.stderr)
+                puntajes = None
+
+        if puntajes is None:
+            puntajes = puntuar_lote(tareas, umbral_similitud)
+
+        # Armar los resultados por término, ordenados por similitud
+        with lectura(BLOQUEO_POKEDEX):
+            registros = INDICE["registros"]
+            for termino, textos, coincidencias in zip(pendientes, candidatos, puntajes):
+                mejores = {}
+                for pokemon, similitud in directos[termino]:
+                    clave = clave_pokemon(pokemon)
+                    if isinstance(registros.get(clave), dict) and similitud > mejores.get(clave, -1):
+                        mejores[clave] = similitud
+                for i, similitud in coincidencias:
+                    for clave in claves_de_texto(textos[i]):
+                        if isinstance(registros.get(clave), dict) and similitud > mejores.get(clave, -1):
+                            mejores[clave] = similitud
+                lista = [(registros[clave], similitud) for clave, similitud in mejores.items()]
+                lista.sort(key=lambda x: (-x[1], x[0].get("nombre", "")))
+                por_termino[termino] = lista
+
+        for termino in resultados:
+            resultados[termino] = list(por_termino.get(termino.strip(), []))
+
+        return resultados
+
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado en búsqueda por lote: {e}", file=sys.stderr)
+        return resultados
+
+
 def mostrar_resultados_busqueda(termino_busqueda, umbral=60):
     """
     Muestra los resultados de búsqueda por similitud con paginación.
@@ -234,13 +587,13 @@ def mostrar_resultados_busqueda(termino_busqueda, umbral=60):
     try:
         # Validar entrada
         if not isinstance(termino_busqueda, str):
-            print("\nAVISO: El término de búsqueda debe ser texto")
+            print("\nAVISO: El término de búsqueda debe ser texto", file=sys.stderr)
             return
         
         termino_busqueda = termino_busqueda.strip()
         
         if not termino_busqueda:
-            print("\nAVISO: El término de búsqueda no puede estar vacío")
+            print("\nAVISO: El término de búsqueda no puede estar vacío", file=sys.stderr)
             return
         
         # Validar umbral
@@ -265,17 +618,11 @@ def mostrar_resultados_busqueda(termino_busqueda, umbral=60):
         
         # Validar que resultados sea una lista
         if not isinstance(resultados, list):
-            print("\nAVISO: Formato de resultados inválido")
+            print("\nAVISO: Formato de resultados inválido", file=sys.stderr)
             return
         
         # Extraer solo los pokémon (sin el porcentaje de similitud)
-        pokemon_list = []
-        for item in resultados:
-            try:
-                if isinstance(item, tuple) and len(item) >= 1:
-                    pokemon_list.append(item[0])
-            except Exception:
-                continue
+        pokemon_list = list(mapear(resultados, lambda resultado: resultado[0]))
         
         if not pokemon_list:
             print(f"\nNo se pudieron procesar los resultados de búsqueda\n")
@@ -290,6 +637,208 @@ def mostrar_resultados_busqueda(termino_busqueda, umbral=60):
         )
         
     except KeyboardInterrupt:
-        print("\n\n[Aviso] Búsqueda cancelada por el usuario")
+        print("\n\n[Aviso] Búsqueda cancelada por el usuario", file=sys.stderr)
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al mostrar resultados: {e}", file=sys.stderr)
+
+
+def habilidades_en_instantanea(termino_busqueda, umbral_similitud):
+    """
+    Búsqueda por habilidad sobre la instantánea adjunta, con su índice habilidad ->
+    posiciones: se compara el término (ya normalizado) con cada habilidad distinta
+    y se decodifican solo los Pokémon de las que alcanzan el umbral.
+
+    Returns:
+        list: Tuplas (pokemon_dict, habilidad, porcentaje_similitud) ordenadas
+              por similitud y nombre
+    """
+    instantanea, indices = indices_instantanea()
+    if instantanea is None:
+        return []
+
+    resultados = []
+    decodificados = {}
+    contar("busqueda.filas_recorridas", len(indices["habilidades"]))
+    for habilidad, posiciones in indices["habilidades"].items():
+        similitud = 100 if habilidad == termino_busqueda else calcular_similitud(termino_busqueda, habilidad, umbral_similitud)
+        if similitud < umbral_similitud:
+            continue
+        for posicion in posiciones:
+            if posicion not in decodificados:
+                decodificados[posicion] = pokemon_instantanea(instantanea, posicion)
+            resultados.append((decodificados[posicion], habilidad, similitud))
+
+    resultados.sort(key=lambda x: (-x[2], x[1], x[0].get("nombre", "")))
+    return resultados
+
+
+def buscar_por_habilidad(termino_busqueda, umbral_similitud=60):
+    """
+    Busca Pokémon por habilidad usando el índice invertido habilidad -> Pokémon.
+    La similitud se calcula solo contra los nombres de habilidad distintos,
+    sin recorrer ni separar el campo "habilidades" de cada fila.
+    
+    Args:
+        termino_busqueda: Habilidad a buscar (ej: "levitate", "swift swim")
+        umbral_similitud: Porcentaje mínimo de similitud (default: 60)
+    
+    Returns:
+        list: Tuplas (pokemon_dict, habilidad, porcentaje_similitud) ordenadas
+              por similitud y nombre
+    """
+    try:
+        # Validar que termino_busqueda sea un string
+        if not isinstance(termino_busqueda, str):
+            print("\nAVISO: El término de búsqueda debe ser un texto", file=sys.stderr)
+            return []
+        
+        # Las habilidades se guardan con guiones ("swift-swim")
+        termino_busqueda = "-".join(termino_busqueda.strip().lower().split())
+        
+        if len(termino_busqueda) < 3:
+            print("Debes ingresar al menos 3 caracteres para buscar.\n", file=sys.stderr)
+            return []
+        
+        if not isinstance(umbral_similitud, (int, float)):
+            umbral_similitud = 60
+        
+        umbral_similitud = max(0, min(100, umbral_similitud))
+        
+        if instantanea_adjunta():
+            return habilidades_en_instantanea(termino_busqueda, umbral_similitud)
+        
+        # Verificar que exista la Pokédex usando función recursiva
+        if not buscar_csv_recursivo("pokedex"):
+            print("No hay datos en la Pokédex.\n", file=sys.stderr)
+            return []
+        
+        cargar_indice("pokedex")
+        
+        # Habilidades parecidas al término (una comparación por habilidad distinta)
+        resultados = []
+        with lectura(BLOQUEO_POKEDEX):
+            habilidades = listar_habilidades()
+            contar("busqueda.filas_recorridas", len(habilidades))
+            for habilidad in habilidades:
+                similitud = 100 if habilidad == termino_busqueda else calcular_similitud(termino_busqueda, habilidad, umbral_similitud)
+                if similitud < umbral_similitud:
+                    continue
+                for pokemon in pokemon_con_habilidad(habilidad):
+                    resultados.append((pokemon, habilidad, similitud))
+        
+        resultados.sort(key=lambda x: (-x[2], x[1], x[0].get("nombre", "")))
+        return resultados
+        
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado en búsqueda por habilidad: {e}", file=sys.stderr)
+        return []
+
+
+def mostrar_resultados_habilidad(termino_busqueda, umbral=60):
+    """
+    Muestra con paginación los Pokémon que tienen una habilidad parecida al término.
+    
+    Args:
+        termino_busqueda: Habilidad a buscar
+        umbral: Umbral de similitud mínima (default: 60)
+    """
+    try:
+        if not isinstance(termino_busqueda, str) or not termino_busqueda.strip():
+            print("\nAVISO: El término de búsqueda no puede estar vacío", file=sys.stderr)
+            return
+        
+        print(f"\nBuscando Pokémon con la habilidad '{termino_busqueda.strip()}'...")
+        
+        resultados = buscar_por_habilidad(termino_busqueda, umbral)
+        
+        if not resultados:
+            print(f"\nNo se encontraron Pokémon con una habilidad similar a '{termino_busqueda.strip()}'.\n")
+            return
+        
+        # Un Pokémon puede aparecer por varias habilidades parecidas: mostrarlo una vez
+        habilidades = list(canalizar(resultados, (mapear, lambda resultado: resultado[1]), (sin_repetir, str)))
+        pokemon_list = list(canalizar(resultados, (mapear, lambda resultado: resultado[0]), (sin_repetir,)))
+        
+        paginar_pokemon(
+            resultados=pokemon_list,
+            pokemon_por_pagina=10,
+            titulo=f"🔍 HABILIDAD: '{termino_busqueda.strip().upper()}' ({', '.join(habilidades)})\n{len(pokemon_list)} Pokémon encontrado(s)",
+            tipo_formato='completo'
+        )
+        
+    except KeyboardInterrupt:
+        print("\n\n[Aviso] Búsqueda cancelada por el usuario", file=sys.stderr)
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al mostrar resultados: {e}", file=sys.stderr)
+
+
+def buscar_por_id(texto):
+    """
+    Busca Pokémon por número de la Pokédex nacional (ID) usando el índice por ID.
+    
+    Args:
+        texto: Un ID ("25") o un rango de IDs ("1-151")
+    
+    Returns:
+        list: Pokémon encontrados ordenados por ID, o None si el texto no es válido
+    """
+    try:
+        if not isinstance(texto, str):
+            return None
+        
+        partes = [p.strip() for p in texto.strip().split("-")]
+        
+        # Validar que sean uno o dos números
+        if len(partes) not in (1, 2) or not all(p.isdigit() for p in partes):
+            return None
+        
+        # Con una instantánea adjunta: búsqueda binaria en su tabla por ID
+        if instantanea_adjunta():
+            return pokemon_en_rango_id_instantanea(partes[0], partes[-1])
+        
+        # Verificar que exista la Pokédex usando función recursiva
+        if not buscar_csv_recursivo("pokedex"):
+            print("No hay datos en la Pokédex.\n", file=sys.stderr)
+            return []
+        
+        cargar_indice("pokedex")
+        
+        if len(partes) == 1:
+            return pokemon_por_id(partes[0])
+        
+        return pokemon_en_rango_id(partes[0], partes[1])
+        
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado en búsqueda por ID: {e}", file=sys.stderr)
+        return []
+
+
+def mostrar_resultados_id(texto):
+    """
+    Muestra con paginación los Pokémon de un ID o rango de IDs.
+    
+    Args:
+        texto: Un ID ("25") o un rango de IDs ("1-151")
+    """
+    try:
+        resultados = buscar_por_id(texto)
+        
+        if resultados is None:
+            print("\nAVISO: Ingresa un número (ej: 25) o un rango (ej: 1-151).\n", file=sys.stderr)
+            return
+        
+        if not resultados:
+            print(f"\nNo hay Pokémon guardados con ID {texto.strip()}.\n", file=sys.stderr)
+            return
+        
+        paginar_pokemon(
+            resultados=resultados,
+            pokemon_por_pagina=10,
+            titulo=f"🔍 ID: {texto.strip()}\n{len(resultados)} Pokémon encontrado(s)",
+            tipo_formato='completo'
+        )
+        
+    except KeyboardInterrupt:
+        print("\n\n[Aviso] Búsqueda cancelada por el usuario", file=sys.stderr)
     except Exception as e:
-        print(f"\nAVISO: Error inesperado al mostrar resultados: {e}")
\ No newline at end of file
+        print(f"\nAVISO: Error inesperado al mostrar resultados: {e}", file=sys.stderr)
@@ -1,7 +1,11 @@
-import requests
 import os
+import itertools
+import threading
+from queue import PriorityQueue
 from api.api_pokemon import obtener_pokemon
-from .persistencia import guardar_pokemon, existe_pokemon_en_csv
+from .persistencia import guardar_pokemon, existe_pokemon_en_csv, avisador
+from .autocompletado import guardar_nombres_nacionales
+from .particiones import cargar_manifiesto, listar_particiones
 
 # Rangos de Pokémon por generación (según PokéAPI)
 GENERACIONES = {
@@ -17,31 +21,37 @@ GENERACIONES = {
 }
 
 
-def obtener_lista_pokemon(limit, offset):
+def obtener_lista_pokemon(limit, offset, silencioso=False):
     """
     Devuelve una lista de nombres de Pokémon desde la PokéAPI.
     
     Args:
         limit: Cantidad de pokémon a obtener
         offset: Posición inicial
+        silencioso: True para no mostrar mensajes (precarga en segundo plano)
         
     Returns:
         list: Lista de nombres de pokémon o lista vacía si hay error
     """
+    # Importación diferida: solo la precarga necesita requests
+    import requests
+    
+    avisar = avisador(silencioso)
+    
     try:
         # Validar que limit y offset sean números
         if not isinstance(limit, int) or not isinstance(offset, int):
-            print("AVISO: Limit y offset deben ser números enteros")
+            avisar("AVISO: Limit y offset deben ser números enteros")
             return []
         
         # Validar que sean positivos
         if limit < 0 or offset < 0:
-            print("AVISO: Limit y offset deben ser positivos")
+            avisar("AVISO: Limit y offset deben ser positivos")
             return []
         
         # Validar límites razonables
         if limit > 1000:
-            print("AVISO: Limit muy grande, limitando a 1000")
+            avisar("AVISO: Limit muy grande, limitando a 1000")
             limit = 1000
         
         url = f"https://pokeapi.co/api/v2/pokemon?limit={limit}&offset={offset}"
@@ -54,15 +64,15 @@ def obtener_lista_pokemon(limit, offset):
         
         # Validar estructura de respuesta
         if not isinstance(data, dict):
-            print("AVISO: Respuesta de la API con formato inválido")
+            avisar("AVISO: Respuesta de la API con formato inválido")
             return []
         
         if "results" not in data:
-            print("AVISO: Respuesta sin campo 'results'")
+            avisar("AVISO: Respuesta sin campo 'results'")
             return []
         
         if not isinstance(data["results"], list):
-            print("AVISO: Campo 'results' no es una lista")
+            avisar("AVISO: Campo 'results' no es una lista")
             return []
         
         # Extraer nombres con validación
@@ -79,25 +89,57 @@ def obtener_lista_pokemon(limit, offset):
         return nombres
         
     except requests.exceptions.Timeout:
-        print("AVISO: Timeout al obtener lista de Pokémon")
+        avisar("AVISO: Timeout al obtener lista de Pokémon")
         return []
     except requests.exceptions.ConnectionError:
-        print("AVISO: Error de conexión al obtener lista de Pokémon")
+        avisar("AVISO: Error de conexión al obtener lista de Pokémon")
         return []
     except requests.exceptions.HTTPError as e:
-        print(f"AVISO: Error HTTP al obtener lista: {e}")
+        avisar(f"AVISO: Error HTTP al obtener lista: {e}")
         return []
     except requests.exceptions.RequestException as e:
-        print(f"AVISO: Error en la petición: {e}")
+        avisar(f"AVISO: Error en la petición: {e}")
         return []
     except (ValueError, KeyError) as e:
-        print(f"AVISO: Error al procesar respuesta: {e}")
+        avisar(f"AVISO: Error al procesar respuesta: {e}")
         return []
     except Exception as e:
-        print(f"AVISO: Error inesperado al obtener lista: {e}")
+        avisar(f"AVISO: Error inesperado al obtener lista: {e}")
         return []
 
 
+def descargar_nombres_nacionales(base_dir="pokedex", silencioso=False):
+    """
+    Descarga los nombres de toda la Pokédex nacional (según GENERACIONES) y los
+    guarda en caché para el autocompletado.
+    
+    Args:
+        base_dir: Directorio base de la pokédex
+        silencioso: True para no mostrar mensajes
+        
+    Returns:
+        int: Cantidad de nombres guardados (0 si hubo error)
+    """
+    try:
+        total = sum(datos.get("limit", 0) for datos in GENERACIONES.values())
+        nombres = []
+        
+        # La API entrega como máximo 1000 nombres por petición
+        for offset in range(0, total, 1000):
+            parte = obtener_lista_pokemon(min(1000, total - offset), offset, silencioso)
+            if not parte:
+                return 0
+            nombres.extend(parte)
+        
+        if guardar_nombres_nacionales(nombres, base_dir):
+            return len(nombres)
+        return 0
+        
+    except Exception as e:
+        avisador(silencioso)(f"AVISO: Error inesperado al descargar nombres: {e}")
+        return 0
+
+
 def buscar_csv_recursivo(ruta):
     """
     Busca recursivamente archivos CSV en la estructura de directorios.
@@ -178,7 +220,9 @@ def verificar_si_ya_existe_precarga(base_dir="pokedex"):
     Verifica si ya existe al menos un archivo CSV en la estructura.
     Si existe, asume que la precarga ya se realizó.
     
-    Usa búsqueda RECURSIVA para explorar toda la jerarquía de directorios.
+    Primero consulta el manifiesto de particiones (un archivo pequeño): basta con
+    que exista uno de los CSV que lista. Si no hay manifiesto, usa búsqueda
+    RECURSIVA para explorar la jerarquía de directorios.
     
     Args:
         base_dir: Directorio base de la pokédex
@@ -203,7 +247,12 @@ def verificar_si_ya_existe_precarga(base_dir="pokedex"):
         if not os.path.isdir(base_dir):
             return False
         
-        # Usar función recursiva para buscar CSV
+        # Respuesta rápida desde el manifiesto (sin recorrer carpetas)
+        for particion in cargar_manifiesto(base_dir)["particiones"]:
+            if os.path.isfile(os.path.join(base_dir, *particion.split("/"))):
+                return True
+        
+        # Sin manifiesto (o desactualizado): usar función recursiva para buscar CSV
         return buscar_csv_recursivo(base_dir)
         
     except Exception as e:
@@ -211,6 +260,37 @@ def verificar_si_ya_existe_precarga(base_dir="pokedex"):
         return False
 
 
+def precargar_un_pokemon(nombre, base_dir="pokedex", silencioso=False):
+    """
+    Descarga un Pokémon de la PokéAPI y lo guarda si todavía no está en la Pokédex.
+    
+    Args:
+        nombre: Nombre del Pokémon
+        base_dir: Directorio base de la pokédex
+        silencioso: True para no mostrar mensajes (precarga en segundo plano)
+        
+    Returns:
+        str: "nuevo", "existente" o None si no se pudo obtener
+    """
+    # Validar que nombre sea string
+    if not isinstance(nombre, str) or not nombre.strip():
+        return None
+    
+    pokemon = obtener_pokemon(nombre, silencioso)
+    
+    # Validar que pokemon sea un diccionario con los campos requeridos
+    if not isinstance(pokemon, dict) or "generacion" not in pokemon or "tipo" not in pokemon:
+        return None
+    
+    archivo = os.path.join(base_dir, pokemon["generacion"], pokemon["tipo"], "pokemon.csv")
+    
+    if existe_pokemon_en_csv(nombre, archivo):
+        return "existente"
+    
+    guardar_pokemon(pokemon, base_dir, silencioso)
+    return "nuevo"
+
+
 def precargar_pokemon():
     """
     Carga automáticamente Pokémon por generación SOLO si no existe ningún CSV.
@@ -276,30 +356,11 @@ def precargar_pokemon():
                 
                 for nombre in nombres:
                     try:
-                        # Validar que nombre sea string
-                        if not isinstance(nombre, str) or not nombre.strip():
-                            continue
-                        
-                        pokemon = obtener_pokemon(nombre)
-                        
-                        if not pokemon:
-                            continue
-                        
-                        # Validar que pokemon sea un diccionario
-                        if not isinstance(pokemon, dict):
-                            continue
-                        
-                        # Validar campos requeridos
-                        if "generacion" not in pokemon or "tipo" not in pokemon:
-                            continue
+                        resultado = precargar_un_pokemon(nombre, base_dir)
                         
-                        path = os.path.join(base_dir, pokemon["generacion"], pokemon["tipo"])
-                        archivo = os.path.join(path, "pokemon.csv")
-                        
-                        if existe_pokemon_en_csv(nombre, archivo):
+                        if resultado == "existente":
                             existentes += 1
-                        else:
-                            guardar_pokemon(pokemon)
+                        elif resultado == "nuevo":
                             nuevos += 1
                             
                     except KeyboardInterrupt:
@@ -325,10 +386,286 @@ def precargar_pokemon():
                 except Exception:
                     continue
             print()
+            
+            # Lista nacional para el autocompletado (se guarda en caché)
+            descargar_nombres_nacionales(base_dir)
+            
+            # Crear el manifiesto para que los próximos inicios no recorran la pokédex
+            listar_particiones(base_dir)
         else:
             print("\nAVISO: No se pudieron cargar datos iniciales\n")
             
     except KeyboardInterrupt:
         print("\nAVISO: Precarga cancelada por el usuario")
     except Exception as e:
-        print(f"AVISO: Error inesperado en precarga: {e}")
\ No newline at end of file
+        print(f"AVISO: Error inesperado en precarga: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Precarga en segundo plano
+# ---------------------------------------------------------------------------
+# Un único hilo trabajador consume una cola con prioridad: las consultas que pide
+# el usuario (agregar) pasan antes que las descargas pendientes de la precarga.
+# Cada Pokémon se guarda apenas llega, así que los listados y búsquedas del menú
+# lo ven sin esperar a que termine toda la carga.
+
+# Prioridades de la cola (menor = antes)
+PRIORIDAD_DETENER = -1
+PRIORIDAD_USUARIO = 0
+PRIORIDAD_PRECARGA = 10
+
+# Entradas (prioridad, orden de llegada, tarea); el orden desempata dentro de una prioridad
+COLA_DESCARGAS = PriorityQueue()
+ORDEN_DESCARGAS = itertools.count()
+
+# Estado de la precarga en segundo plano (se muestra en el menú)
+PRECARGA = {
+    "estado": "inactiva",  # inactiva | en curso | completa | detenida
+    "total": 0,            # Pokémon a descargar (estimado hasta recibir cada lista)
+    "procesados": 0,
+    "nuevos": 0,
+    "existentes": 0,
+    "errores": 0,
+    "pendientes": 0,       # tareas de precarga que faltan terminar
+    "informado": False,    # ya se mostró el aviso de fin en el menú
+    "hilo": None,
+}
+
+# Protege los contadores de PRECARGA (los actualiza el hilo trabajador)
+BLOQUEO_PRECARGA = threading.Lock()
+
+
+def trabajador_descargas():
+    """
+    Bucle del hilo trabajador: ejecuta las tareas de la cola por prioridad
+    hasta recibir la tarea de fin (None).
+    """
+    while True:
+        _, _, tarea = COLA_DESCARGAS.get()
+        
+        if tarea is None:
+            break
+        
+        try:
+            tarea["resultado"] = tarea["funcion"]()
+        except Exception:
+            with BLOQUEO_PRECARGA:
+                PRECARGA["errores"] += 1
+        finally:
+            if tarea["listo"] is not None:
+                tarea["listo"].set()
+
+
+def precarga_activa():
+    """
+    Indica si el hilo trabajador está corriendo.
+    """
+    hilo = PRECARGA["hilo"]
+    return hilo is not None and hilo.is_alive()
+
+
+def encolar_descarga(funcion, prioridad=PRIORIDAD_PRECARGA, esperar=False):
+    """
+    Agrega una tarea a la cola del hilo trabajador.
+    
+    Args:
+        funcion: Función sin argumentos a ejecutar
+        prioridad: PRIORIDAD_USUARIO o PRIORIDAD_PRECARGA
+        esperar: True para esperar a que termine y devolver su resultado
+        
+    Returns:
+        Resultado de la función si esperar es True, None si no
+    """
+    tarea = {
+        "funcion": funcion,
+        "resultado": None,
+        "listo": threading.Event() if esperar else None,
+    }
+    COLA_DESCARGAS.put((prioridad, next(ORDEN_DESCARGAS), tarea))
+    
+    if esperar:
+        tarea["listo"].wait()
+    return tarea["resultado"]
+
+
+def obtener_pokemon_prioritario(nombre):
+    """
+    Consulta un Pokémon en la PokéAPI para el usuario. Si la precarga está en curso,
+    la consulta pasa por la cola con prioridad de usuario (antes que las descargas
+    pendientes); si no, se hace directamente.
+    
+    Args:
+        nombre: Nombre o ID del Pokémon
+        
+    Returns:
+        dict: Datos del Pokémon o None si no se encontró
+    """
+    if precarga_activa():
+        return encolar_descarga(lambda: obtener_pokemon(nombre), PRIORIDAD_USUARIO, esperar=True)
+    return obtener_pokemon(nombre)
+
+
+def terminar_tarea_precarga(base_dir):
+    """
+    Descuenta una tarea de precarga; al terminar la última, guarda la lista nacional
+    y el manifiesto y marca la precarga como completa.
+    """
+    with BLOQUEO_PRECARGA:
+        PRECARGA["pendientes"] -= 1
+        ultima = PRECARGA["pendientes"] == 0
+    
+    if not ultima:
+        return
+    
+    if PRECARGA["nuevos"]:
+        # Lista nacional para el autocompletado y manifiesto para los próximos inicios
+        descargar_nombres_nacionales(base_dir, silencioso=True)
+        listar_particiones(base_dir)
+    
+    PRECARGA["estado"] = "completa"
+
+
+def tarea_generacion(gen, datos, base_dir):
+    """
+    Crea la tarea que lista los Pokémon de una generación y encola uno por uno.
+    """
+    def tarea():
+        try:
+            esperados = min(5, datos.get("limit", 5))
+            nombres = obtener_lista_pokemon(esperados, datos.get("offset", 0), silencioso=True)
+            
+            with BLOQUEO_PRECARGA:
+                # Ajustar el total estimado con la cantidad real recibida
+                PRECARGA["total"] += len(nombres) - esperados
+                PRECARGA["pendientes"] += len(nombres)
+                if not nombres:
+                    PRECARGA["errores"] += 1
+            
+            for nombre in nombres:
+                encolar_descarga(tarea_pokemon(nombre, base_dir))
+        finally:
+            terminar_tarea_precarga(base_dir)
+    
+    return tarea
+
+
+def tarea_pokemon(nombre, base_dir):
+    """
+    Crea la tarea que descarga y guarda un Pokémon de la precarga.
+    """
+    def tarea():
+        try:
+            resultado = precargar_un_pokemon(nombre, base_dir, silencioso=True)
+            
+            with BLOQUEO_PRECARGA:
+                PRECARGA["procesados"] += 1
+                if resultado == "nuevo":
+                    PRECARGA["nuevos"] += 1
+                elif resultado == "existente":
+                    PRECARGA["existentes"] += 1
+                else:
+                    PRECARGA["errores"] += 1
+        finally:
+            terminar_tarea_precarga(base_dir)
+    
+    return tarea
+
+
+def iniciar_precarga_en_segundo_plano(base_dir="pokedex"):
+    """
+    Igual que precargar_pokemon, pero las descargas se hacen en un hilo y el menú
+    se puede usar mientras tanto. El avance se consulta con texto_progreso_precarga.
+    
+    Args:
+        base_dir: Directorio base de la pokédex
+        
+    Returns:
+        bool: True si se inició la precarga
+    """
+    try:
+        # Verificar si ya existe precarga (manifiesto o búsqueda recursiva)
+        if verificar_si_ya_existe_precarga(base_dir):
+            print("\nAVISO: Ya tienes datos en tu Pokédex. Cancelando carga inicial\n")
+            return False
+        
+        if precarga_activa() and PRECARGA["estado"] == "en curso":
+            return False
+        
+        try:
+            os.makedirs(base_dir, exist_ok=True)
+        except OSError as e:
+            print(f"AVISO: No se pudo crear directorio {base_dir}: {e}")
+            return False
+        
+        generaciones = [
+            (gen, datos) for gen, datos in GENERACIONES.items()
+            if isinstance(datos, dict) and isinstance(datos.get("offset"), int) and isinstance(datos.get("limit"), int)
+        ]
+        
+        with BLOQUEO_PRECARGA:
+            PRECARGA.update({
+                "estado": "en curso",
+                "total": sum(min(5, datos["limit"]) for _, datos in generaciones),
+                "procesados": 0,
+                "nuevos": 0,
+                "existentes": 0,
+                "errores": 0,
+                "pendientes": len(generaciones),
+                "informado": False,
+            })
+        
+        if not precarga_activa():
+            # Hilo daemon: no impide cerrar el programa (detener_precarga espera la tarea en curso)
+            PRECARGA["hilo"] = threading.Thread(target=trabajador_descargas, name="precarga", daemon=True)
+            PRECARGA["hilo"].start()
+        
+        for gen, datos in generaciones:
+            encolar_descarga(tarea_generacion(gen, datos, base_dir))
+        
+        print("\nAVISO: Importando tus registros de Pokémon en segundo plano. Puedes usar el menú mientras tanto.")
+        return True
+        
+    except Exception as e:
+        print(f"AVISO: Error inesperado al iniciar la precarga: {e}")
+        return False
+
+
+def texto_progreso_precarga():
+    """
+    Arma la línea de avance de la precarga para mostrar en el menú.
+    
+    Returns:
+        str: Texto de avance o None si no hay nada que mostrar
+    """
+    with BLOQUEO_PRECARGA:
+        estado = PRECARGA["estado"]
+        errores = f", {PRECARGA['errores']} con error" if PRECARGA["errores"] else ""
+        
+        if estado == "en curso":
+            return (f"Precarga en segundo plano: {PRECARGA['procesados']}/{PRECARGA['total']} Pokémon "
+                    f"({PRECARGA['nuevos']} nuevos{errores})")
+        
+        if estado == "completa" and not PRECARGA["informado"]:
+            # El aviso de fin se muestra una sola vez
+            PRECARGA["informado"] = True
+            return f"Precarga completa: {PRECARGA['nuevos']} registros agregados a la Pokédex{errores}"
+    
+    return None
+
+
+def detener_precarga(espera=10):
+    """
+    Detiene el hilo trabajador: termina la tarea en curso (para no dejar un CSV a
+    medio escribir) y descarta las descargas pendientes.
+    
+    Args:
+        espera: Segundos máximos a esperar la tarea en curso
+    """
+    if not precarga_activa():
+        return
+    
+    if PRECARGA["estado"] == "en curso":
+        PRECARGA["estado"] = "detenida"
+    
+    COLA_DESCARGAS.put((PRIORIDAD_DETENER, next(ORDEN_DESCARGAS), None))
+    PRECARGA["hilo"].join(espera)
@@ -0,0 +1,270 @@
+import sys
+import time
+import argparse
+from .crud import agregar_pokemon, editar_pokemon, borrar_pokemon, estadisticas, CAMPOS_EDITABLES
+from .carga_automatica import precargar_pokemon
+from .exportar import FORMATOS_EXPORTACION, exportar_todos, exportar_generacion, exportar_tipo, exportar_busqueda
+from .indice import ORDENES
+from .instantanea import adjuntar_instantanea, publicar_instantanea
+from .metricas import activar_metricas, medir
+from .perfilado import activar_perfilado, perfilar
+
+# Línea de comandos no interactiva: `python main.py <comando> ...` ejecuta una sola
+# operación y termina, sin menú, sin encabezados y sin precarga (salvo que se pida
+# con --precargar o con el comando "precargar"). Pensado para cron y scripts.
+# Sin comando, pero con opciones generales (ej: --metricas, --perfilar), se abre el menú.
+
+# Códigos de salida
+EXITO = 0
+FALLO = 1        # la operación no se pudo hacer o no encontró resultados
+USO_INVALIDO = 2  # argumentos incorrectos (el mismo que usa argparse)
+
+
+def agregar_opciones_salida(parser):
+    """
+    Agrega las opciones comunes de los comandos que listan Pokémon.
+    """
+    parser.add_argument("--formato", choices=FORMATOS_EXPORTACION, default="texto",
+                        help="formato de salida (default: texto)")
+    parser.add_argument("--detalle", choices=["simple", "detallado", "completo"], default="simple",
+                        help="formato de cada fila en la salida de texto (default: simple)")
+    parser.add_argument("--salida", metavar="ARCHIVO",
+                        help="archivo de destino (default: salida estándar)")
+
+
+def construir_parser():
+    """
+    Arma el parser de argumentos con un subcomando por operación.
+
+    Returns:
+        argparse.ArgumentParser: Parser listo para usar
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Pokédex jerárquica. Sin comando abre el menú interactivo."
+    )
+    parser.add_argument("--precargar", action="store_true",
+                        help="ejecutar la carga automática inicial antes del comando")
+    parser.add_argument("--tiempo", action="store_true",
+                        help="mostrar en la salida de errores el tiempo de arranque y del comando")
+    parser.add_argument("--metricas", action="store_true",
+                        help="registrar contadores y latencias y mostrarlos al salir")
+    parser.add_argument("--metricas-salida", metavar="ARCHIVO",
+                        help="volcar las métricas en ARCHIVO (.json para JSON) en lugar de "
+                             "la salida de errores; implica --metricas")
+    parser.add_argument("--perfilar", metavar="DIR",
+                        help="perfilar cada acción (cProfile y tracemalloc) y guardar los informes en DIR")
+
+    comandos = parser.add_subparsers(dest="comando", metavar="comando")
+
+    # agregar
+    agregar = comandos.add_parser("agregar", aliases=["add"], help="agregar un Pokémon desde la PokéAPI")
+    agregar.add_argument("nombre", help="nombre o ID del Pokémon")
+    agregar.set_defaults(funcion=comando_agregar)
+
+    # listar
+    listar = comandos.add_parser("listar", aliases=["list"], help="listar toda la Pokédex")
+    listar.add_argument("--orden", choices=sorted(ORDENES),
+                        help="; ".join(f"{k} = {v[2]}" for k, v in sorted(ORDENES.items())))
+    agregar_opciones_salida(listar)
+    listar.set_defaults(funcion=comando_listar)
+
+    # buscar
+    buscar = comandos.add_parser("buscar", aliases=["search"], help="buscar por nombre, habilidad o ID")
+    buscar.add_argument("termino", help="nombre, habilidad, ID (25) o rango de IDs (1-151)")
+    buscar.add_argument("--modo", choices=["nombre", "habilidad", "id"], default="nombre",
+                        help="qué se busca (default: nombre)")
+    buscar.add_argument("--umbral", type=int, default=60,
+                        help="similitud mínima entre 0 y 100 (default: 60)")
+    agregar_opciones_salida(buscar)
+    buscar.set_defaults(funcion=comando_buscar)
+
+    # filtrar
+    filtrar = comandos.add_parser("filtrar", aliases=["filter"], help="filtrar por generación o tipo")
+    criterio = filtrar.add_mutually_exclusive_group(required=True)
+    criterio.add_argument("--generacion", help="ej: generation-i")
+    criterio.add_argument("--tipo", nargs="+", metavar="TIPO",
+                          help="uno o dos tipos (dos = Pokémon de doble tipo)")
+    filtrar.add_argument("--orden", choices=sorted(ORDENES),
+                         help="; ".join(f"{k} = {v[2]}" for k, v in sorted(ORDENES.items())))
+    agregar_opciones_salida(filtrar)
+    filtrar.set_defaults(funcion=comando_filtrar)
+
+    # estadisticas
+    stats = comandos.add_parser("estadisticas", aliases=["stats"], help="mostrar estadísticas")
+    stats.set_defaults(funcion=comando_estadisticas)
+
+    # editar
+    editar = comandos.add_parser("editar", aliases=["edit"], help="modificar un campo de un Pokémon")
+    editar.add_argument("nombre", help="nombre del Pokémon")
+    editar.add_argument("campo", choices=CAMPOS_EDITABLES, help="campo a modificar")
+    editar.add_argument("valor", help="nuevo valor")
+    editar.set_defaults(funcion=comando_editar)
+
+    # eliminar
+    eliminar = comandos.add_parser("eliminar", aliases=["delete"], help="eliminar un Pokémon")
+    eliminar.add_argument("nombre", help="nombre del Pokémon")
+    eliminar.add_argument("-s", "--si", action="store_true",
+                          help="no pedir confirmación (necesario si no hay terminal)")
+    eliminar.set_defaults(funcion=comando_eliminar)
+
+    # precargar
+    precargar = comandos.add_parser("precargar", aliases=["preload"], help="ejecutar la carga automática inicial")
+    precargar.set_defaults(funcion=comando_precargar)
+
+    # servir
+    servir = comandos.add_parser("servir", aliases=["serve"], help="atender una API JSON de solo lectura")
+    servir.add_argument("--host", default="127.0.0.1", help="dirección donde escuchar (default: 127.0.0.1)")
+    servir.add_argument("--puerto", type=int, default=8000, help="puerto TCP (default: 8000)")
+    servir.add_argument("--silencioso", action="store_true", help="no registrar cada consulta en la consola")
+    servir.add_argument("--instantanea", action="store_true",
+                        help="responder desde la instantánea compartida (varios procesos en el mismo equipo)")
+    servir.set_defaults(funcion=comando_servir)
+
+    # instantanea
+    instantanea = comandos.add_parser("instantanea", aliases=["snapshot"],
+                                      help="publicar la instantánea de solo lectura para otros procesos")
+    instantanea.set_defaults(funcion=comando_instantanea)
+
+    return parser
+
+
+def resultado_exportacion(cantidad):
+    """
+    Traduce la cantidad exportada a un código de salida (como grep: 1 si no hubo filas).
+    """
+    if cantidad is None or cantidad == 0:
+        return FALLO
+    return EXITO
+
+
+def comando_agregar(args):
+    return EXITO if agregar_pokemon(args.nombre) else FALLO
+
+
+def leer_de_instantanea():
+    """
+    Los comandos de lectura usan la instantánea si hay una publicada y al día
+    (ver instantanea.py); si no, leen los CSV o el índice como siempre.
+    """
+    adjuntar_instantanea(publicar=False)
+
+
+def comando_listar(args):
+    leer_de_instantanea()
+    return resultado_exportacion(exportar_todos(args.formato, args.salida, args.orden, args.detalle))
+
+
+def comando_buscar(args):
+    leer_de_instantanea()
+    return resultado_exportacion(
+        exportar_busqueda(args.termino, args.formato, args.salida, args.umbral, args.modo, args.detalle)
+    )
+
+
+def comando_filtrar(args):
+    leer_de_instantanea()
+    if args.generacion:
+        cantidad = exportar_generacion(args.generacion, args.formato, args.salida, args.orden, args.detalle)
+    else:
+        if len(args.tipo) > 2:
+            print("AVISO: Se pueden indicar como máximo dos tipos.", file=sys.stderr)
+            return USO_INVALIDO
+        cantidad = exportar_tipo(args.tipo, args.formato, args.salida, args.orden, args.detalle)
+    return resultado_exportacion(cantidad)
+
+
+def comando_estadisticas(args):
+    leer_de_instantanea()
+    return EXITO if estadisticas() else FALLO
+
+
+def comando_editar(args):
+    return EXITO if editar_pokemon(args.nombre, args.campo, args.valor) else FALLO
+
+
+def comando_eliminar(args):
+    return EXITO if borrar_pokemon(args.nombre, confirmado=args.si) else FALLO
+
+
+def comando_precargar(args):
+    precargar_pokemon()
+    return EXITO
+
+
+def comando_servir(args):
+    # Importación diferida: http.server solo hace falta en este comando
+    from .servidor import servir
+    return EXITO if servir(args.host, args.puerto, args.silencioso, args.instantanea) else FALLO
+
+
+def comando_instantanea(args):
+    publicada = publicar_instantanea()
+    if publicada is None:
+        return FALLO
+    print(f"Instantánea publicada: {publicada['archivo']} ({publicada['total']} Pokémon, "
+          f"{publicada['bytes'] / 1024:.0f} KB, sello {publicada['sello']})")
+    return EXITO
+
+
+def ejecutar_cli(argumentos, inicio=None, menu_interactivo=None):
+    """
+    Ejecuta un comando de la línea de comandos.
+
+    Args:
+        argumentos: Lista de argumentos (sin el nombre del programa)
+        inicio: time.perf_counter() al iniciar el programa (para --tiempo)
+        menu_interactivo: Función del menú, para cuando no se indica comando
+
+    Returns:
+        int: Código de salida (EXITO, FALLO o USO_INVALIDO)
+    """
+    parser = construir_parser()
+
+    try:
+        args = parser.parse_args(argumentos)
+    except SystemExit as e:
+        # argparse termina con 0 en --help y con 2 si los argumentos son inválidos
+        return e.code if isinstance(e.code, int) else USO_INVALIDO
+
+    if args.comando is None and menu_interactivo is None:
+        parser.print_usage(sys.stderr)
+        print("main.py: error: falta el comando", file=sys.stderr)
+        return USO_INVALIDO
+
+    if args.metricas or args.metricas_salida:
+        activar_metricas(args.metricas_salida)
+
+    if args.perfilar and not activar_perfilado(args.perfilar):
+        return FALLO
+
+    if args.comando is None:
+        menu_interactivo()
+        return EXITO
+
+    if args.tiempo and inicio is not None:
+        print(f"Arranque: {(time.perf_counter() - inicio) * 1000:.1f} ms", file=sys.stderr)
+
+    comienzo = time.perf_counter()
+
+    try:
+        if args.precargar and args.funcion is not comando_precargar:
+            precargar_pokemon()
+
+        nombre = args.funcion.__name__.removeprefix("comando_")
+        with medir("comando." + nombre), perfilar("comando_" + nombre):
+            return args.funcion(args)
+
+    except KeyboardInterrupt:
+        print("\nAVISO: Operación cancelada por el usuario", file=sys.stderr)
+        return FALLO
+    except EOFError:
+        # Se pidió una confirmación pero no hay entrada (ej: cron)
+        print("\nAVISO: No hay entrada disponible para confirmar (usa --si)", file=sys.stderr)
+        return FALLO
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al ejecutar el comando: {e}", file=sys.stderr)
+        return FALLO
+    finally:
+        if args.tiempo:
+            print(f"Comando: {(time.perf_counter() - comienzo) * 1000:.1f} ms", file=sys.stderr)
@@ -0,0 +1,430 @@
+import math
+from array import array
+from itertools import islice
+from .indice import tipos_de
+
+# NumPy es opcional: si está instalado se usa para armar las columnas y para las
+# reducciones. Se importa recién al calcular estadísticas (tarda en cargar y el
+# resto del programa no lo necesita)
+NUMPY = {"cargado": False, "modulo": None}
+
+# Con NumPy las filas se procesan en bloques de este tamaño: cada columna se
+# convierte de una vez por bloque y la memoria extra no crece con la Pokédex
+FILAS_POR_BLOQUE = 50000
+
+# Columnas numéricas sobre las que se calculan estadísticas
+CAMPOS_NUMERICOS = ["peso", "altura", "base_experience"]
+
+# Campos que leen las estadísticas (el resto de cada fila no hace falta)
+CAMPOS_ESTADISTICAS = CAMPOS_NUMERICOS + ["tipo", "tipos", "generacion"]
+
+# Percentiles que se reportan para cada columna numérica
+PERCENTILES = (25, 75, 90)
+
+
+def _numpy():
+    """
+    Importa NumPy la primera vez que se necesita.
+
+    Returns:
+        module: numpy o None si no está instalado
+    """
+    if not NUMPY["cargado"]:
+        try:
+            import numpy
+            NUMPY["modulo"] = numpy
+        except ImportError:
+            NUMPY["modulo"] = None
+        NUMPY["cargado"] = True
+
+    return NUMPY["modulo"]
+
+
+def convertir_a_numero(valor):
+    """
+    Convierte el valor de una celda del CSV a float.
+
+    Args:
+        valor: Valor leído del CSV (normalmente un string)
+
+    Returns:
+        float: Número convertido o None si el valor no es numérico válido
+    """
+    try:
+        if valor is None or valor == "":
+            return None
+
+        numero = float(valor)
+
+        # Descartar NaN e infinitos
+        if math.isnan(numero) or math.isinf(numero):
+            return None
+
+        return numero
+
+    except (TypeError, ValueError):
+        return None
+
+
+def _vector(np, valores):
+    """
+    Vista de NumPy sobre una columna (array de la librería estándar o vector de NumPy).
+    """
+    if isinstance(valores, np.ndarray):
+        return valores
+    return np.frombuffer(valores, dtype=np.dtype(valores.typecode))
+
+
+def _numeros_de_bloque(np, celdas):
+    """
+    Convierte las celdas de una columna a float64 de una vez y deja solo las válidas.
+
+    Args:
+        celdas: Lista con el valor de la columna en cada fila del bloque
+
+    Returns:
+        numpy.ndarray: Valores numéricos finitos (sin vacíos, NaN ni infinitos)
+    """
+    try:
+        # NumPy convierte los textos al crear el vector; las celdas vacías quedan como NaN
+        numeros = np.array(["nan" if celda is None or celda == "" else celda for celda in celdas],
+                           dtype=np.float64)
+    except (TypeError, ValueError):
+        # Alguna celda no es un número: solo entonces se convierten una por una
+        numeros = np.array([convertir_a_numero(celda) for celda in celdas], dtype=np.float64)
+
+    # Una sola máscara de validez: los vacíos y los inválidos quedaron como NaN
+    return numeros[np.isfinite(numeros)]
+
+
+def _codificar_bloque(np, valores, etiquetas, codigos):
+    """
+    Codifica las etiquetas de un bloque como enteros. Solo los valores distintos
+    pasan por Python; los códigos nuevos se asignan por orden de aparición.
+
+    Args:
+        valores: Lista con la etiqueta de cada fila del bloque
+        etiquetas / codigos: Lista de etiquetas y dict etiqueta -> código (se amplían)
+
+    Returns:
+        tuple: (códigos de cada valor distinto, índice del distinto de cada fila)
+    """
+    distintos, primeros, inverso = np.unique(np.asarray(valores, dtype=str),
+                                             return_index=True, return_inverse=True)
+    for posicion in np.argsort(primeros, kind="stable"):
+        etiqueta = str(distintos[posicion])
+        if etiqueta not in codigos:
+            codigos[etiqueta] = len(etiquetas)
+            etiquetas.append(etiqueta)
+
+    tabla = np.array([codigos[str(etiqueta)] for etiqueta in distintos], dtype=np.int64)
+    return tabla, inverso.reshape(-1)
+
+
+def _columnas_numpy(np, filas, columnas):
+    """
+    Arma las columnas por bloques de FILAS_POR_BLOQUE filas con operaciones de NumPy.
+    """
+    partes = {campo: [] for campo in CAMPOS_NUMERICOS}
+    partes_tipo, partes_gen, partes_gen_fila = [], [], []
+    codigos_tipo, codigos_gen = {}, {}
+    iterador = iter(filas)
+
+    while True:
+        crudo = list(islice(iterador, FILAS_POR_BLOQUE))
+        if not crudo:
+            break
+
+        bloque = [fila for fila in crudo if isinstance(fila, dict)]
+        if not bloque:
+            continue
+        columnas["total"] += len(bloque)
+
+        for campo in CAMPOS_NUMERICOS:
+            partes[campo].append(_numeros_de_bloque(np, [fila.get(campo) for fila in bloque]))
+
+        tabla_gen, inverso_gen = _codificar_bloque(
+            np, [fila.get("generacion") or "desconocida" for fila in bloque], columnas["generaciones"], codigos_gen
+        )
+        gen_fila = tabla_gen[inverso_gen]
+        partes_gen_fila.append(gen_fila)
+
+        # Los tipos se separan una vez por cada texto distinto ("water, ground", ...)
+        # y después se expanden a un par (tipo, generación) por cada tipo de cada fila
+        distintos, primeros, inverso = np.unique(
+            np.asarray([fila.get("tipos") or fila.get("tipo") or "" for fila in bloque], dtype=str),
+            return_index=True, return_inverse=True
+        )
+        inverso = inverso.reshape(-1)
+        tipos_por_texto = [tipos_de({"tipos": str(texto)}) or ["desconocido"] for texto in distintos]
+        for posicion in np.argsort(primeros, kind="stable"):
+            for tipo in tipos_por_texto[posicion]:
+                if tipo not in codigos_tipo:
+                    codigos_tipo[tipo] = len(columnas["tipos"])
+                    columnas["tipos"].append(tipo)
+        por_texto = [[codigos_tipo[tipo] for tipo in tipos] for tipos in tipos_por_texto]
+
+        largos = np.array([len(codigos) for codigos in por_texto], dtype=np.int64)
+        inicios = np.cumsum(largos) - largos
+        planos = np.array([codigo for codigos in por_texto for codigo in codigos], dtype=np.int64)
+
+        repeticiones = largos[inverso]
+        desplazamiento = np.arange(repeticiones.sum()) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+        partes_tipo.append(planos[np.repeat(inicios[inverso], repeticiones) + desplazamiento])
+        partes_gen.append(np.repeat(gen_fila, repeticiones))
+
+    def unir(lista, tipo):
+        return np.concatenate(lista) if lista else np.zeros(0, dtype=tipo)
+
+    columnas["numericas"] = {campo: unir(partes[campo], np.float64) for campo in CAMPOS_NUMERICOS}
+    columnas["codigo_tipo"] = unir(partes_tipo, np.int64)
+    columnas["codigo_gen"] = unir(partes_gen, np.int64)
+    columnas["codigo_gen_fila"] = unir(partes_gen_fila, np.int64)
+    return columnas
+
+
+def construir_columnas(filas):
+    """
+    Construye las columnas de la Pokédex en un solo recorrido de los datos.
+
+    Con NumPy, cada columna se arma de una vez por bloque de filas (conversión a
+    float64 con una máscara de validez y códigos con numpy.unique), sin un bucle
+    de Python por fila. Sin NumPy se recorren las filas y se llenan arreglos
+    `array('d')`. El tipo y la generación se codifican como enteros para poder
+    contarlos de forma vectorizada.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+
+    Returns:
+        dict: Columnas con las claves:
+            - total: Cantidad de filas procesadas
+            - numericas: {campo: vector} con los valores válidos
+            - tipos / generaciones: Listas con las etiquetas de cada código
+            - codigo_tipo / codigo_gen: vectores con un par (tipo, generación) por entrada
+            - codigo_gen_fila: vector con la generación de cada fila
+            (los vectores son de NumPy o `array` de la librería estándar)
+    """
+    columnas = {
+        "total": 0,
+        "numericas": {campo: array("d") for campo in CAMPOS_NUMERICOS},
+        "tipos": [],
+        "generaciones": [],
+        "codigo_tipo": array("l"),
+        "codigo_gen": array("l"),
+        "codigo_gen_fila": array("l"),
+    }
+
+    try:
+        if filas is None:
+            return columnas
+
+        np = _numpy()
+        if np is not None:
+            return _columnas_numpy(np, filas, columnas)
+
+        numericas = columnas["numericas"]
+        codigos_tipo = {}
+        codigos_gen = {}
+
+        for fila in filas:
+            # Validar que la fila sea un diccionario
+            if not isinstance(fila, dict):
+                continue
+
+            columnas["total"] += 1
+
+            for campo in CAMPOS_NUMERICOS:
+                numero = convertir_a_numero(fila.get(campo))
+                if numero is not None:
+                    numericas[campo].append(numero)
+
+            gen = fila.get("generacion") or "desconocida"
+            codigo_gen = codigos_gen.get(gen)
+            if codigo_gen is None:
+                codigo_gen = codigos_gen[gen] = len(columnas["generaciones"])
+                columnas["generaciones"].append(gen)
+            columnas["codigo_gen_fila"].append(codigo_gen)
+
+            # Un par (tipo, generación) por cada tipo del Pokémon
+            for tipo in tipos_de(fila) or ["desconocido"]:
+                codigo_tipo = codigos_tipo.get(tipo)
+                if codigo_tipo is None:
+                    codigo_tipo = codigos_tipo[tipo] = len(columnas["tipos"])
+                    columnas["tipos"].append(tipo)
+                columnas["codigo_tipo"].append(codigo_tipo)
+                columnas["codigo_gen"].append(codigo_gen)
+
+        return columnas
+
+    except Exception as e:
+        print(f"\nAVISO: Error al construir columnas: {e}")
+        return columnas
+
+
+def _percentil_ordenado(ordenados, percentil):
+    """
+    Calcula un percentil con interpolación lineal sobre valores ya ordenados.
+    Usa el mismo criterio que `numpy.percentile` por defecto.
+    """
+    if len(ordenados) == 1:
+        return ordenados[0]
+
+    posicion = (len(ordenados) - 1) * percentil / 100
+    inferior = math.floor(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fraccion
+
+
+def resumir_columna(valores):
+    """
+    Calcula el resumen estadístico de una columna numérica.
+
+    Args:
+        valores: Vector con los valores de la columna (ver construir_columnas)
+
+    Returns:
+        dict: count, mean, min, max, median, stddev y percentiles (p25, p75, p90).
+              Si la columna está vacía solo contiene count = 0.
+    """
+    try:
+        cantidad = len(valores)
+
+        if cantidad == 0:
+            return {"count": 0}
+
+        np = _numpy()
+        if np is not None:
+            # Vista sin copia sobre el buffer del array
+            vector = _vector(np, valores)
+            cortes = np.percentile(vector, [50, *PERCENTILES])
+            resumen = {
+                "count": cantidad,
+                "mean": float(vector.mean()),
+                "min": float(vector.min()),
+                "max": float(vector.max()),
+                "median": float(cortes[0]),
+                "stddev": float(vector.std()),
+            }
+            for percentil, valor in zip(PERCENTILES, cortes[1:]):
+                resumen[f"p{percentil}"] = float(valor)
+            return resumen
+
+        # Sin NumPy: un ordenamiento y dos acumulaciones en C (sorted / math.fsum)
+        ordenados = sorted(valores)
+        media = math.fsum(ordenados) / cantidad
+        varianza = math.fsum((x - media) ** 2 for x in ordenados) / cantidad
+
+        resumen = {
+            "count": cantidad,
+            "mean": media,
+            "min": ordenados[0],
+            "max": ordenados[-1],
+            "median": _percentil_ordenado(ordenados, 50),
+            "stddev": math.sqrt(varianza),
+        }
+        for percentil in PERCENTILES:
+            resumen[f"p{percentil}"] = _percentil_ordenado(ordenados, percentil)
+        return resumen
+
+    except Exception as e:
+        print(f"\nAVISO: Error al resumir columna: {e}")
+        return {"count": 0}
+
+
+def _contar_codigos(codigos, cantidad):
+    """
+    Cuenta cuántas veces aparece cada código entero en [0, cantidad).
+    """
+    if cantidad == 0:
+        return []
+
+    np = _numpy()
+    if np is not None and len(codigos):
+        vector = _vector(np, codigos)
+        return [int(x) for x in np.bincount(vector, minlength=cantidad)]
+
+    conteo = [0] * cantidad
+    for codigo in codigos:
+        conteo[codigo] += 1
+    return conteo
+
+
+def tabla_cruzada(columnas):
+    """
+    Calcula la tabla cruzada tipo × generación a partir de las columnas.
+
+    Args:
+        columnas: Diccionario devuelto por construir_columnas
+
+    Returns:
+        dict: {tipo: {generacion: cantidad}} solo con las celdas no vacías
+    """
+    try:
+        tipos = columnas.get("tipos", [])
+        generaciones = columnas.get("generaciones", [])
+        n_gen = len(generaciones)
+
+        if not tipos or not n_gen:
+            return {}
+
+        # Codificar cada par (tipo, generación) como un único entero
+        np = _numpy()
+        if np is not None:
+            codigo_tipo = _vector(np, columnas["codigo_tipo"])
+            codigo_gen = _vector(np, columnas["codigo_gen"])
+            pares = codigo_tipo * n_gen + codigo_gen
+            conteo = [int(x) for x in np.bincount(pares, minlength=len(tipos) * n_gen)]
+        else:
+            pares = array("l", (t * n_gen + g for t, g in zip(columnas["codigo_tipo"], columnas["codigo_gen"])))
+            conteo = _contar_codigos(pares, len(tipos) * n_gen)
+
+        tabla = {}
+        for i, tipo in enumerate(tipos):
+            fila = {}
+            for j, gen in enumerate(generaciones):
+                cantidad = conteo[i * n_gen + j]
+                if cantidad:
+                    fila[gen] = cantidad
+            tabla[tipo] = fila
+
+        return tabla
+
+    except Exception as e:
+        print(f"\nAVISO: Error al calcular tabla cruzada: {e}")
+        return {}
+
+
+def calcular_estadisticas(filas):
+    """
+    Calcula todas las estadísticas de la Pokédex en un solo recorrido.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+
+    Returns:
+        dict: Con las claves:
+            - total: Cantidad de Pokémon
+            - columnas: {campo: resumen} para peso, altura y base_experience
+            - por_tipo / por_generacion: {valor: cantidad}
+              (un Pokémon de doble tipo cuenta en ambos tipos)
+            - tabla_cruzada: {tipo: {generacion: cantidad}}
+    """
+    columnas = construir_columnas(filas)
+
+    resumenes = {}
+    for campo in CAMPOS_NUMERICOS:
+        resumenes[campo] = resumir_columna(columnas["numericas"][campo])
+
+    conteo_tipos = _contar_codigos(columnas["codigo_tipo"], len(columnas["tipos"]))
+    conteo_gen = _contar_codigos(columnas["codigo_gen_fila"], len(columnas["generaciones"]))
+
+    return {
+        "total": columnas["total"],
+        "columnas": resumenes,
+        "por_tipo": dict(zip(columnas["tipos"], conteo_tipos)),
+        "por_generacion": dict(zip(columnas["generaciones"], conteo_gen)),
+        "tabla_cruzada": tabla_cruzada(columnas),
+    }
@@ -0,0 +1,157 @@
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+# Bloqueo de lectura/escritura para la Pokédex (CSV e índice en memoria).
+# Muchas lecturas pueden hacerse a la vez; una escritura se hace sola, sin lecturas
+# en curso. Los turnos se alternan: si hay una escritura esperando no entran lecturas
+# nuevas, y al terminar cada escritura pasan primero las lecturas que esperaban.
+# Así ni la precarga en segundo plano ni las consultas quedan esperando para siempre.
+#
+# Es reentrante: un hilo que escribe puede volver a escribir o leer, y un hilo que lee
+# puede volver a leer. Lo que no se puede es pedir escritura mientras se lee (dos
+# hilos que lo hicieran se esperarían entre sí): eso lanza RuntimeError.
+#
+# Las escrituras son exclusivas para toda la Pokédex y no por partición, porque
+# todas las particiones comparten el mismo índice en memoria.
+
+
+def crear_bloqueo():
+    """
+    Crea un bloqueo de lectura/escritura.
+
+    Returns:
+        dict: Estado del bloqueo (usar con lectura() y escritura())
+    """
+    return {
+        "condicion": threading.Condition(threading.Lock()),
+        "lectores": {},       # hilo -> cantidad de lecturas abiertas
+        "escritor": None,     # hilo que está escribiendo
+        "escrituras": 0,      # escrituras abiertas por ese hilo
+        "esperando": 0,       # escritores esperando turno
+        "esperando_lectura": 0,  # lectores esperando turno
+        "turno_lectura": False,  # True: pasan los lectores que esperaban a la última escritura
+    }
+
+
+def adquirir_lectura(bloqueo):
+    hilo = threading.get_ident()
+    with bloqueo["condicion"]:
+        lectores = bloqueo["lectores"]
+
+        # Reentrante: quien ya lee o escribe no espera (si esperara, podría bloquearse
+        # detrás de un escritor que a su vez lo espera a él)
+        if hilo not in lectores and bloqueo["escritor"] != hilo:
+            bloqueo["esperando_lectura"] += 1
+            try:
+                while bloqueo["escritor"] is not None or (bloqueo["esperando"] and not bloqueo["turno_lectura"]):
+                    bloqueo["condicion"].wait()
+            finally:
+                bloqueo["esperando_lectura"] -= 1
+                if not bloqueo["esperando_lectura"]:
+                    bloqueo["turno_lectura"] = False
+
+        lectores[hilo] = lectores.get(hilo, 0) + 1
+
+
+def liberar_lectura(bloqueo):
+    hilo = threading.get_ident()
+    with bloqueo["condicion"]:
+        lectores = bloqueo["lectores"]
+        lectores[hilo] -= 1
+        if not lectores[hilo]:
+            del lectores[hilo]
+            if not lectores:
+                bloqueo["condicion"].notify_all()
+
+
+def adquirir_escritura(bloqueo):
+    hilo = threading.get_ident()
+    with bloqueo["condicion"]:
+        if bloqueo["escritor"] == hilo:
+            bloqueo["escrituras"] += 1
+            return
+
+        if hilo in bloqueo["lectores"]:
+            raise RuntimeError("No se puede escribir en la Pokédex mientras se está leyendo")
+
+        bloqueo["esperando"] += 1
+        try:
+            while bloqueo["escritor"] is not None or bloqueo["lectores"] or bloqueo["turno_lectura"]:
+                bloqueo["condicion"].wait()
+        finally:
+            bloqueo["esperando"] -= 1
+
+        bloqueo["escritor"] = hilo
+        bloqueo["escrituras"] = 1
+
+
+def liberar_escritura(bloqueo):
+    with bloqueo["condicion"]:
+        bloqueo["escrituras"] -= 1
+        if not bloqueo["escrituras"]:
+            bloqueo["escritor"] = None
+            # Los lectores que esperaban pasan antes que la próxima escritura
+            if bloqueo["esperando_lectura"]:
+                bloqueo["turno_lectura"] = True
+            bloqueo["condicion"].notify_all()
+
+
+def leyendo(bloqueo):
+    """
+    Indica si el hilo actual tiene tomada una lectura sin ser el que escribe
+    (en ese caso no puede pedir escritura).
+    """
+    hilo = threading.get_ident()
+    with bloqueo["condicion"]:
+        return hilo in bloqueo["lectores"] and bloqueo["escritor"] != hilo
+
+
+@contextmanager
+def lectura(bloqueo):
+    """
+    Sección de lectura: `with lectura(BLOQUEO_POKEDEX): ...`
+    """
+    adquirir_lectura(bloqueo)
+    try:
+        yield
+    finally:
+        liberar_lectura(bloqueo)
+
+
+@contextmanager
+def escritura(bloqueo):
+    """
+    Sección de escritura (exclusiva): `with escritura(BLOQUEO_POKEDEX): ...`
+    """
+    adquirir_escritura(bloqueo)
+    try:
+        yield
+    finally:
+        liberar_escritura(bloqueo)
+
+
+# Bloqueo compartido por la persistencia, el índice y las búsquedas
+BLOQUEO_POKEDEX = crear_bloqueo()
+
+
+def con_lectura(funcion):
+    """
+    Decorador: ejecuta la función dentro de una lectura de BLOQUEO_POKEDEX.
+    """
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        with lectura(BLOQUEO_POKEDEX):
+            return funcion(*args, **kwargs)
+    return envoltura
+
+
+def con_escritura(funcion):
+    """
+    Decorador: ejecuta la función dentro de una escritura de BLOQUEO_POKEDEX.
+    """
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        with escritura(BLOQUEO_POKEDEX):
+            return funcion(*args, **kwargs)
+    return envoltura
@@ -1,31 +1,62 @@
 import os
-from .persistencia import guardar_pokemon, leer_recursivo, modificar_pokemon, eliminar_pokemon
-from api.api_pokemon import obtener_pokemon
-from .carga_automatica import precargar_pokemon
-from .busqueda import mostrar_resultados_busqueda
+import sys
+from .persistencia import guardar_pokemon, iterar_recursivo, modificar_pokemon, eliminar_pokemon, cargar_indice
+from .indice import INDICE, indice_cargado, obtener_registros, ordenar_pokemon, resolver_nombre, pokemon_por_id
+from .carga_automatica import precargar_pokemon, obtener_pokemon_prioritario
+from .busqueda import mostrar_resultados_busqueda, mostrar_resultados_habilidad, mostrar_resultados_id
+from .autocompletado import pedir_nombre
+from .indice_prefijos import ORIGEN_POKEDEX
 from .paginador import paginar_pokemon
+from .filtros import preguntar_orden
+from .columnas import calcular_estadisticas, CAMPOS_ESTADISTICAS
+from .flujo import canalizar, proyectar
+from .instantanea import instantanea_adjunta, iterar_instantanea
 
 
 # CREATE
-def agregar_pokemon():
+def agregar_pokemon(nombre=None):
     """
     Agrega un Pokémon a la Pokédex.
     Solo pide el nombre, la generación se detecta automáticamente.
+    
+    Args:
+        nombre: Nombre o ID del Pokémon (si es None se pide por teclado)
+    
+    Returns:
+        bool: True si el Pokémon quedó en la Pokédex (agregado o ya guardado)
     """
-    nombre = input("Nombre del Pokémon: ").strip().lower()
+    if nombre is None:
+        nombre = pedir_nombre("Nombre del Pokémon: ")
+    nombre = str(nombre).strip().lower()
     
     if not nombre:
-        print("AVISO: Debes ingresar un nombre válido.\n")
-        return
+        print("AVISO: Debes ingresar un nombre válido.\n", file=sys.stderr)
+        return False
+    
+    # Resolver primero con el índice local: un número se busca por ID y un texto
+    # por nombre o nombre en otro idioma (ej: español)
+    if os.path.exists("pokedex"):
+        cargar_indice("pokedex")
+        if nombre.isdigit():
+            existente = next(iter(pokemon_por_id(nombre)), None)
+        else:
+            existente = resolver_nombre(nombre)
+        if existente is not None:
+            print(f"\nAVISO: {existente.get('nombre', nombre).capitalize()} ya está en la Pokédex "
+                  f"(encontrado como '{nombre}'). No se consultó la PokéAPI.\n", file=sys.stderr)
+            return True
     
     print(f"\nBuscando '{nombre}' en la PokéAPI...")
     
-    pokemon = obtener_pokemon(nombre)
+    # Si la precarga corre en segundo plano, esta consulta pasa antes que sus descargas
+    pokemon = obtener_pokemon_prioritario(nombre)
     if pokemon:
         guardar_pokemon(pokemon)
         print(f"\n{nombre.capitalize()} agregado correctamente a la Pokédex.")
-    else:
-        print(f"\nNo se pudo agregar '{nombre}' a la Pokédex. Verifica el nombre e intenta nuevamente.")
+        return True
+    
+    print(f"\nNo se pudo agregar '{nombre}' a la Pokédex. Verifica el nombre e intenta nuevamente.", file=sys.stderr)
+    return False
 
 
 # READ
@@ -37,8 +68,27 @@ def mostrar_todos():
         print("AVISO: No hay datos aún.\n")
         return
 
-    datos = leer_recursivo("pokedex")
-    if not datos:
+    # Mismas opciones de orden que los filtros
+    orden = preguntar_orden()
+
+    if orden is None:
+        # Orden por defecto: leer los CSV como flujo, sin cargar el índice.
+        # El paginador recibe una función para poder reabrir el flujo al volver atrás
+        datos = lambda: iterar_recursivo("pokedex")
+        titulo_orden = ""
+        # El total sale del índice si ya está en memoria; si no, se calcula al avanzar
+        total = len(INDICE["registros"]) if indice_cargado(os.path.normpath("pokedex")) else None
+    else:
+        # Orden pedido: recorrer las permutaciones del índice en memoria
+        criterio, descendente, titulo = orden
+        cargar_indice("pokedex")
+        datos = ordenar_pokemon(obtener_registros(), criterio, descendente, completa=True)
+        titulo_orden = f" | Orden: {titulo}"
+        total = len(INDICE["registros"])
+
+    # Comprobar que haya al menos un registro (en el flujo basta con abrir el primer CSV)
+    primero = next(iter(datos() if callable(datos) else datos), None)
+    if primero is None:
         print("\nAVISO: No hay registros en la Pokédex.\n")
         return
 
@@ -61,21 +111,46 @@ def mostrar_todos():
     paginar_pokemon(
         resultados=datos,
         pokemon_por_pagina=10,
-        titulo='LISTA DE POKÉMON EN LA POKÉDEX',
-        tipo_formato='completo'
+        titulo=f'LISTA DE POKÉMON EN LA POKÉDEX{titulo_orden}',
+        tipo_formato='completo',
+        total=total
     )
 
 # Buscar
 def buscar_pokemon():
     """
-    Busca Pokémon por similitud de nombre con un mínimo de 3 caracteres.
+    Busca Pokémon por similitud de nombre o por habilidad (mínimo 3 caracteres),
+    o por número de Pokédex (ID o rango de IDs).
     Muestra todas las coincidencias ordenadas por porcentaje de similitud.
     """
     print("\n" + "="*60)
     print("Buscar Pokémon")
     print("="*60)
     
-    termino = input("\nIngresa el nombre (mínimo 3 caracteres): ").strip()
+    print("\n1) Por nombre")
+    print("2) Por habilidad")
+    print("3) Por número de Pokédex (ID)")
+    modo = input("\nModo de búsqueda (Enter = por nombre): ").strip()
+    
+    if modo == "3":
+        texto = input("\nIngresa el ID (ej: 25) o un rango (ej: 1-151): ").strip()
+        mostrar_resultados_id(texto)
+        return
+    
+    if modo == "2":
+        habilidad = input("\nIngresa la habilidad (mínimo 3 caracteres): ").strip()
+        
+        if len(habilidad) < 3:
+            print("\nAVISO: Debes ingresar al menos 3 caracteres para realizar la búsqueda.\n")
+            return
+        
+        mostrar_resultados_habilidad(habilidad)
+        return
+    
+    if modo not in ("", "1"):
+        print("\nAVISO: Modo inválido, buscando por nombre.")
+    
+    termino = pedir_nombre("\nIngresa el nombre (mínimo 3 caracteres): ", ORIGEN_POKEDEX).strip()
     
     if len(termino) < 3:
         print("\nAVISO: Debes ingresar al menos 3 caracteres para realizar la búsqueda.\n")
@@ -85,71 +160,100 @@ def buscar_pokemon():
 
 
 # UPDATE
-def editar_pokemon():
+# Campos que se pueden modificar desde el menú y la línea de comandos
+CAMPOS_EDITABLES = ["peso", "altura", "habilidades", "areas_encuentro", "base_experience"]
+
+
+def editar_pokemon(nombre=None, campo=None, nuevo_valor=None):
     """
     Modifica un campo específico de un Pokémon existente.
-    """
-    print("\n" + "="*60)
-    print("Modificar registro de Pokémon en la Pokédex")
-    print("="*60)
+    Los datos que no se reciben como parámetro se piden por teclado.
+    
+    Args:
+        nombre: Nombre del Pokémon a modificar
+        campo: Campo a modificar (uno de CAMPOS_EDITABLES)
+        nuevo_valor: Nuevo valor del campo
     
-    nombre = input("\nNombre del Pokémon a modificar: ").strip().lower()
+    Returns:
+        bool: True si se modificó
+    """
+    if nombre is None:
+        print("\n" + "="*60)
+        print("Modificar registro de Pokémon en la Pokédex")
+        print("="*60)
+        
+        nombre = pedir_nombre("\nNombre del Pokémon a modificar: ", ORIGEN_POKEDEX)
+    nombre = str(nombre).strip().lower()
     
     if not nombre:
         print("\nAVISO: Debes ingresar un nombre válido.\n")
-        return
+        return False
     
-    print("\nCampos disponibles a editar:")
-    print("  • peso")
-    print("  • altura")
-    print("  • habilidades")
-    print("  • areas_encuentro")
-    print("  • base_experience")
-    
-    campo = input("\nCampo a modificar: ").strip().lower()
+    if campo is None:
+        print("\nCampos disponibles a editar:")
+        for campo_editable in CAMPOS_EDITABLES:
+            print(f"  • {campo_editable}")
+        
+        campo = input("\nCampo a modificar: ")
+    campo = str(campo).strip().lower()
     
     # Validar que el campo existe
-    campos_validos = ["peso", "altura", "habilidades", "areas_encuentro", "base_experience"]
-    if campo not in campos_validos:
+    if campo not in CAMPOS_EDITABLES:
         print(f"\nAVISO: Campo '{campo}' no válido. Elige uno de la lista.\n")
-        return
+        return False
     
-    nuevo_valor = input("Nuevo valor: ").strip()
+    if nuevo_valor is None:
+        nuevo_valor = input("Nuevo valor: ")
+    nuevo_valor = str(nuevo_valor).strip()
     
     if not nuevo_valor:
         print("AVISO: El valor no puede estar vacío.\n")
-        return
+        return False
     
     if modificar_pokemon(nombre, campo, nuevo_valor):
         print(f"\n{nombre.capitalize()} modificado correctamente.\n")
-    else:
-        print(f"\nAVISO: No se pudo modificar '{nombre}'. Verifica que el Pokémon exista en el registro de la Pokédex.\n")
+        return True
+    
+    print(f"\nAVISO: No se pudo modificar '{nombre}'. Verifica que el Pokémon exista en el registro de la Pokédex.\n")
+    return False
 
 
 # DELETE
-def borrar_pokemon():
+def borrar_pokemon(nombre=None, confirmado=False):
     """
     Elimina un Pokémon de la Pokédex después de confirmar la acción.
-    """
-    print("\n" + "="*60)
-    print("Eliminar registro de Pokémon de la Pokédex")
-    print("="*60)
     
-    nombre = input("\nNombre del Pokémon a eliminar: ").strip().lower()
+    Args:
+        nombre: Nombre del Pokémon (si es None se pide por teclado)
+        confirmado: True para no pedir confirmación
+    
+    Returns:
+        bool: True si se eliminó
+    """
+    if nombre is None:
+        print("\n" + "="*60)
+        print("Eliminar registro de Pokémon de la Pokédex")
+        print("="*60)
+        
+        nombre = pedir_nombre("\nNombre del Pokémon a eliminar: ", ORIGEN_POKEDEX)
+    nombre = str(nombre).strip().lower()
     
     if not nombre:
         print("AVISO: Debes ingresar un nombre válido.\n")
-        return
+        return False
     
-    confirmacion = input(f"\nAVISO: ¿Estás seguro de eliminar a {nombre.capitalize()}? (s/n): ").lower()
+    if not confirmado:
+        confirmacion = input(f"\nAVISO: ¿Estás seguro de eliminar a {nombre.capitalize()}? (s/n): ").lower()
+        if confirmacion != 's':
+            print("\nAVISO: Eliminación cancelada.\n")
+            return False
     
-    if confirmacion == 's':
-        if eliminar_pokemon(nombre):
-            print(f"\n{nombre.capitalize()} eliminado correctamente de la Pokédex.\n")
-        else:
-            print(f"\nAVISO: Pokémon '{nombre}' no encontrado en la Pokédex.\n")
-    else:
-        print("\nAVISO: Eliminación cancelada.\n")
+    if eliminar_pokemon(nombre):
+        print(f"\n{nombre.capitalize()} eliminado correctamente de la Pokédex.\n")
+        return True
+    
+    print(f"\nAVISO: Pokémon '{nombre}' no encontrado en la Pokédex.\n")
+    return False
 
 
 # Estadísticas
@@ -157,39 +261,32 @@ def estadisticas():
     """
     Muestra estadísticas generales de la Pokédex:
     - Total de Pokémon
-    - Promedios de peso y altura
+    - Resumen de peso, altura y experiencia base
+      (promedio, mínimo, máximo, mediana, desviación y percentiles)
     - Distribución por tipo
     - Distribución por generación
+    - Tabla cruzada tipo × generación
+    
+    Returns:
+        bool: True si había datos para mostrar
     """
     if not os.path.exists("pokedex"):
         print("\nNo hay datos registrados.\n")
-        return
+        return False
 
-    datos = leer_recursivo("pokedex")
-    if not datos:
+    # Construir columnas y calcular todo en un solo recorrido del flujo de filas,
+    # conservando de cada fila solo los campos que se usan (de la instantánea, si hay una adjunta)
+    filas = iterar_instantanea() if instantanea_adjunta() else iterar_recursivo("pokedex")
+    resultado = calcular_estadisticas(canalizar(filas, (proyectar, CAMPOS_ESTADISTICAS)))
+    total = resultado["total"]
+    if not total:
         print("\nNo hay Pokémon guardados.\n")
-        return
+        return False
 
-    total = len(datos)
-    
-    # Calcular promedios de peso y altura
-    pesos = [float(poke["peso"]) for poke in datos if poke.get("peso", "").replace(".", "").isdigit()]
-    alturas = [float(poke["altura"]) for poke in datos if poke.get("altura", "").replace(".", "").isdigit()]
-    
-    promedio_peso = sum(pesos) / len(pesos) if pesos else 0
-    promedio_altura = sum(alturas) / len(alturas) if alturas else 0
-    
-    # Contar por tipo
-    tipos = {}
-    for p in datos:
-        tipo = p.get("tipo", "desconocido")
-        tipos[tipo] = tipos.get(tipo, 0) + 1
-    
-    # Contar por generación
-    generaciones = {}
-    for p in datos:
-        gen = p.get("generacion", "desconocida")
-        generaciones[gen] = generaciones.get(gen, 0) + 1
+    columnas = resultado["columnas"]
+
+    promedio_peso = columnas["peso"].get("mean", 0)
+    promedio_altura = columnas["altura"].get("mean", 0)
 
     # Mostrar estadísticas
     print("\n" + "="*70)
@@ -198,18 +295,41 @@ def estadisticas():
     print(f"\nTotal de Pokémon registrados: {total}")
     print(f"Peso promedio: {promedio_peso:.2f}")
     print(f"Altura promedio: {promedio_altura:.2f}")
-    
-    print("\nDistribución por tipo:")
-    for tipo, cantidad in sorted(tipos.items(), key=lambda x: x[1], reverse=True):
+
+    print("\nResumen por campo:")
+    print(f"    {'Campo':<16}{'N':>5}{'Prom.':>9}{'Mín.':>8}{'Máx.':>8}{'Med.':>8}{'Desv.':>8}{'P25':>8}{'P75':>8}{'P90':>8}")
+    for campo, resumen in columnas.items():
+        if not resumen.get("count"):
+            print(f"    {campo:<16}{0:>5}   sin datos numéricos")
+            continue
+        print(f"    {campo:<16}{resumen['count']:>5}"
+              f"{resumen['mean']:>9.2f}{resumen['min']:>8.1f}{resumen['max']:>8.1f}"
+              f"{resumen['median']:>8.1f}{resumen['stddev']:>8.2f}"
+              f"{resumen['p25']:>8.1f}{resumen['p75']:>8.1f}{resumen['p90']:>8.1f}")
+
+    print("\nDistribución por tipo (incluye tipos secundarios):")
+    for tipo, cantidad in sorted(resultado["por_tipo"].items(), key=lambda x: x[1], reverse=True):
         porcentaje = (cantidad / total) * 100
         print(f"    {tipo.capitalize():<15}: {cantidad:>3} Pokémon(es) ({porcentaje:>5.1f}%)")
-    
+
     print("\nDistribución por generación:")
-    for gen, cantidad in sorted(generaciones.items()):
+    for gen, cantidad in sorted(resultado["por_generacion"].items()):
         porcentaje = (cantidad / total) * 100
         print(f"    {gen:<20}: {cantidad:>3} Pokémon(es) ({porcentaje:>5.1f}%)")
-    
+
+    # Tabla cruzada tipo × generación (columnas abreviadas: generation-iv → IV)
+    generaciones = sorted(resultado["por_generacion"])
+    tabla = resultado["tabla_cruzada"]
+    if tabla and generaciones:
+        print("\nTipo × generación:")
+        encabezado = "".join(f"{gen.replace('generation-', '').upper():>6}" for gen in generaciones)
+        print(f"    {'Tipo':<12}{encabezado}")
+        for tipo in sorted(tabla):
+            celdas = "".join(f"{tabla[tipo].get(gen, 0) or '·':>6}" for gen in generaciones)
+            print(f"    {tipo.capitalize():<12}{celdas}")
+
     print("="*70 + "\n")
+    return True
 
 
 # Carga Automática
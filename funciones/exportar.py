@@ -0,0 +1,264 @@
+import os
+import sys
+import csv
+import json
+from .persistencia import CAMPOS, iterar_recursivo, cargar_indice, cargar_particiones
+from .concurrencia import BLOQUEO_POKEDEX, lectura
+from .indice import ORDENES, obtener_registros, ordenar_pokemon, pokemon_de_particiones, pokemon_de_tipos, tipos_de
+from .particiones import listar_particiones, particiones_de_generacion, particiones_con_tipos
+from .paginador import formatear_pokemon, normalizar_formato
+from .busqueda import buscar_pokemon_por_similitud, buscar_por_habilidad, buscar_por_id
+from .flujo import canalizar, filtrar, mapear, sin_repetir
+from .instantanea import instantanea_adjunta, filas_instantanea, particiones_de_generacion_instantanea
+from .metricas import contar
+
+# Salida no interactiva de los listados: en lugar de paginar, las filas se escriben
+# a medida que se leen (a la consola o a un archivo), una por una. La memoria usada
+# no depende del tamaño de la Pokédex cuando el origen es un flujo (CSV leídos de a
+# una partición); los listados ordenados y las búsquedas usan el índice en memoria.
+# Si el proceso tiene una instantánea adjunta (ver instantanea.py), todo sale de ella,
+# también los listados ordenados, sin leer los CSV ni cargar el índice.
+FORMATOS_EXPORTACION = ("texto", "csv", "jsonl")
+
+
+def iterar_particiones(particiones):
+    """
+    Lee los CSV de las particiones indicadas y entrega sus filas una por una.
+    Cada CSV se lee completo con el bloqueo de lectura (para no verlo a medio
+    escribir) y sus filas se entregan después, ya sin el bloqueo.
+
+    Args:
+        particiones: dict {particion: datos} de listar_particiones
+
+    Yields:
+        dict: Datos de un Pokémon
+    """
+    for particion in sorted(particiones):
+        archivo = particiones[particion]["archivo"]
+        try:
+            with lectura(BLOQUEO_POKEDEX), open(archivo, newline="", encoding="utf-8") as f:
+                contar("csv.archivos_abiertos")
+                filas = list(csv.DictReader(f))
+                contar("csv.filas_leidas", len(filas))
+        except IOError as e:
+            print(f"\nAVISO: Error al leer {archivo}: {e}", file=sys.stderr)
+            continue
+        except csv.Error as e:
+            print(f"\nAVISO: Error de CSV en {archivo}: {e}", file=sys.stderr)
+            continue
+
+        yield from filas
+
+
+def escribir_filas(filas, salida, formato="texto", tipo_formato="simple"):
+    """
+    Escribe un flujo de Pokémon en un archivo abierto, fila por fila.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        salida: Archivo de texto abierto (ej: sys.stdout)
+        formato: "texto" (formatos del paginador), "csv" o "jsonl"
+        tipo_formato: Formato de fila para "texto": 'simple', 'detallado', 'completo'
+
+    Returns:
+        int: Cantidad de filas escritas
+    """
+    cantidad = 0
+
+    if formato == "csv":
+        writer = csv.DictWriter(salida, fieldnames=CAMPOS, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for fila in filas:
+            if isinstance(fila, dict):
+                writer.writerow({campo: fila.get(campo, "") for campo in CAMPOS})
+                cantidad += 1
+
+    elif formato == "jsonl":
+        for fila in filas:
+            if isinstance(fila, dict):
+                salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+                cantidad += 1
+
+    else:
+        # El formato de fila se valida una vez para todo el flujo
+        tipo_formato = normalizar_formato(tipo_formato)
+        for fila in filas:
+            cantidad += 1
+            salida.write(formatear_pokemon(fila, cantidad, tipo_formato) + "\n")
+
+    return cantidad
+
+
+def exportar_pokemon(filas, formato="texto", destino=None, tipo_formato="simple"):
+    """
+    Exporta un flujo de Pokémon a la consola o a un archivo, sin paginar.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        formato: "texto", "csv" o "jsonl"
+        destino: Ruta del archivo o None para la salida estándar
+        tipo_formato: Formato de fila para "texto"
+
+    Returns:
+        int: Cantidad de filas exportadas o None si hubo un error
+    """
+    try:
+        if not isinstance(formato, str) or formato.strip().lower() not in FORMATOS_EXPORTACION:
+            print(f"\nAVISO: Formato de exportación inválido (usa: {', '.join(FORMATOS_EXPORTACION)})", file=sys.stderr)
+            return None
+
+        formato = formato.strip().lower()
+
+        if destino is None:
+            cantidad = escribir_filas(filas, sys.stdout, formato, tipo_formato)
+            sys.stdout.flush()
+            return cantidad
+
+        if not isinstance(destino, str) or not destino.strip():
+            print("\nAVISO: Ruta de destino inválida", file=sys.stderr)
+            return None
+
+        carpeta = os.path.dirname(destino)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+
+        with open(destino, "w", newline="", encoding="utf-8") as f:
+            return escribir_filas(filas, f, formato, tipo_formato)
+
+    except BrokenPipeError:
+        # La salida se cerró antes de terminar (ej: "| head")
+        return None
+    except (IOError, OSError) as e:
+        print(f"\nAVISO: No se pudo exportar: {e}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al exportar: {e}", file=sys.stderr)
+        return None
+
+
+def filas_ordenadas(filas, orden, completa=False):
+    """
+    Ordena filas con las permutaciones del índice si se eligió un orden.
+    Las particiones de esas filas deben estar cargadas en el índice.
+
+    Args:
+        filas: Lista de Pokémon
+        orden: Opción de ORDENES ("1" a "4") o None para el orden por defecto
+        completa: True si las filas son el índice completo
+
+    Returns:
+        list: Filas en el orden pedido
+    """
+    if orden not in ORDENES:
+        return filas
+
+    criterio, descendente, _ = ORDENES[orden]
+    return ordenar_pokemon(filas, criterio, descendente, completa)
+
+
+def exportar_todos(formato="texto", destino=None, orden=None, tipo_formato="simple", base_dir="pokedex"):
+    """
+    Exporta toda la Pokédex. Sin orden, los CSV se leen como flujo sin cargar el índice.
+
+    Returns:
+        int: Cantidad de filas exportadas o None si hubo un error
+    """
+    if instantanea_adjunta():
+        filas = filas_instantanea(orden)
+    elif orden in ORDENES:
+        if not cargar_indice(base_dir):
+            return None
+        filas = filas_ordenadas(obtener_registros(), orden, completa=True)
+    else:
+        filas = iterar_recursivo(base_dir)
+
+    return exportar_pokemon(filas, formato, destino, tipo_formato)
+
+
+def exportar_generacion(generacion, formato="texto", destino=None, orden=None, tipo_formato="simple", base_dir="pokedex"):
+    """
+    Exporta los Pokémon de una generación leyendo solo sus particiones.
+
+    Returns:
+        int: Cantidad de filas exportadas o None si hubo un error
+    """
+    generacion = str(generacion).strip().lower()
+
+    if instantanea_adjunta():
+        filas = filas_instantanea(orden, particiones_de_generacion_instantanea(generacion))
+        return exportar_pokemon(filas, formato, destino, tipo_formato)
+
+    particiones = listar_particiones(base_dir)
+    seleccion = {p: particiones[p] for p in particiones_de_generacion(particiones, generacion)}
+
+    if orden in ORDENES:
+        # Ordenar requiere el índice: cargar solo las particiones de la generación
+        cargar_particiones(base_dir, list(seleccion))
+        filas = filas_ordenadas(pokemon_de_particiones(list(seleccion)), orden)
+    else:
+        filas = iterar_particiones(seleccion)
+
+    return exportar_pokemon(filas, formato, destino, tipo_formato)
+
+
+def exportar_tipo(tipos, formato="texto", destino=None, orden=None, tipo_formato="simple", base_dir="pokedex"):
+    """
+    Exporta los Pokémon que tienen todos los tipos indicados (uno o dos),
+    leyendo solo las particiones que contienen esos tipos.
+
+    Returns:
+        int: Cantidad de filas exportadas o None si hubo un error
+    """
+    if isinstance(tipos, str):
+        tipos = [tipos]
+
+    tipos = [str(t).strip().lower() for t in tipos if str(t).strip()]
+
+    def tiene_tipos(fila):
+        propios = tipos_de(fila)
+        return all(t in propios for t in tipos)
+
+    if instantanea_adjunta():
+        filas = canalizar(filas_instantanea(orden), (filtrar, tiene_tipos))
+        return exportar_pokemon(filas, formato, destino, tipo_formato)
+
+    particiones = listar_particiones(base_dir)
+    seleccion = {p: particiones[p] for p in particiones_con_tipos(particiones, tipos)}
+
+    if orden in ORDENES:
+        # Ordenar requiere el índice: cargar solo las particiones con esos tipos
+        cargar_particiones(base_dir, list(seleccion))
+        filas = filas_ordenadas(pokemon_de_tipos(tipos), orden)
+    else:
+        filas = canalizar(iterar_particiones(seleccion), (filtrar, tiene_tipos))
+
+    return exportar_pokemon(filas, formato, destino, tipo_formato)
+
+
+def exportar_busqueda(termino, formato="texto", destino=None, umbral=60, modo="nombre", tipo_formato="simple"):
+    """
+    Exporta los resultados de una búsqueda por nombre, habilidad o ID.
+
+    Args:
+        termino: Texto buscado (nombre, habilidad, ID o rango "1-151")
+        modo: "nombre", "habilidad" o "id"
+
+    Returns:
+        int: Cantidad de filas exportadas o None si hubo un error
+    """
+    if modo == "id":
+        filas = buscar_por_id(termino)
+        if filas is None:
+            print("\nAVISO: Ingresa un número (ej: 25) o un rango (ej: 1-151).", file=sys.stderr)
+            return None
+
+    elif modo == "habilidad":
+        # Un Pokémon puede aparecer por varias habilidades parecidas: exportarlo una vez
+        filas = canalizar(buscar_por_habilidad(termino, umbral),
+                          (mapear, lambda resultado: resultado[0]),
+                          (sin_repetir,))
+
+    else:
+        filas = mapear(buscar_pokemon_por_similitud(termino, umbral), lambda resultado: resultado[0])
+
+    return exportar_pokemon(filas, formato, destino, tipo_formato)
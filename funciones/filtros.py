@@ -1,6 +1,12 @@
 import os
-from .persistencia import leer_recursivo
+from .persistencia import cargar_particiones
+from .indice import ORDENES, ordenar_pokemon, pokemon_de_particiones, pokemon_de_tipos
+from .particiones import (
+    listar_particiones, contar_por_generacion, contar_tipos,
+    particiones_de_generacion, particiones_con_tipos
+)
 from .paginador import paginar_pokemon
+from .metricas import contar
 
 
 def filtrar_por_criterio_recursivo(datos, criterio, valor):
@@ -36,6 +42,7 @@ def filtrar_por_criterio_recursivo(datos, criterio, valor):
             return []
         
         # Tomar primer elemento y el resto
+        contar("filtros.filas_recorridas")
         primero = datos[0]
         resto = datos[1:]
         
@@ -104,6 +111,7 @@ def obtener_valores_unicos_recursivo(datos, campo, valores_acumulados=None):
             return valores_acumulados
         
         # Validar que el primer elemento sea un diccionario
+        contar("filtros.filas_recorridas")
         if isinstance(datos[0], dict):
             valor = datos[0].get(campo, "desconocido")
             
@@ -122,6 +130,47 @@ def obtener_valores_unicos_recursivo(datos, campo, valores_acumulados=None):
         return valores_acumulados if valores_acumulados else set()
 
 
+def preguntar_orden():
+    """
+    Pregunta el orden de visualización de un listado.
+    
+    Returns:
+        tuple: (criterio, descendente, título) o None para el orden por defecto
+    """
+    print("\n" + "-"*60)
+    print("Seleccionar orden:")
+    print("  1. Nombre (A-Z)")
+    print("  2. Nombre (Z-A)")
+    print("  3. ID (Menor a Mayor)")
+    print("  4. ID (Mayor a Menor)")
+    print("  [Enter]: Orden por defecto")
+    
+    opcion_orden = input("Selecciona una opción de orden: ").strip()
+    
+    # Enter u opción desconocida: mantener el orden por defecto
+    return ORDENES.get(opcion_orden)
+
+
+def seleccionar_orden(pokemon_lista):
+    """
+    Pregunta el orden de visualización y ordena la lista usando las
+    permutaciones precalculadas del índice.
+    
+    Args:
+        pokemon_lista: Lista de Pokémon a ordenar
+    
+    Returns:
+        tuple: (lista ordenada, texto para el título)
+    """
+    orden = preguntar_orden()
+    
+    if orden is None:
+        return pokemon_lista, ""
+    
+    criterio, descendente, titulo = orden
+    return ordenar_pokemon(pokemon_lista, criterio, descendente), f" | Orden: {titulo}"
+
+
 def mostrar_pokemon_filtrados(pokemon_lista, titulo_filtro):
     """
     Muestra una lista de Pokémon filtrados con paginación.
@@ -158,32 +207,23 @@ def mostrar_pokemon_filtrados(pokemon_lista, titulo_filtro):
 
 def filtrar_por_generacion():
     """
-    Filtra y muestra Pokémon por generación usando recursión y paginación.
+    Filtra y muestra Pokémon por generación con paginación.
+    Solo lee las particiones (carpetas) de la generación elegida.
     """
     try:
         if not os.path.exists("pokedex"):
             print("\nAVISO: No hay datos en la Pokédex.\n")
             return
         
-        # Leer todos los Pokémon
-        datos = leer_recursivo("pokedex")
+        # Generaciones disponibles desde los nombres de carpeta y los conteos por partición
+        particiones = listar_particiones("pokedex")
+        conteo_generaciones = contar_por_generacion(particiones)
         
-        if not datos:
+        if not conteo_generaciones:
             print("\nAVISO: No hay Pokémon guardados.\n")
             return
         
-        # Validar que datos sea una lista
-        if not isinstance(datos, list):
-            print("\nAVISO: Formato de datos inválido.\n")
-            return
-        
-        # Obtener generaciones disponibles usando recursión
-        generaciones = sorted(obtener_valores_unicos_recursivo(datos, "generacion"))
-        
-        # Validar que se obtuvieron generaciones
-        if not generaciones:
-            print("\nAVISO: No se pudieron obtener las generaciones disponibles.\n")
-            return
+        generaciones = sorted(conteo_generaciones)
         
         print("\n" + "="*60)
         print("Filtrar por generación")
@@ -191,12 +231,7 @@ def filtrar_por_generacion():
         print("\nGeneraciones disponibles:")
         
         for i, gen in enumerate(generaciones, 1):
-            try:
-                # Contar cuántos Pokémon hay de esta generación
-                cantidad = len(filtrar_por_criterio_recursivo(datos, "generacion", gen))
-                print(f"  {i}. {gen} ({cantidad} Pokémon)")
-            except Exception:
-                continue
+            print(f"  {i}. {gen} ({conteo_generaciones[gen]} Pokémon)")
         
         print(f"  {len(generaciones) + 1}. Volver al menú principal")
         
@@ -225,10 +260,11 @@ def filtrar_por_generacion():
         if 1 <= opcion_int <= len(generaciones):
             gen_seleccionada = generaciones[opcion_int - 1]
             
-            # Filtrar usando recursión
-            pokemon_filtrados = filtrar_por_criterio_recursivo(datos, "generacion", gen_seleccionada)
-            
-            # --- INICIO DE MODIFICACIÓN ---
+            # Leer solo las particiones de la generación elegida
+            seleccion = particiones_de_generacion(particiones, gen_seleccionada)
+            cargar_particiones("pokedex", seleccion)
+            pokemon_filtrados = pokemon_de_particiones(seleccion)
+            contar("filtros.filas_devueltas", len(pokemon_filtrados))
             
             # Validar resultados
             if not isinstance(pokemon_filtrados, list):
@@ -237,30 +273,7 @@ def filtrar_por_generacion():
             
             titulo_orden = ""
             if pokemon_filtrados: # Solo preguntar si hay resultados
-                print("\n" + "-"*60)
-                print("Seleccionar orden:")
-                print("  1. Nombre (A-Z)")
-                print("  2. Nombre (Z-A)")
-                print("  3. ID (Menor a Mayor)")
-                print("  4. ID (Mayor a Menor)")
-                print("  [Enter]: Orden por defecto")
-                
-                opcion_orden = input("Selecciona una opción de orden: ").strip()
-                opcion_orden_int = int(opcion_orden)
-
-                if opcion_orden_int == 1:
-                    pokemon_filtrados.sort(key=lambda p: p.get('nombre', '').lower())
-                    titulo_orden = " | Orden: Nombre (A-Z)"
-                elif opcion_orden_int == 2:
-                    pokemon_filtrados.sort(key=lambda p: p.get('nombre', '').lower(), reverse=True)
-                    titulo_orden = " | Orden: Nombre (Z-A)"
-                elif opcion_orden_int == 3:
-                    # Convertir a int para orden numérico, manejando '' o None
-                    pokemon_filtrados.sort(key=lambda p: int(p.get('id', 0) or 0))
-                    titulo_orden = " | Orden: ID (Asc)"
-                elif opcion_orden_int == 4:
-                    pokemon_filtrados.sort(key=lambda p: int(p.get('id', 0) or 0), reverse=True)
-                    titulo_orden = " | Orden: ID (Desc)"
+                pokemon_filtrados, titulo_orden = seleccionar_orden(pokemon_filtrados)
             
             # Contar cantidad para el título
             cantidad = len(pokemon_filtrados)
@@ -286,32 +299,25 @@ def filtrar_por_generacion():
 
 def filtrar_por_tipo():
     """
-    Filtra y muestra Pokémon por tipo usando recursión y paginación.
+    Filtra y muestra Pokémon por tipo usando el índice invertido de tipos y paginación.
+    Solo lee las particiones que contienen el tipo elegido.
+    Considera todos los tipos de cada Pokémon (un Water/Ground aparece en ambos)
+    y permite elegir dos tipos para buscar Pokémon de doble tipo.
     """
     try:
         if not os.path.exists("pokedex"):
             print("\nAVISO: No hay datos en la Pokédex.\n")
             return
         
-        # Leer todos los Pokémon
-        datos = leer_recursivo("pokedex")
+        # Tipos disponibles y conteos (incluye secundarios) desde los conteos por partición
+        particiones = listar_particiones("pokedex")
+        conteo_tipos = contar_tipos(particiones)
         
-        if not datos:
+        if not conteo_tipos:
             print("\nAVISO: No hay Pokémon guardados.\n")
             return
         
-        # Validar que datos sea una lista
-        if not isinstance(datos, list):
-            print("\nAVISO: Formato de datos inválido.\n")
-            return
-        
-        # Obtener tipos disponibles usando recursión
-        tipos = sorted(obtener_valores_unicos_recursivo(datos, "tipo"))
-        
-        # Validar que se obtuvieron tipos
-        if not tipos:
-            print("\nAVISO: No se pudieron obtener los tipos disponibles.\n")
-            return
+        tipos = sorted(conteo_tipos)
         
         print("\n" + "="*60)
         print("Filtrar por tipo")
@@ -319,90 +325,67 @@ def filtrar_por_tipo():
         print("\nTipos disponibles:")
         
         for i, tipo in enumerate(tipos, 1):
-            try:
-                # Contar cuántos Pokémon hay de este tipo
-                cantidad = len(filtrar_por_criterio_recursivo(datos, "tipo", tipo))
-                print(f"  {i}. {tipo.capitalize()} ({cantidad} Pokémon)")
-            except Exception:
-                continue
+            print(f"  {i}. {tipo.capitalize()} ({conteo_tipos[tipo]} Pokémon)")
         
         print(f"  {len(tipos) + 1}. Volver al menú principal")
         
-        opcion = input("\nSelecciona un tipo: ").strip()
+        opcion = input("\nSelecciona un tipo (o dos separados por coma para doble tipo): ").strip()
         
         # Validar que la opción no esté vacía
         if not opcion:
             print("\nAVISO: Debes seleccionar una opción.\n")
             return
         
-        # Validar que sea un número
-        if not opcion.isdigit():
+        partes = [parte.strip() for parte in opcion.split(",")]
+        
+        # Validar que sean números (máximo dos)
+        if len(partes) > 2 or not all(parte.isdigit() for parte in partes):
             print("\nAVISO: Opción inválida.\n")
             return
         
-        opcion_int = int(opcion)
+        opciones_int = [int(parte) for parte in partes]
         
         # Validar rango
-        if opcion_int < 1 or opcion_int > len(tipos) + 1:
+        if any(o < 1 or o > len(tipos) + 1 for o in opciones_int):
             print("\nAVISO: Opción fuera de rango.\n")
             return
         
-        if opcion_int == len(tipos) + 1:
+        if len(tipos) + 1 in opciones_int:
             return
         
-        if 1 <= opcion_int <= len(tipos):
-            tipo_seleccionado = tipos[opcion_int - 1]
-            
-            # Filtrar usando recursión
-            pokemon_filtrados = filtrar_por_criterio_recursivo(datos, "tipo", tipo_seleccionado)
-            
-            # Validar resultados
-            if not isinstance(pokemon_filtrados, list):
-                print("\nAVISO: Error al filtrar Pokémon.\n")
-                return
-            
-            titulo_orden = ""
-            if pokemon_filtrados: # Solo preguntar si hay resultados
-                print("\n" + "-"*60)
-                print("Seleccionar orden:")
-                print("  1. Nombre (A-Z)")
-                print("  2. Nombre (Z-A)")
-                print("  3. ID (Menor a Mayor)")
-                print("  4. ID (Mayor a Menor)")
-                print("  [Enter]: Orden por defecto")
-                
-                opcion_orden = input("Selecciona una opción de orden: ").strip()
-                opcion_orden_int = int(opcion_orden)
-                if opcion_orden_int == 1:
-                    pokemon_filtrados.sort(key=lambda p: p.get('nombre', '').lower())
-                    titulo_orden = " | Orden: Nombre (A-Z)"
-                elif opcion_orden_int == 2:
-                    pokemon_filtrados.sort(key=lambda p: p.get('nombre', '').lower(), reverse=True)
-                    titulo_orden = " | Orden: Nombre (Z-A)"
-                elif opcion_orden_int == 3:
-                    pokemon_filtrados.sort(key=lambda p: int(p.get('id', 0) or 0))
-                    titulo_orden = " | Orden: ID (Asc)"
-                elif opcion_orden_int == 4:
-                    pokemon_filtrados.sort(key=lambda p: int(p.get('id', 0) or 0), reverse=True)
-                    titulo_orden = " | Orden: ID (Desc)"
-            
-            # Contar cantidad para el título
-            cantidad = len(pokemon_filtrados)
-            
-            # Mostrar resultados con paginación
-            mostrar_pokemon_filtrados(
-                pokemon_filtrados,
-                f"Pokémon de tipo {tipo_seleccionado.upper()} | {cantidad} Pokémon encontrado(s){titulo_orden}"
-            )
-            
-            # --- FIN DE MODIFICACIÓN ---
-            
-        else:
-            print("\nAVISO: Opción inválida.\n")
+        tipos_seleccionados = []
+        for o in opciones_int:
+            if tipos[o - 1] not in tipos_seleccionados:
+                tipos_seleccionados.append(tipos[o - 1])
+        
+        # Leer solo las particiones que contienen esos tipos y luego
+        # intersecar las listas del índice invertido (sin recorrer los datos)
+        cargar_particiones("pokedex", particiones_con_tipos(particiones, tipos_seleccionados))
+        pokemon_filtrados = pokemon_de_tipos(tipos_seleccionados)
+        contar("filtros.filas_devueltas", len(pokemon_filtrados))
+        
+        # Validar resultados
+        if not isinstance(pokemon_filtrados, list):
+            print("\nAVISO: Error al filtrar Pokémon.\n")
+            return
+        
+        titulo_orden = ""
+        if pokemon_filtrados: # Solo preguntar si hay resultados
+            pokemon_filtrados, titulo_orden = seleccionar_orden(pokemon_filtrados)
+        
+        # Contar cantidad para el título
+        cantidad = len(pokemon_filtrados)
+        nombre_tipos = "/".join(tipo.upper() for tipo in tipos_seleccionados)
+        
+        # Mostrar resultados con paginación
+        mostrar_pokemon_filtrados(
+            pokemon_filtrados,
+            f"Pokémon de tipo {nombre_tipos} | {cantidad} Pokémon encontrado(s){titulo_orden}"
+        )
             
     except KeyboardInterrupt:
         print("\nAVISO: Operación cancelada por el usuario.\n")
     except ValueError as e:
         print(f"\nAVISO: Error de valor: {e}\n")
     except Exception as e:
-        print(f"\nAVISO: Error inesperado al filtrar por tipo: {e}\n")
\ No newline at end of file
+        print(f"\nAVISO: Error inesperado al filtrar por tipo: {e}\n")
@@ -0,0 +1,134 @@
+from itertools import islice
+
+# Etapas perezosas para procesar flujos de Pokémon (por ejemplo, los que entrega
+# iterar_recursivo). Cada etapa recibe un iterable y devuelve un generador, por lo
+# que se pueden encadenar sin cargar la Pokédex completa en memoria:
+#
+#     canalizar(iterar_recursivo("pokedex"),
+#               (filtrar, coincide_campo("tipo", "fire")),
+#               (proyectar, ["nombre", "peso"]),
+#               (limitar, 10))
+#
+# Las usan el paginador (limitar), las estadísticas (proyectar), la exportación
+# (filtrar, mapear, sin_repetir) y la presentación de búsquedas (mapear, sin_repetir).
+# Si una condición o función falla con una fila, la excepción llega a quien consume
+# el flujo: ninguna fila se descarta en silencio.
+
+
+def filtrar(filas, condicion):
+    """
+    Deja pasar solo las filas que cumplen la condición.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        condicion: Función fila -> bool
+
+    Yields:
+        dict: Filas que cumplen la condición
+    """
+    for fila in filas:
+        if condicion(fila):
+            yield fila
+
+
+def proyectar(filas, campos):
+    """
+    Conserva solo los campos indicados de cada fila.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        campos: Lista de campos a conservar
+
+    Yields:
+        dict: Filas con solo esos campos ("" si faltan)
+    """
+    for fila in filas:
+        yield {campo: fila.get(campo, "") for campo in campos}
+
+
+def mapear(filas, funcion):
+    """
+    Aplica una función a cada fila.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        funcion: Función fila -> valor
+
+    Yields:
+        Resultado de la función para cada fila
+    """
+    for fila in filas:
+        yield funcion(fila)
+
+
+def limitar(filas, cantidad):
+    """
+    Entrega como máximo `cantidad` filas y deja de leer el origen.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        cantidad: Máximo de filas a entregar
+
+    Yields:
+        dict: Las primeras filas del flujo
+    """
+    if not isinstance(cantidad, int) or cantidad < 0:
+        cantidad = 0
+
+    yield from islice(filas, cantidad)
+
+
+def sin_repetir(filas, clave=id):
+    """
+    Entrega cada fila una sola vez (la primera), según `clave`.
+
+    Args:
+        filas: Iterable de diccionarios de Pokémon
+        clave: Función fila -> valor que identifica la fila (default: el objeto mismo)
+
+    Yields:
+        dict: Filas no repetidas, en el orden original
+    """
+    vistos = set()
+    for fila in filas:
+        identidad = clave(fila)
+        if identidad not in vistos:
+            vistos.add(identidad)
+            yield fila
+
+
+def coincide_campo(criterio, valor):
+    """
+    Crea una condición para `filtrar` que compara un campo sin distinguir mayúsculas,
+    igual que filtrar_por_criterio_recursivo.
+
+    Args:
+        criterio: Campo a comparar (ej: "tipo", "generacion")
+        valor: Valor buscado
+
+    Returns:
+        function: Condición fila -> bool
+    """
+    valor = str(valor).lower()
+
+    def condicion(fila):
+        return str(fila.get(criterio, "")).lower() == valor
+
+    return condicion
+
+
+def canalizar(filas, *etapas):
+    """
+    Encadena varias etapas sobre un flujo de filas.
+
+    Args:
+        filas: Iterable de origen
+        etapas: Tuplas (etapa, *argumentos), por ejemplo (limitar, 10)
+
+    Returns:
+        iterator: Flujo resultante (perezoso)
+    """
+    for etapa, *argumentos in etapas:
+        filas = etapa(filas, *argumentos)
+
+    return iter(filas)
@@ -0,0 +1,674 @@
+import bisect
+from .concurrencia import con_lectura, con_escritura
+from .indice_difuso import reiniciar_difuso, agregar_nombre, quitar_nombre
+from .indice_prefijos import reiniciar_prefijos, agregar_prefijo, quitar_prefijo
+
+# Índice en memoria de la Pokédex.
+# Se llena por particiones (un CSV pokedex/<generacion>/<tipo>/pokemon.csv cada una)
+# a medida que se necesitan y se mantiene actualizado con cada escritura.
+# Las consultas que recorren el índice toman BLOQUEO_POKEDEX para lectura y las que
+# lo modifican, para escritura (con_lectura / con_escritura de concurrencia.py).
+INDICE = {
+    "cargado": False,     # True cuando todas las particiones están cargadas
+    "ruta": None,
+    "registros": {},      # nombre en minúsculas -> diccionario del Pokémon
+    "particiones": {},    # partición cargada -> {nombre: None}
+    "particion_de": {},   # nombre -> partición donde está guardado
+    "sellos": {},         # partición cargada -> (tamaño, mtime_ns) del CSV al leerla
+    "orden_nombre": [],   # permutación ordenada por nombre: [nombre]
+    "orden_id": [],       # permutación ordenada por ID: [(id, nombre)]
+    "por_tipo": {},       # índice invertido: tipo -> {nombre: None} (todos los tipos)
+    "por_habilidad": {},  # índice invertido: habilidad -> {nombre: None}
+    "por_nombre_localizado": {},  # nombre en otro idioma (minúsculas) -> {nombre: None}
+    "por_id": {},         # ID (int) -> {nombre: None} (normalmente un solo Pokémon)
+}
+
+# Versión de los datos: aumenta con cada escritura (alta, modificación o baja) y al
+# reiniciar el índice. Las cachés guardan la versión con la que se calcularon.
+VERSION = {"numero": 0}
+
+# Opciones de orden que ofrecen los listados: opción -> (criterio, descendente, título)
+ORDENES = {
+    "1": ("nombre", False, "Nombre (A-Z)"),
+    "2": ("nombre", True, "Nombre (Z-A)"),
+    "3": ("id", False, "ID (Asc)"),
+    "4": ("id", True, "ID (Desc)"),
+}
+
+
+def clave_pokemon(pokemon):
+    """
+    Obtiene la clave con la que se indexa un Pokémon (su nombre en minúsculas).
+
+    Args:
+        pokemon: Diccionario del Pokémon
+
+    Returns:
+        str: Nombre en minúsculas o "" si no es válido
+    """
+    if not isinstance(pokemon, dict):
+        return ""
+
+    nombre = pokemon.get("nombre", "")
+    if not isinstance(nombre, str):
+        nombre = str(nombre)
+
+    return nombre.strip().lower()
+
+
+def clave_id(pokemon):
+    """
+    Obtiene el ID numérico de un Pokémon (0 si falta o no es válido).
+    """
+    try:
+        return int(pokemon.get("id", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def tipos_de(pokemon):
+    """
+    Obtiene todos los tipos de un Pokémon.
+    Usa el campo "tipos" y, en registros antiguos que no lo tienen, el tipo principal.
+
+    Args:
+        pokemon: Diccionario del Pokémon
+
+    Returns:
+        list: Tipos en minúsculas, el principal primero
+    """
+    if not isinstance(pokemon, dict):
+        return []
+
+    tipos = pokemon.get("tipos", "")
+    if isinstance(tipos, str) and tipos.strip():
+        return [t.strip().lower() for t in tipos.split(",") if t.strip()]
+
+    tipo = pokemon.get("tipo", "")
+    if isinstance(tipo, str) and tipo.strip():
+        return [tipo.strip().lower()]
+
+    return []
+
+
+def habilidades_de(pokemon):
+    """
+    Obtiene las habilidades de un Pokémon a partir del campo "habilidades"
+    (guardado como texto separado por comas).
+
+    Args:
+        pokemon: Diccionario del Pokémon
+
+    Returns:
+        list: Habilidades en minúsculas (ej: ["static", "lightning-rod"])
+    """
+    if not isinstance(pokemon, dict):
+        return []
+
+    habilidades = pokemon.get("habilidades", "")
+    if not isinstance(habilidades, str):
+        return []
+
+    return [h.strip().lower() for h in habilidades.split(",")
+            if h.strip() and h.strip().lower() != "sin habilidades"]
+
+
+def nombres_localizados_de(pokemon):
+    """
+    Obtiene los nombres del Pokémon en otros idiomas a partir del campo
+    "nombres_localizados" (guardado como "es:Pikachu|fr:Pikachu|...").
+
+    Args:
+        pokemon: Diccionario del Pokémon
+
+    Returns:
+        dict: {idioma: nombre}
+    """
+    if not isinstance(pokemon, dict):
+        return {}
+
+    texto = pokemon.get("nombres_localizados", "")
+    if not isinstance(texto, str):
+        return {}
+
+    nombres = {}
+    for parte in texto.split("|"):
+        idioma, separador, nombre = parte.partition(":")
+        if separador and idioma.strip() and nombre.strip():
+            nombres[idioma.strip()] = nombre.strip()
+    return nombres
+
+
+def textos_localizados_de(pokemon):
+    """
+    Obtiene los nombres localizados distintos de un Pokémon, en minúsculas,
+    tal como se indexan para la búsqueda.
+    """
+    return {nombre.lower() for nombre in nombres_localizados_de(pokemon).values()}
+
+
+def textos_buscables():
+    """
+    Recorre los textos por los que se puede buscar cada Pokémon del índice:
+    su nombre y sus nombres localizados (uno por cada Pokémon que los tiene).
+    Es un generador: quien lo recorre debe tener tomado BLOQUEO_POKEDEX.
+
+    Yields:
+        str: Textos en minúsculas (con repetición si varios Pokémon lo comparten)
+    """
+    for clave, pokemon in INDICE["registros"].items():
+        yield clave
+        yield from textos_localizados_de(pokemon)
+
+
+def _indexar_invertidos(clave, pokemon):
+    """
+    Agrega un Pokémon a los índices invertidos de ID, tipo, habilidad y nombre localizado.
+    """
+    INDICE["por_id"].setdefault(clave_id(pokemon), {})[clave] = None
+    for tipo in tipos_de(pokemon):
+        INDICE["por_tipo"].setdefault(tipo, {})[clave] = None
+    for habilidad in habilidades_de(pokemon):
+        INDICE["por_habilidad"].setdefault(habilidad, {})[clave] = None
+    for texto in textos_localizados_de(pokemon):
+        INDICE["por_nombre_localizado"].setdefault(texto, {})[clave] = None
+        agregar_nombre(texto)
+
+
+def _desindexar(invertido, valores, clave):
+    """
+    Quita un Pokémon de un índice invertido y borra las entradas que quedan vacías.
+    """
+    for valor in valores:
+        claves = invertido.get(valor)
+        if claves is not None:
+            claves.pop(clave, None)
+            if not claves:
+                del invertido[valor]
+
+
+@con_escritura
+def reiniciar_indice(ruta=None):
+    """
+    Vacía el índice en memoria.
+
+    Args:
+        ruta: Directorio base al que quedará asociado el índice
+    """
+    INDICE["cargado"] = False
+    INDICE["ruta"] = ruta
+    INDICE["registros"] = {}
+    INDICE["particiones"] = {}
+    INDICE["particion_de"] = {}
+    INDICE["sellos"] = {}
+    INDICE["orden_nombre"] = []
+    INDICE["orden_id"] = []
+    INDICE["por_tipo"] = {}
+    INDICE["por_habilidad"] = {}
+    INDICE["por_nombre_localizado"] = {}
+    INDICE["por_id"] = {}
+    reiniciar_difuso()
+    reiniciar_prefijos()
+    incrementar_version()
+
+
+@con_escritura
+def incrementar_version():
+    """
+    Marca que los datos de la Pokédex cambiaron (invalida las cachés).
+    """
+    VERSION["numero"] += 1
+
+
+def version_datos():
+    """
+    Devuelve la versión actual de los datos de la Pokédex.
+    """
+    return VERSION["numero"]
+
+
+def indice_cargado(ruta):
+    """
+    Indica si el índice tiene cargadas todas las particiones del directorio indicado.
+    """
+    return INDICE["cargado"] and INDICE["ruta"] == ruta
+
+
+def indice_activo(ruta):
+    """
+    Indica si el índice tiene datos (al menos una partición) del directorio indicado.
+    Las escrituras sobre ese directorio deben reflejarse en el índice.
+    """
+    return INDICE["ruta"] == ruta
+
+
+def particion_cargada(particion):
+    """
+    Indica si una partición ya fue leída al índice.
+    """
+    return particion in INDICE["particiones"]
+
+
+def ruta_particion(pokemon):
+    """
+    Obtiene la partición (ruta relativa del CSV) donde se guarda un Pokémon.
+
+    Returns:
+        str: Por ejemplo "generation-i/electric/pokemon.csv"
+    """
+    return f"{pokemon.get('generacion', '')}/{pokemon.get('tipo', '')}/pokemon.csv"
+
+
+@con_escritura
+def agregar_particion(particion, filas, sello=None):
+    """
+    Agrega al índice todos los Pokémon de una partición recién leída.
+    Las permutaciones se vuelven a ordenar una sola vez por partición
+    (sorted aprovecha que la parte existente ya está ordenada).
+
+    Args:
+        particion: Ruta relativa del CSV
+        filas: Iterable de diccionarios de Pokémon leídos del CSV
+        sello: (tamaño, mtime_ns) del CSV tomado antes de leerlo
+    """
+    registros = INDICE["registros"]
+    miembros = INDICE["particiones"].setdefault(particion, {})
+    INDICE["sellos"][particion] = sello
+    nuevos = []
+
+    for pokemon in filas:
+        clave = clave_pokemon(pokemon)
+        if not clave:
+            continue
+
+        # Ya indexado (por ejemplo, agregado antes de leer la partición): reemplazar
+        if clave in registros:
+            quitar_pokemon(clave)
+
+        registros[clave] = pokemon
+        miembros[clave] = None
+        INDICE["particion_de"][clave] = particion
+        _indexar_invertidos(clave, pokemon)
+        agregar_nombre(clave)
+        agregar_prefijo(clave)
+        nuevos.append(clave)
+
+    INDICE["orden_nombre"] = sorted(INDICE["orden_nombre"] + nuevos)
+    INDICE["orden_id"] = sorted(INDICE["orden_id"] + [(clave_id(registros[c]), c) for c in nuevos])
+
+
+@con_escritura
+def quitar_particion(particion):
+    """
+    Quita del índice todos los Pokémon de una partición y la marca como no cargada
+    (por ejemplo, porque su CSV cambió en disco y hay que volver a leerlo).
+
+    Args:
+        particion: Ruta relativa del CSV
+    """
+    for clave in list(INDICE["particiones"].get(particion, {})):
+        quitar_pokemon(clave)
+    INDICE["particiones"].pop(particion, None)
+    INDICE["sellos"].pop(particion, None)
+
+
+@con_escritura
+def renovar_sello(particion, anterior, nuevo):
+    """
+    Actualiza el sello de una partición después de que este proceso escribió su CSV
+    (y ya reflejó el cambio en el índice). Solo se renueva si el índice estaba al día
+    con el archivo anterior: si otro proceso lo había cambiado, el sello queda distinto
+    y la partición se vuelve a leer en la próxima verificación.
+
+    Args:
+        particion: Ruta relativa del CSV
+        anterior: Sello del CSV antes de escribirlo (None si no existía)
+        nuevo: Sello del CSV después de escribirlo
+    """
+    if particion in INDICE["particiones"] and INDICE["sellos"].get(particion) == anterior:
+        INDICE["sellos"][particion] = nuevo
+
+
+@con_escritura
+def registrar_pokemon(pokemon, particion=None):
+    """
+    Agrega (o reemplaza) un Pokémon en el índice manteniendo las permutaciones ordenadas.
+
+    Args:
+        pokemon: Diccionario del Pokémon
+        particion: Partición donde está guardado (por defecto, según generación y tipo)
+
+    Returns:
+        bool: True si se registró
+    """
+    clave = clave_pokemon(pokemon)
+    if not clave:
+        return False
+
+    if clave in INDICE["registros"]:
+        quitar_pokemon(clave)
+
+    if particion is None:
+        particion = ruta_particion(pokemon)
+
+    INDICE["registros"][clave] = pokemon
+    INDICE["particion_de"][clave] = particion
+    # Con el índice completo, una partición nueva también queda cargada
+    if particion in INDICE["particiones"] or INDICE["cargado"]:
+        INDICE["particiones"].setdefault(particion, {})[clave] = None
+
+    bisect.insort(INDICE["orden_nombre"], clave)
+    bisect.insort(INDICE["orden_id"], (clave_id(pokemon), clave))
+
+    _indexar_invertidos(clave, pokemon)
+
+    agregar_nombre(clave)
+    agregar_prefijo(clave)
+    return True
+
+
+@con_escritura
+def quitar_pokemon(nombre):
+    """
+    Quita un Pokémon del índice y de las permutaciones.
+
+    Args:
+        nombre: Nombre del Pokémon
+
+    Returns:
+        bool: True si estaba en el índice
+    """
+    if not isinstance(nombre, str):
+        return False
+
+    clave = nombre.strip().lower()
+    pokemon = INDICE["registros"].pop(clave, None)
+    if pokemon is None:
+        return False
+
+    particion = INDICE["particion_de"].pop(clave, None)
+    if particion in INDICE["particiones"]:
+        INDICE["particiones"][particion].pop(clave, None)
+
+    orden_nombre = INDICE["orden_nombre"]
+    i = bisect.bisect_left(orden_nombre, clave)
+    if i < len(orden_nombre) and orden_nombre[i] == clave:
+        del orden_nombre[i]
+
+    orden_id = INDICE["orden_id"]
+    entrada = (clave_id(pokemon), clave)
+    i = bisect.bisect_left(orden_id, entrada)
+    if i < len(orden_id) and orden_id[i] == entrada:
+        del orden_id[i]
+
+    _desindexar(INDICE["por_id"], [clave_id(pokemon)], clave)
+    _desindexar(INDICE["por_tipo"], tipos_de(pokemon), clave)
+    _desindexar(INDICE["por_habilidad"], habilidades_de(pokemon), clave)
+    _desindexar(INDICE["por_nombre_localizado"], textos_localizados_de(pokemon), clave)
+    for texto in textos_localizados_de(pokemon):
+        quitar_nombre(texto)
+
+    quitar_nombre(clave)
+    quitar_prefijo(clave)
+    return True
+
+
+@con_escritura
+def actualizar_campo(nombre, campo, valor):
+    """
+    Actualiza un campo de un Pokémon indexado.
+    Si el campo afecta a un orden, se reubica en las permutaciones.
+
+    Returns:
+        bool: True si el Pokémon estaba en el índice
+    """
+    if not isinstance(nombre, str):
+        return False
+
+    pokemon = INDICE["registros"].get(nombre.strip().lower())
+    if pokemon is None:
+        return False
+
+    if campo in ("id", "nombre", "tipo", "tipos", "nombres_localizados"):
+        particion = INDICE["particion_de"].get(nombre.strip().lower())
+        quitar_pokemon(nombre)
+        pokemon[campo] = valor
+        registrar_pokemon(pokemon, particion)
+    elif campo == "habilidades":
+        clave = nombre.strip().lower()
+        _desindexar(INDICE["por_habilidad"], habilidades_de(pokemon), clave)
+        pokemon[campo] = valor
+        for habilidad in habilidades_de(pokemon):
+            INDICE["por_habilidad"].setdefault(habilidad, {})[clave] = None
+    else:
+        pokemon[campo] = valor
+
+    return True
+
+
+@con_lectura
+def obtener_registros():
+    """
+    Devuelve los Pokémon del índice en el orden en que se cargaron.
+
+    Returns:
+        list: Lista de diccionarios de Pokémon
+    """
+    return list(INDICE["registros"].values())
+
+
+@con_lectura
+def pokemon_de_particiones(particiones):
+    """
+    Devuelve los Pokémon de las particiones indicadas (que deben estar cargadas).
+
+    Args:
+        particiones: Lista de rutas relativas de CSV
+
+    Returns:
+        list: Pokémon en el orden en que se cargaron
+    """
+    registros = INDICE["registros"]
+    resultado = []
+    for particion in particiones:
+        for clave in INDICE["particiones"].get(particion, {}):
+            resultado.append(registros[clave])
+    return resultado
+
+
+@con_lectura
+def contar_por_tipo():
+    """
+    Cuenta los Pokémon de cada tipo usando el índice invertido.
+    Un Pokémon de doble tipo cuenta en ambos.
+
+    Returns:
+        dict: {tipo: cantidad}
+    """
+    return {tipo: len(claves) for tipo, claves in INDICE["por_tipo"].items()}
+
+
+@con_lectura
+def pokemon_de_tipos(tipos):
+    """
+    Devuelve los Pokémon que tienen todos los tipos indicados,
+    intersecando las listas del índice invertido sin recorrer los registros.
+
+    Args:
+        tipos: Lista de tipos (uno para filtro simple, dos para doble tipo)
+
+    Returns:
+        list: Pokémon en el orden en que se cargaron
+    """
+    if not tipos:
+        return []
+
+    conjuntos = []
+    for tipo in tipos:
+        claves = INDICE["por_tipo"].get(str(tipo).strip().lower())
+        if not claves:
+            return []
+        conjuntos.append(claves)
+
+    # Recorrer el conjunto más pequeño y comprobar pertenencia en los demás
+    conjuntos.sort(key=len)
+    base, resto = conjuntos[0], conjuntos[1:]
+
+    registros = INDICE["registros"]
+    return [registros[clave] for clave in base if all(clave in otro for otro in resto)]
+
+
+@con_lectura
+def listar_habilidades():
+    """
+    Devuelve las habilidades presentes en el índice con su cantidad de Pokémon.
+
+    Returns:
+        dict: {habilidad: cantidad}
+    """
+    return {habilidad: len(claves) for habilidad, claves in INDICE["por_habilidad"].items()}
+
+
+@con_lectura
+def claves_de_texto(texto):
+    """
+    Devuelve los nombres (claves) de los Pokémon a los que corresponde un texto
+    buscable: el propio nombre y/o un nombre localizado.
+
+    Args:
+        texto: Texto en minúsculas (ej: "pikachu", "bulbizarre")
+
+    Returns:
+        list: Claves del índice
+    """
+    claves = [texto] if texto in INDICE["registros"] else []
+    for clave in INDICE["por_nombre_localizado"].get(texto, {}):
+        if clave != texto:
+            claves.append(clave)
+    return claves
+
+
+@con_lectura
+def resolver_nombre(texto):
+    """
+    Busca un Pokémon guardado por su nombre o por un nombre localizado exacto.
+
+    Args:
+        texto: Nombre ingresado por el usuario (ej: "pikachu", "Bulbizarre")
+
+    Returns:
+        dict: El Pokémon o None si no está en el índice
+    """
+    if not isinstance(texto, str) or not texto.strip():
+        return None
+
+    claves = claves_de_texto(texto.strip().lower())
+    return INDICE["registros"].get(claves[0]) if claves else None
+
+
+@con_lectura
+def pokemon_por_id(pokemon_id):
+    """
+    Busca los Pokémon guardados con un ID (número de la Pokédex nacional) en O(1).
+
+    Args:
+        pokemon_id: ID numérico (int o texto con dígitos)
+
+    Returns:
+        list: Pokémon con ese ID (vacía si no hay; normalmente uno solo)
+    """
+    try:
+        pokemon_id = int(pokemon_id)
+    except (TypeError, ValueError):
+        return []
+
+    registros = INDICE["registros"]
+    return [registros[clave] for clave in INDICE["por_id"].get(pokemon_id, {})]
+
+
+@con_lectura
+def pokemon_en_rango_id(desde, hasta):
+    """
+    Lista los Pokémon con ID entre `desde` y `hasta` (ambos incluidos), ordenados por ID.
+    Usa búsqueda binaria sobre la permutación por ID: O(log n + resultados).
+
+    Args:
+        desde: ID inicial
+        hasta: ID final
+
+    Returns:
+        list: Pokémon del rango
+    """
+    try:
+        desde, hasta = int(desde), int(hasta)
+    except (TypeError, ValueError):
+        return []
+
+    if desde > hasta:
+        desde, hasta = hasta, desde
+
+    orden_id = INDICE["orden_id"]
+    inicio = bisect.bisect_left(orden_id, (desde, ""))
+    registros = INDICE["registros"]
+
+    resultado = []
+    for i in range(inicio, len(orden_id)):
+        pokemon_id, clave = orden_id[i]
+        if pokemon_id > hasta:
+            break
+        resultado.append(registros[clave])
+    return resultado
+
+
+@con_lectura
+def pokemon_con_habilidad(habilidad):
+    """
+    Devuelve los Pokémon que tienen la habilidad indicada, usando el índice invertido.
+
+    Args:
+        habilidad: Nombre de la habilidad (ej: "levitate")
+
+    Returns:
+        list: Pokémon en el orden en que se cargaron
+    """
+    if not isinstance(habilidad, str):
+        return []
+
+    registros = INDICE["registros"]
+    claves = INDICE["por_habilidad"].get(habilidad.strip().lower(), {})
+    return [registros[clave] for clave in claves]
+
+
+@con_lectura
+def ordenar_pokemon(pokemon_lista, criterio, descendente=False, completa=False):
+    """
+    Ordena una lista de Pokémon recorriendo la permutación precalculada del índice,
+    sin volver a comparar nombres ni convertir IDs.
+
+    Args:
+        pokemon_lista: Lista de Pokémon (por ejemplo, el resultado de un filtro)
+        criterio: "nombre" o "id"
+        descendente: True para orden inverso
+        completa: True si la lista es el índice completo (obtener_registros):
+                  la permutación ya es el resultado y la lista no se recorre
+
+    Returns:
+        list: Los Pokémon de la lista en el orden pedido
+    """
+    if criterio == "id":
+        permutacion = [clave for _, clave in INDICE["orden_id"]]
+    else:
+        permutacion = INDICE["orden_nombre"]
+
+    if descendente:
+        permutacion = reversed(permutacion)
+
+    registros = INDICE["registros"]
+
+    # Vista completa (lo indica quien la pidió: un filtro del mismo largo no lo es)
+    if completa:
+        return [registros[clave] for clave in permutacion]
+
+    # Vista filtrada: intersección con la permutación
+    claves = {clave_pokemon(p) for p in pokemon_lista}
+    return [registros[clave] for clave in permutacion if clave in claves]
@@ -0,0 +1,290 @@
+# Índice difuso de nombres para la búsqueda por similitud.
+# Indexa textos: el nombre de cada Pokémon y sus nombres localizados. Un mismo texto
+# puede pertenecer a varios Pokémon, por eso se lleva la cuenta de cuántos lo usan.
+#
+# Se mantiene en memoria junto al índice principal y evita medir el término
+# contra toda la tabla:
+#   - Listas de trigramas: devuelven los nombres que contienen al término
+#     (calcular_similitud les da 90 aunque la distancia sea grande).
+#   - Listas de bigramas con bordes ("^p", "pi", ..., "u$"): si dos textos están a
+#     distancia de edición <= k comparten al menos max(largo) + 1 - 2k bigramas,
+#     así que solo se consideran los nombres que alcanzan ese mínimo.
+#   - Grupos por largo: descartan los nombres demasiado cortos o largos.
+#
+# DIFUSO es el del índice en memoria; las funciones aceptan otro con la misma forma
+# (ej: el que arma instantanea.py para la instantánea adjunta).
+DIFUSO = {
+    "construido": False,
+    "activos": {},         # texto indexado (en minúsculas) -> cantidad de Pokémon que lo usan
+    "trigramas": {},       # trigrama -> {nombre}
+    "bigramas": {},        # bigrama con bordes -> {nombre: veces que aparece}
+    "por_largo": {},       # largo -> {nombre}
+}
+
+
+def distancia_levenshtein(str1, str2, maximo=None):
+    """
+    Calcula la distancia de edición (Levenshtein) entre dos strings.
+
+    Con `maximo` solo se calcula la franja de la matriz alrededor de la diagonal
+    (|i - j| <= maximo) y se corta en cuanto ninguna celda de la fila puede
+    quedar dentro del límite.
+
+    Args:
+        str1: Primera cadena
+        str2: Segunda cadena
+        maximo: Distancia máxima que interesa (None = sin límite)
+
+    Returns:
+        int: Cantidad mínima de inserciones, borrados o sustituciones,
+             o maximo + 1 si la distancia supera el máximo
+    """
+    if len(str1) < len(str2):
+        str1, str2 = str2, str1
+
+    largo1, largo2 = len(str1), len(str2)
+
+    # Caso base: la diferencia de largo ya excede el máximo
+    if maximo is not None and largo1 - largo2 > maximo:
+        return max(maximo, -1) + 1
+
+    if largo2 == 0:
+        return largo1
+
+    # Sin límite: matriz completa
+    if maximo is None or maximo >= largo1:
+        previous_row = range(largo2 + 1)
+        for i, c1 in enumerate(str1):
+            current_row = [i + 1]
+            for j, c2 in enumerate(str2):
+                # Calcular costo de operaciones
+                insertions = previous_row[j + 1] + 1
+                deletions = current_row[j] + 1
+                substitutions = previous_row[j] + (c1 != c2)
+                current_row.append(min(insertions, deletions, substitutions))
+            previous_row = current_row
+
+        return previous_row[-1]
+
+    fuera = maximo + 1
+
+    # Dos filas reutilizables; las celdas fuera de la franja valen "fuera"
+    previous_row = [j if j <= maximo else fuera for j in range(largo2 + 1)]
+    current_row = [fuera] * (largo2 + 1)
+
+    for i in range(1, largo1 + 1):
+        c1 = str1[i - 1]
+        inicio = max(1, i - maximo)
+        fin = min(largo2, i + maximo)
+
+        izquierda = i if inicio == 1 else fuera
+        current_row[inicio - 1] = izquierda
+
+        for j in range(inicio, fin + 1):
+            # Calcular costo de operaciones
+            izquierda = min(previous_row[j] + 1, izquierda + 1,
+                            previous_row[j - 1] + (c1 != str2[j - 1]))
+            current_row[j] = izquierda
+
+        if fin < largo2:
+            current_row[fin + 1] = fuera
+
+        # Ninguna celda de la franja está dentro del máximo: abortar
+        if min(current_row[inicio - 1:fin + 1]) > maximo:
+            return fuera
+
+        previous_row, current_row = current_row, previous_row
+
+    return min(previous_row[largo2], fuera)
+
+
+def trigramas_de(texto):
+    """
+    Obtiene el conjunto de trigramas (subcadenas de 3 caracteres) de un texto.
+    """
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def bigramas_de(texto):
+    """
+    Cuenta los bigramas de un texto con marcas de inicio y fin ("^" y "$").
+
+    Returns:
+        dict: {bigrama: veces que aparece}
+    """
+    marcado = f"^{texto}$"
+    conteo = {}
+    for i in range(len(marcado) - 1):
+        bigrama = marcado[i:i + 2]
+        conteo[bigrama] = conteo.get(bigrama, 0) + 1
+    return conteo
+
+
+def distancia_maxima(largo, umbral):
+    """
+    Distancia de edición máxima que permite alcanzar el umbral de similitud
+    cuando el texto más largo mide `largo` (similitud = (largo - d) / largo * 100).
+    """
+    return int(largo * (100 - umbral) / 100 + 1e-9)
+
+
+def reiniciar_difuso(difuso=None):
+    """
+    Vacía el índice difuso. Se vuelve a construir en la próxima búsqueda.
+    """
+    difuso = DIFUSO if difuso is None else difuso
+    difuso["construido"] = False
+    difuso["activos"] = {}
+    difuso["trigramas"] = {}
+    difuso["bigramas"] = {}
+    difuso["por_largo"] = {}
+
+
+def agregar_nombre(nombre, difuso=None):
+    """
+    Agrega un nombre (en minúsculas) al índice difuso, si está construido.
+    """
+    difuso = DIFUSO if difuso is None else difuso
+    if not difuso["construido"] or not nombre:
+        return
+
+    # Texto ya indexado: solo aumenta la cuenta
+    if nombre in difuso["activos"]:
+        difuso["activos"][nombre] += 1
+        return
+
+    difuso["activos"][nombre] = 1
+    difuso["por_largo"].setdefault(len(nombre), set()).add(nombre)
+
+    for trigrama in trigramas_de(nombre):
+        difuso["trigramas"].setdefault(trigrama, set()).add(nombre)
+
+    for bigrama, veces in bigramas_de(nombre).items():
+        difuso["bigramas"].setdefault(bigrama, {})[nombre] = veces
+
+
+def quitar_nombre(nombre, difuso=None):
+    """
+    Quita un nombre del índice difuso, si está construido.
+    El texto sigue indexado mientras otro Pokémon lo use.
+    """
+    difuso = DIFUSO if difuso is None else difuso
+    if not difuso["construido"] or nombre not in difuso["activos"]:
+        return
+
+    difuso["activos"][nombre] -= 1
+    if difuso["activos"][nombre] > 0:
+        return
+
+    del difuso["activos"][nombre]
+
+    grupo = difuso["por_largo"].get(len(nombre))
+    if grupo is not None:
+        grupo.discard(nombre)
+        if not grupo:
+            del difuso["por_largo"][len(nombre)]
+
+    for trigrama in trigramas_de(nombre):
+        nombres = difuso["trigramas"].get(trigrama)
+        if nombres is not None:
+            nombres.discard(nombre)
+            if not nombres:
+                del difuso["trigramas"][trigrama]
+
+    for bigrama in bigramas_de(nombre):
+        nombres = difuso["bigramas"].get(bigrama)
+        if nombres is not None:
+            nombres.pop(nombre, None)
+            if not nombres:
+                del difuso["bigramas"][bigrama]
+
+
+def construir_difuso(nombres, difuso=None):
+    """
+    Construye el índice difuso a partir de los textos buscables de la Pokédex.
+
+    Args:
+        nombres: Iterable de textos en minúsculas (uno por cada Pokémon que lo usa)
+        difuso: Índice a construir (None para DIFUSO)
+
+    Returns:
+        dict: El índice construido
+    """
+    difuso = DIFUSO if difuso is None else difuso
+    reiniciar_difuso(difuso)
+    difuso["construido"] = True
+
+    for nombre in nombres:
+        agregar_nombre(nombre, difuso)
+
+    return difuso
+
+
+def candidatos_similares(termino, umbral, difuso=None):
+    """
+    Obtiene los nombres que pueden alcanzar el umbral de similitud con el término,
+    sin medir contra toda la tabla. Los candidatos se deben confirmar con
+    calcular_similitud; ningún nombre que alcance el umbral queda fuera.
+
+    Args:
+        termino: Término de búsqueda
+        umbral: Porcentaje mínimo de similitud (0-100)
+        difuso: Índice a consultar (None para DIFUSO)
+
+    Returns:
+        set: Nombres candidatos
+    """
+    difuso = DIFUSO if difuso is None else difuso
+    termino = termino.lower()
+    activos = difuso["activos"]
+
+    # Con umbral 0 cualquier nombre califica
+    if umbral <= 0:
+        return set(activos)
+
+    candidatos = set()
+    largo_termino = len(termino)
+
+    # Subcadenas: calcular_similitud asigna 90 si un texto contiene al otro
+    if umbral <= 90:
+        # El nombre contiene al término: intersección de las listas de trigramas
+        listas = [difuso["trigramas"].get(t, set()) for t in trigramas_de(termino)]
+        if listas:
+            listas.sort(key=len)
+            candidatos.update(n for n in listas[0] if termino in n)
+        else:
+            candidatos.update(n for n in activos if termino in n)
+
+        # El término contiene al nombre: probar cada subcadena del término
+        for i in range(largo_termino):
+            for j in range(i + 1, largo_termino + 1):
+                if termino[i:j] in activos:
+                    candidatos.add(termino[i:j])
+
+    # Levenshtein: contar bigramas compartidos con cada nombre (solo los que comparten alguno)
+    compartidos = {}
+    for bigrama, veces_termino in bigramas_de(termino).items():
+        for nombre, veces_nombre in difuso["bigramas"].get(bigrama, {}).items():
+            compartidos[nombre] = compartidos.get(nombre, 0) + min(veces_termino, veces_nombre)
+
+    # Largos posibles: más corto que el término hasta perder la distancia permitida,
+    # más largo hasta largo_termino * 100 / umbral
+    largo_minimo = largo_termino - distancia_maxima(largo_termino, umbral)
+    largo_maximo = int(largo_termino * 100 / umbral + 1e-9)
+
+    for largo, nombres in difuso["por_largo"].items():
+        if not largo_minimo <= largo <= largo_maximo:
+            continue
+
+        mayor = max(largo, largo_termino)
+        minimo_compartidos = mayor + 1 - 2 * distancia_maxima(mayor, umbral)
+
+        if minimo_compartidos <= 0:
+            # El filtro de bigramas no descarta nada para este largo
+            candidatos.update(nombres)
+        elif len(nombres) <= len(compartidos):
+            candidatos.update(n for n in nombres if compartidos.get(n, 0) >= minimo_compartidos)
+        else:
+            candidatos.update(n for n, c in compartidos.items() if c >= minimo_compartidos and len(n) == largo)
+
+    return candidatos
@@ -0,0 +1,141 @@
+# Árbol de prefijos (trie) de nombres para el autocompletado.
+#
+# Cada nodo es un diccionario {caracter: nodo}. La clave "" marca el fin de un
+# nombre y guarda de dónde viene: "pokedex" (guardado) y/o "nacional" (lista de la
+# Pokédex nacional en caché). Buscar un prefijo cuesta O(largo del prefijo) y
+# listar sus nombres, O(cantidad de resultados), sin recorrer toda la tabla.
+PREFIJOS = {
+    "construido": False,
+    "raiz": {},
+}
+
+FIN = ""
+
+ORIGEN_POKEDEX = "pokedex"
+ORIGEN_NACIONAL = "nacional"
+
+
+def reiniciar_prefijos():
+    """
+    Vacía el trie. Se vuelve a construir en el próximo autocompletado.
+    """
+    PREFIJOS["construido"] = False
+    PREFIJOS["raiz"] = {}
+
+
+def _insertar(nombre, origen):
+    """
+    Inserta un nombre (en minúsculas) en el trie con el origen indicado.
+    """
+    nodo = PREFIJOS["raiz"]
+    for caracter in nombre:
+        nodo = nodo.setdefault(caracter, {})
+    nodo.setdefault(FIN, set()).add(origen)
+
+
+def _quitar(nombre, origen):
+    """
+    Quita un origen de un nombre y poda las ramas que quedan vacías.
+    """
+    camino = []
+    nodo = PREFIJOS["raiz"]
+    for caracter in nombre:
+        siguiente = nodo.get(caracter)
+        if siguiente is None:
+            return
+        camino.append((nodo, caracter))
+        nodo = siguiente
+
+    origenes = nodo.get(FIN)
+    if not origenes or origen not in origenes:
+        return
+
+    origenes.discard(origen)
+    if not origenes:
+        del nodo[FIN]
+
+    # Podar desde la hoja hacia la raíz mientras los nodos queden vacíos
+    for padre, caracter in reversed(camino):
+        if padre[caracter]:
+            break
+        del padre[caracter]
+
+
+def agregar_prefijo(nombre):
+    """
+    Agrega un nombre guardado en la Pokédex al trie, si está construido.
+    """
+    if PREFIJOS["construido"] and nombre:
+        _insertar(nombre, ORIGEN_POKEDEX)
+
+
+def quitar_prefijo(nombre):
+    """
+    Quita un nombre guardado en la Pokédex del trie, si está construido.
+    Si también está en la lista nacional, sigue disponible con ese origen.
+    """
+    if PREFIJOS["construido"] and nombre:
+        _quitar(nombre, ORIGEN_POKEDEX)
+
+
+def construir_prefijos(guardados, nacionales=()):
+    """
+    Construye el trie.
+
+    Args:
+        guardados: Iterable de nombres en minúsculas guardados en la Pokédex
+        nacionales: Iterable de nombres de la Pokédex nacional (opcional)
+    """
+    reiniciar_prefijos()
+    PREFIJOS["construido"] = True
+
+    for nombre in guardados:
+        if nombre:
+            _insertar(nombre, ORIGEN_POKEDEX)
+
+    for nombre in nacionales:
+        if isinstance(nombre, str) and nombre.strip():
+            _insertar(nombre.strip().lower(), ORIGEN_NACIONAL)
+
+
+def completar(prefijo, origen=None, limite=None):
+    """
+    Lista los nombres que empiezan con el prefijo, en orden alfabético.
+
+    Args:
+        prefijo: Texto inicial
+        origen: ORIGEN_POKEDEX, ORIGEN_NACIONAL o None para ambos
+        limite: Máximo de resultados (None = todos)
+
+    Returns:
+        list: Nombres en minúsculas
+    """
+    if not isinstance(prefijo, str):
+        return []
+
+    prefijo = prefijo.strip().lower()
+
+    # Bajar por el trie: O(largo del prefijo)
+    nodo = PREFIJOS["raiz"]
+    for caracter in prefijo:
+        nodo = nodo.get(caracter)
+        if nodo is None:
+            return []
+
+    # Recorrer el subárbol en profundidad (pila explícita, sin recursión)
+    resultados = []
+    pila = [(nodo, prefijo)]
+    while pila:
+        nodo, texto = pila.pop()
+
+        origenes = nodo.get(FIN)
+        if origenes and (origen is None or origen in origenes):
+            resultados.append(texto)
+            if limite is not None and len(resultados) >= limite:
+                break
+
+        # Apilar en orden inverso para sacar primero la letra menor
+        for caracter in sorted((c for c in nodo if c != FIN), reverse=True):
+            pila.append((nodo[caracter], texto + caracter))
+
+    return resultados
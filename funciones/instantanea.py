@@ -0,0 +1,617 @@
+import os
+import sys
+import mmap
+import time
+import struct
+import tempfile
+import threading
+from array import array
+from .persistencia import (
+    CAMPOS, ARCHIVO_INSTANTANEA, INTERVALO_VERIFICACION, leer_csv, sello_csv, sellos_en_disco
+)
+from .concurrencia import BLOQUEO_POKEDEX, lectura
+from .indice import ORDENES, clave_pokemon, clave_id, textos_localizados_de, habilidades_de
+from .indice_difuso import construir_difuso
+from .particiones import listar_particiones
+
+# Instantánea de solo lectura de la Pokédex para varios procesos en el mismo equipo.
+# Un proceso la publica (pokedex/instantanea.bin) leyendo los CSV, sin armar el índice
+# en memoria, y los demás la abren con mmap: las páginas del archivo las comparte el
+# sistema operativo entre todos los procesos, y cada Pokémon se decodifica recién
+# cuando se lo pide. Así la memoria de cada proceso no crece con la Pokédex ni con la
+# cantidad de procesos (no se arma un dict por fila).
+#
+# Las búsquedas por nombre y por habilidad usan índices que se arman una sola vez por
+# instantánea abierta, en la primera búsqueda (ver indices_instantanea): el índice
+# difuso de indice_difuso.py y listas de posiciones por texto y por habilidad. Son
+# enteros y textos distintos, no un dict por fila, y se descartan con la instantánea.
+#
+# Quién la usa: los comandos listar, filtrar, buscar y estadisticas de la línea de
+# comandos (si hay una publicada y al día) y `servir --instantanea` (que además la
+# vuelve a publicar cuando falta). Con una instantánea adjunta, las búsquedas de
+# busqueda.py y las estadísticas leen de ella en lugar del índice (instantanea_adjunta()).
+#
+# Cada escritura de persistencia.py borra el archivo. adjuntar_instantanea() compara
+# el archivo en disco con el que tiene abierto y, si cambió o falta, lo vuelve a
+# abrir (o a publicar). Además guarda el sello (tamaño y fecha) de cada CSV con que se
+# armó y lo compara con el manifiesto, así que tampoco usa una instantánea vieja si
+# los CSV cambiaron por otro camino. Quien ya está leyendo sigue con la copia
+# anterior hasta terminar.
+#
+# Formato (little endian):
+#   encabezado  ENCABEZADO (ver abajo), con el sello de publicación
+#   campos      nombres de los campos separados por SEPARADOR
+#   particiones "particion inicio fin tamaño mtime_ns" (separados por SEPARADOR) por línea
+#   posiciones  total + 1 enteros de 8 bytes: inicio de cada registro en los datos
+#   nombres     total enteros de 4 bytes: registros ordenados por nombre
+#   ids         total enteros de 4 bytes: registros ordenados por (ID, nombre)
+#   datos       registros (valores separados por SEPARADOR), agrupados por partición
+
+MAGICO = b"PKDXINS2"
+
+# magico, sello, total, largo de campos, largo de particiones, (libre),
+# inicio de campos, particiones, posiciones, nombres, ids y datos
+ENCABEZADO = struct.Struct("<8sQIIIIQQQQQQ")
+
+SEPARADOR = "\x1f"  # separador de unidades ASCII: no aparece en los datos de la PokéAPI
+
+# Veces que se intenta publicar si otro proceso cambia un CSV mientras se lee
+INTENTOS_PUBLICACION = 3
+
+# Instantánea abierta en este proceso. "actual" es un dict por apertura: quien
+# la está recorriendo guarda su referencia y no le afecta que se vuelva a abrir.
+INSTANTANEA = {"actual": None}
+BLOQUEO_INSTANTANEA = threading.Lock()
+
+# Para armar de a uno los índices de búsqueda y de orden de la instantánea abierta
+BLOQUEO_INDICES_INSTANTANEA = threading.Lock()
+
+
+def _alinear(datos, multiplo=8):
+    """
+    Rellena con ceros hasta un múltiplo de `multiplo` bytes.
+    """
+    datos.extend(b"\0" * (-len(datos) % multiplo))
+
+
+def leer_particiones_csv(base_dir):
+    """
+    Lee todos los CSV de la pokédex, una partición por vez.
+    Quien la llama debe tener tomada la lectura de BLOQUEO_POKEDEX si quiere
+    que el conjunto sea consistente con las escrituras de este proceso.
+
+    Returns:
+        list: Tuplas (particion, filas, sello) ordenadas por partición
+    """
+    particiones = []
+    for particion, datos in sorted(listar_particiones(base_dir).items()):
+        # El sello se toma antes de leer: si el CSV cambia mientras tanto, no coincide
+        sello = sello_csv(datos["archivo"])
+        if sello is not None:
+            particiones.append((particion, leer_csv(datos["archivo"]), sello))
+    return particiones
+
+
+def construir_instantanea(particiones):
+    """
+    Arma el contenido de la instantánea a partir de los CSV ya leídos.
+    Las filas sin nombre se omiten y, si un nombre se repite, queda la primera.
+
+    Args:
+        particiones: Tuplas (particion, filas, sello) de leer_particiones_csv
+
+    Returns:
+        tuple: (bytes del archivo, cantidad de Pokémon, sello)
+    """
+    filas = []
+    tabla = []
+    vistos = set()
+    for particion, filas_particion, (tamano, mtime_ns) in particiones:
+        inicio = len(filas)
+        for pokemon in filas_particion:
+            clave = clave_pokemon(pokemon)
+            if clave and clave not in vistos:
+                vistos.add(clave)
+                filas.append(pokemon)
+        tabla.append(SEPARADOR.join(str(v) for v in (particion, inicio, len(filas), tamano, mtime_ns)))
+
+    datos = bytearray()
+    posiciones = [0]
+    for pokemon in filas:
+        valores = (str(pokemon.get(campo, "") or "").replace(SEPARADOR, " ") for campo in CAMPOS)
+        datos += SEPARADOR.join(valores).encode("utf-8")
+        posiciones.append(len(datos))
+
+    claves = [clave_pokemon(pokemon) for pokemon in filas]
+    por_nombre = sorted(range(len(filas)), key=lambda i: claves[i])
+    por_id = sorted(range(len(filas)), key=lambda i: (clave_id(filas[i]), claves[i]))
+
+    campos = SEPARADOR.join(CAMPOS).encode("utf-8")
+    tabla = "\n".join(tabla).encode("utf-8")
+    sello = time.time_ns()
+
+    contenido = bytearray(ENCABEZADO.size)
+    inicio_campos = len(contenido)
+    contenido += campos
+    inicio_particiones = len(contenido)
+    contenido += tabla
+    _alinear(contenido)
+    inicio_posiciones = len(contenido)
+    contenido += struct.pack(f"<{len(posiciones)}Q", *posiciones)
+    inicio_nombres = len(contenido)
+    contenido += struct.pack(f"<{len(por_nombre)}I", *por_nombre)
+    inicio_ids = len(contenido)
+    contenido += struct.pack(f"<{len(por_id)}I", *por_id)
+    inicio_datos = len(contenido)
+    contenido += datos
+
+    ENCABEZADO.pack_into(contenido, 0, MAGICO, sello, len(filas), len(campos), len(tabla), 0,
+                         inicio_campos, inicio_particiones, inicio_posiciones, inicio_nombres,
+                         inicio_ids, inicio_datos)
+
+    return bytes(contenido), len(filas), sello
+
+
+def publicar_instantanea(base_dir="pokedex"):
+    """
+    Publica la instantánea de la Pokédex, leída desde los CSV, para que otros
+    procesos la abran. No usa ni carga el índice en memoria.
+    El archivo se reemplaza de forma atómica: nadie ve una instantánea a medio escribir.
+
+    Args:
+        base_dir: Directorio base de la pokédex
+
+    Returns:
+        dict: {"archivo", "total", "bytes", "sello"} o None si no se pudo publicar
+    """
+    try:
+        if not isinstance(base_dir, str) or not os.path.isdir(base_dir):
+            print(f"\nAVISO: No existe la pokédex {base_dir}", file=sys.stderr)
+            return None
+
+        archivo = os.path.join(base_dir, ARCHIVO_INSTANTANEA)
+
+        for _ in range(INTENTOS_PUBLICACION):
+            # Con la lectura tomada ninguna escritura de este proceso pasa entre leer
+            # los CSV y reemplazar el archivo (las escrituras lo borran al terminar)
+            with lectura(BLOQUEO_POKEDEX):
+                particiones = leer_particiones_csv(base_dir)
+                contenido, total, sello = construir_instantanea(particiones)
+
+                descriptor, temporal = tempfile.mkstemp(prefix=ARCHIVO_INSTANTANEA + ".", suffix=".tmp", dir=base_dir)
+                try:
+                    with os.fdopen(descriptor, "wb") as f:
+                        f.write(contenido)
+                    # mkstemp la crea solo para este usuario; la leen otros procesos
+                    os.chmod(temporal, 0o644)
+
+                    # Otro proceso pudo cambiar un CSV mientras se leían: volver a intentar
+                    if sellos_en_disco(base_dir) == {p: s for p, _, s in particiones}:
+                        os.replace(temporal, archivo)
+                        return {"archivo": archivo, "total": total, "bytes": len(contenido), "sello": sello}
+                finally:
+                    if os.path.exists(temporal):
+                        os.remove(temporal)
+
+        print("\nAVISO: La pokédex cambió mientras se publicaba la instantánea; no se publicó", file=sys.stderr)
+        return None
+
+    except (IOError, OSError) as e:
+        print(f"\nAVISO: No se pudo publicar la instantánea: {e}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al publicar la instantánea: {e}", file=sys.stderr)
+        return None
+
+
+def abrir_instantanea(archivo):
+    """
+    Abre un archivo de instantánea con mmap (sin leerlo a memoria).
+
+    Returns:
+        dict: Instantánea abierta o None si el archivo no es válido
+    """
+    with open(archivo, "rb") as f:
+        estado = os.fstat(f.fileno())
+        if estado.st_size < ENCABEZADO.size:
+            return None
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magico, sello, total, largo_campos, largo_particiones, _, inicio_campos, inicio_particiones,
+     inicio_posiciones, inicio_nombres, inicio_ids, inicio_datos) = ENCABEZADO.unpack_from(mapa, 0)
+
+    # Otro formato (por ejemplo, de una versión anterior): no se usa
+    if magico != MAGICO:
+        mapa.close()
+        return None
+
+    vista = memoryview(mapa)
+    particiones = {}
+    sellos = {}
+    tabla = str(vista[inicio_particiones:inicio_particiones + largo_particiones], "utf-8")
+    for linea in tabla.splitlines():
+        particion, inicio, fin, tamano, mtime_ns = linea.split(SEPARADOR)
+        particiones[particion] = (int(inicio), int(fin))
+        sellos[particion] = (int(tamano), int(mtime_ns))
+
+    return {
+        "archivo": archivo,
+        # Identifica el archivo abierto: si en disco hay otro, hubo escrituras
+        "identidad": (estado.st_ino, estado.st_mtime_ns, estado.st_size),
+        "sello": sello,
+        "total": total,
+        "campos": str(vista[inicio_campos:inicio_campos + largo_campos], "utf-8").split(SEPARADOR),
+        "particiones": particiones,
+        "sellos": sellos,           # particion -> (tamaño, mtime_ns) del CSV al publicarla
+        "verificada": 0.0,          # time.monotonic() de la última comparación con los CSV
+        "posiciones": vista[inicio_posiciones:inicio_nombres].cast("Q"),
+        "nombres": vista[inicio_nombres:inicio_nombres + 4 * total].cast("I"),
+        "ids": vista[inicio_ids:inicio_ids + 4 * total].cast("I"),
+        "datos": vista[inicio_datos:],
+        "mapa": mapa,
+    }
+
+
+def _al_dia(instantanea, base_dir):
+    """
+    Compara los sellos de los CSV con que se armó la instantánea con los del disco
+    (como mucho una vez cada INTERVALO_VERIFICACION segundos por instantánea abierta).
+    """
+    ahora = time.monotonic()
+    if ahora - instantanea["verificada"] < INTERVALO_VERIFICACION:
+        return True
+    if instantanea["sellos"] != sellos_en_disco(base_dir):
+        return False
+    instantanea["verificada"] = ahora
+    return True
+
+
+def adjuntar_instantanea(base_dir="pokedex", publicar=True):
+    """
+    Deja abierta la instantánea vigente de la Pokédex. Si el archivo cambió desde
+    que se abrió (se publicó otra), se abre la nueva; si no existe (hubo escrituras
+    y se descartó), no es válida o los CSV ya no coinciden con ella, y `publicar` es
+    True, se publica una nueva desde los CSV. Si no queda ninguna al día, se suelta:
+    las lecturas vuelven a usar los CSV y el índice.
+
+    Args:
+        base_dir: Directorio base de la pokédex
+        publicar: True para publicarla si falta o quedó vieja
+
+    Returns:
+        bool: True si hay una instantánea abierta y al día
+    """
+    archivo = os.path.join(base_dir, ARCHIVO_INSTANTANEA)
+
+    with BLOQUEO_INSTANTANEA:
+        try:
+            try:
+                estado = os.stat(archivo)
+                identidad = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+            except FileNotFoundError:
+                identidad = None
+
+            actual = INSTANTANEA["actual"]
+            if identidad is not None:
+                # La copia anterior se libera sola cuando nadie la esté recorriendo
+                if actual is None or actual["archivo"] != archivo or actual["identidad"] != identidad:
+                    actual = abrir_instantanea(archivo)
+                if actual is not None and _al_dia(actual, base_dir):
+                    INSTANTANEA["actual"] = actual
+                    return True
+
+            INSTANTANEA["actual"] = None
+            if not publicar or publicar_instantanea(base_dir) is None:
+                return False
+
+            INSTANTANEA["actual"] = abrir_instantanea(archivo)
+            return INSTANTANEA["actual"] is not None
+
+        except (IOError, OSError, ValueError) as e:
+            print(f"\nAVISO: No se pudo abrir la instantánea: {e}", file=sys.stderr)
+            INSTANTANEA["actual"] = None
+            return False
+
+
+def soltar_instantanea():
+    """
+    Deja de usar la instantánea abierta en este proceso.
+    """
+    with BLOQUEO_INSTANTANEA:
+        INSTANTANEA["actual"] = None
+
+
+def instantanea_adjunta():
+    """
+    Returns:
+        bool: True si este proceso lee de una instantánea (ver adjuntar_instantanea)
+    """
+    return INSTANTANEA["actual"] is not None
+
+
+def _decodificar(instantanea, posicion):
+    """
+    Arma el diccionario de un Pokémon leyendo solo sus bytes del archivo.
+    """
+    posiciones = instantanea["posiciones"]
+    valores = str(instantanea["datos"][posiciones[posicion]:posiciones[posicion + 1]], "utf-8")
+    return dict(zip(instantanea["campos"], valores.split(SEPARADOR)))
+
+
+def pokemon_instantanea(instantanea, posicion):
+    """
+    Decodifica el Pokémon de una posición de la instantánea indicada
+    (la devuelta por indices_instantanea, aunque ya se haya abierto otra).
+    """
+    return _decodificar(instantanea, posicion)
+
+
+def _construir_indices(instantanea):
+    """
+    Recorre la instantánea una vez y arma sus índices de búsqueda.
+    """
+    textos = {}
+    habilidades = {}
+    for posicion in range(instantanea["total"]):
+        pokemon = _decodificar(instantanea, posicion)
+        for texto in {clave_pokemon(pokemon), *textos_localizados_de(pokemon)}:
+            if texto:
+                textos.setdefault(texto, array("I")).append(posicion)
+        for habilidad in dict.fromkeys(habilidades_de(pokemon)):
+            habilidades.setdefault(habilidad, array("I")).append(posicion)
+
+    return {
+        # Para la caché de búsquedas: cambia con cada instantánea publicada
+        "version": ("instantanea", instantanea["sello"]),
+        "difuso": construir_difuso(textos, {}),
+        "textos": textos,               # nombre o nombre localizado -> posiciones
+        "habilidades": habilidades,     # habilidad -> posiciones
+    }
+
+
+def indices_instantanea():
+    """
+    Devuelve la instantánea abierta con sus índices de búsqueda, que se arman la
+    primera vez que se piden y se reutilizan mientras siga abierta la misma.
+
+    Returns:
+        tuple: (instantanea, indices) o (None, None) si no hay una abierta. indices
+               tiene "version", "difuso" (como DIFUSO), "textos" y "habilidades"
+               (texto -> posiciones; ver pokemon_instantanea)
+    """
+    instantanea = INSTANTANEA["actual"]
+    if instantanea is None:
+        return None, None
+
+    indices = instantanea.get("indices")
+    if indices is None:
+        with BLOQUEO_INDICES_INSTANTANEA:
+            # Otro hilo pudo armarlos mientras se esperaba el bloqueo
+            indices = instantanea.get("indices")
+            if indices is None:
+                indices = instantanea["indices"] = _construir_indices(instantanea)
+
+    return instantanea, indices
+
+
+def _rangos_de_orden(instantanea, criterio):
+    """
+    Posición de cada registro en la tabla por nombre o por ID (la inversa de la
+    tabla), armada una vez por instantánea para ordenar solo algunas particiones.
+    """
+    clave = "rango_" + ("id" if criterio == "id" else "nombre")
+    rangos = instantanea.get(clave)
+    if rangos is None:
+        with BLOQUEO_INDICES_INSTANTANEA:
+            rangos = instantanea.get(clave)
+            if rangos is None:
+                permutacion = instantanea["ids"] if criterio == "id" else instantanea["nombres"]
+                rangos = array("I", bytes(4 * instantanea["total"]))
+                for rango, posicion in enumerate(permutacion):
+                    rangos[posicion] = rango
+                instantanea[clave] = rangos
+    return rangos
+
+
+def total_instantanea():
+    """
+    Returns:
+        int: Cantidad de Pokémon de la instantánea abierta (0 si no hay)
+    """
+    instantanea = INSTANTANEA["actual"]
+    return instantanea["total"] if instantanea else 0
+
+
+def sello_instantanea():
+    """
+    Returns:
+        int: Sello de publicación de la instantánea abierta o None
+    """
+    instantanea = INSTANTANEA["actual"]
+    return instantanea["sello"] if instantanea else None
+
+
+def particiones_instantanea():
+    """
+    Returns:
+        dict: {particion: cantidad de Pokémon} de la instantánea abierta
+    """
+    instantanea = INSTANTANEA["actual"]
+    if instantanea is None:
+        return {}
+    return {p: fin - inicio for p, (inicio, fin) in instantanea["particiones"].items()}
+
+
+def particiones_de_generacion_instantanea(generacion):
+    """
+    Returns:
+        list: Particiones de la instantánea abierta que son de la generación indicada
+    """
+    return [p for p in sorted(particiones_instantanea()) if p.split("/")[0] == generacion]
+
+
+def iterar_instantanea(particiones=None):
+    """
+    Recorre los Pokémon de la instantánea abierta, decodificándolos de a uno.
+
+    Args:
+        particiones: Particiones a recorrer (ej: las de particiones_de_generacion_instantanea);
+                     None para todas
+
+    Yields:
+        dict: Datos de un Pokémon (con los mismos valores que el CSV)
+    """
+    instantanea = INSTANTANEA["actual"]
+    if instantanea is None:
+        return
+
+    rangos = instantanea["particiones"]
+    for particion in sorted(rangos) if particiones is None else particiones:
+        if particion in rangos:
+            inicio, fin = rangos[particion]
+            for posicion in range(inicio, fin):
+                yield _decodificar(instantanea, posicion)
+
+
+def iterar_instantanea_ordenada(criterio, descendente=False, particiones=None):
+    """
+    Recorre los Pokémon de la instantánea abierta en orden, con las tablas por
+    nombre o por ID guardadas al publicarla: solo se decodifica lo que se recorre.
+
+    Args:
+        criterio: "nombre" o "id" (como en ORDENES)
+        descendente: True para orden inverso
+        particiones: Particiones a recorrer; None para todas
+
+    Yields:
+        dict: Datos de un Pokémon
+    """
+    instantanea = INSTANTANEA["actual"]
+    if instantanea is None:
+        return
+
+    if particiones is None:
+        permutacion = instantanea["ids"] if criterio == "id" else instantanea["nombres"]
+        if descendente:
+            permutacion = reversed(permutacion)
+    else:
+        # Solo las posiciones de las particiones pedidas, ordenadas por su lugar en la tabla
+        rangos = _rangos_de_orden(instantanea, criterio)
+        permutacion = [posicion for particion in dict.fromkeys(particiones)
+                       if particion in instantanea["particiones"]
+                       for posicion in range(*instantanea["particiones"][particion])]
+        permutacion.sort(key=rangos.__getitem__, reverse=descendente)
+
+    for posicion in permutacion:
+        yield _decodificar(instantanea, posicion)
+
+
+def filas_instantanea(orden=None, particiones=None):
+    """
+    Recorre la instantánea abierta en una de las ORDENES ("1" a "4");
+    sin orden, partición por partición.
+
+    Args:
+        orden: Opción de ORDENES o None
+        particiones: Particiones a recorrer; None para todas
+
+    Yields:
+        dict: Datos de un Pokémon
+    """
+    if orden not in ORDENES:
+        return iterar_instantanea(particiones)
+    criterio, descendente, _ = ORDENES[orden]
+    return iterar_instantanea_ordenada(criterio, descendente, particiones)
+
+
+def pokemon_en_rango_id_instantanea(desde, hasta):
+    """
+    Lista los Pokémon de la instantánea abierta con ID entre `desde` y `hasta`
+    (ambos incluidos), ordenados por ID. Búsqueda binaria sobre la tabla por ID.
+
+    Returns:
+        list: Pokémon del rango
+    """
+    instantanea = INSTANTANEA["actual"]
+    try:
+        desde, hasta = int(desde), int(hasta)
+    except (TypeError, ValueError):
+        return []
+    if instantanea is None:
+        return []
+
+    if desde > hasta:
+        desde, hasta = hasta, desde
+
+    ids = instantanea["ids"]
+    bajo, alto = 0, instantanea["total"]
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        if clave_id(_decodificar(instantanea, ids[medio])) < desde:
+            bajo = medio + 1
+        else:
+            alto = medio
+
+    resultado = []
+    for i in range(bajo, instantanea["total"]):
+        pokemon = _decodificar(instantanea, ids[i])
+        if clave_id(pokemon) > hasta:
+            break
+        resultado.append(pokemon)
+    return resultado
+
+
+def buscar_en_instantanea(nombre):
+    """
+    Busca un Pokémon por nombre exacto en la instantánea abierta (búsqueda binaria
+    sobre la tabla ordenada por nombre; solo se decodifican unas pocas filas).
+
+    Args:
+        nombre: Nombre del Pokémon
+
+    Returns:
+        dict: Datos del Pokémon o None si no está
+    """
+    instantanea = INSTANTANEA["actual"]
+    if instantanea is None or not isinstance(nombre, str):
+        return None
+
+    buscado = nombre.strip().lower()
+    nombres = instantanea["nombres"]
+    bajo, alto = 0, instantanea["total"]
+
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        if clave_pokemon(_decodificar(instantanea, nombres[medio])) < buscado:
+            bajo = medio + 1
+        else:
+            alto = medio
+
+    if bajo < instantanea["total"]:
+        pokemon = _decodificar(instantanea, nombres[bajo])
+        if clave_pokemon(pokemon) == buscado:
+            return pokemon
+
+    return None
+
+
+def resolver_nombre_instantanea(texto):
+    """
+    Busca en la instantánea abierta un Pokémon por su nombre o por un nombre
+    localizado exacto (este último recorre la instantánea).
+
+    Returns:
+        dict: El Pokémon o None si no está
+    """
+    if not isinstance(texto, str) or not texto.strip():
+        return None
+
+    pokemon = buscar_en_instantanea(texto)
+    if pokemon is not None:
+        return pokemon
+
+    buscado = texto.strip().lower()
+    for pokemon in iterar_instantanea_ordenada("nombre"):
+        if buscado in textos_localizados_de(pokemon):
+            return pokemon
+    return None
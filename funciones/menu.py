@@ -1,5 +1,8 @@
-def menu():
+def menu(estado_precarga=None):
     print(f'\n{'='*10} POKÉDEX {'='*50}\n')
+    if estado_precarga:
+        # Avance de la precarga en segundo plano
+        print(f'[{estado_precarga}]\n')
     print('1)   Agregar Pokémon a la Pokédex')
     print('2)   Mostrar todos los Pokémon registrados')
     print('3)   Buscar Pokémon')
@@ -0,0 +1,283 @@
+import sys
+import json
+import time
+import atexit
+import signal
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+# Registro de métricas opcional: contadores y latencias de las operaciones más usadas.
+# Está apagado por defecto; se activa con `python main.py --metricas [comando]` o con
+# `--metricas-salida ARCHIVO` (ver funciones/cli.py). Apagado, contar() y
+# registrar_latencia() solo consultan un bool: en los caminos calientes no cuestan nada apreciable.
+#
+# Contadores que se registran:
+#   api.peticiones_http, api.bytes_descargados         (api/api_pokemon.py)
+#   csv.archivos_abiertos, csv.filas_leidas              (lecturas y escrituras de los CSV)
+#   busqueda.cache_aciertos, busqueda.cache_fallos, busqueda.filas_recorridas
+#   servidor.cache_aciertos, servidor.cache_fallos
+#   filtros.filas_recorridas (filtros recursivos), filtros.filas_devueltas (filtros del menú)
+# Latencias (histograma por operación):
+#   menu.<acción>, comando.<comando>, api.obtener_pokemon
+#
+# Se vuelcan al salir y cuando se pidan: volcar_metricas(), la señal SIGUSR1
+# (`kill -USR1 <pid>`, donde exista) o la ruta /metricas del modo servidor.
+
+# Límites superiores (en ms) de los intervalos del histograma; lo que supera
+# el último cae en un intervalo final sin límite
+LIMITES_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+METRICAS = {
+    "activo": False,
+    "desde": None,        # time.time() al activarse
+    "destino": None,      # archivo de volcado; None o "-" para la salida de errores
+    "contadores": {},     # nombre -> total
+    "latencias": {},      # nombre -> histograma (ver _histograma_vacio)
+}
+BLOQUEO_METRICAS = threading.Lock()
+
+
+def _histograma_vacio():
+    return {
+        "cantidad": 0,
+        "total_ms": 0.0,
+        "minimo_ms": None,
+        "maximo_ms": 0.0,
+        "intervalos": [0] * (len(LIMITES_MS) + 1),
+    }
+
+
+def activar_metricas(destino=None, volcar_al_salir=True):
+    """
+    Activa el registro de métricas para el resto de la ejecución.
+
+    Args:
+        destino: Archivo donde volcarlas (.json para JSON; otro, texto);
+                 None o "-" para la salida de errores
+        volcar_al_salir: True para volcarlas al terminar el programa
+    """
+    with BLOQUEO_METRICAS:
+        if METRICAS["activo"]:
+            return
+        METRICAS["activo"] = True
+        METRICAS["desde"] = time.time()
+        METRICAS["destino"] = destino
+
+    if volcar_al_salir:
+        atexit.register(volcar_metricas)
+
+    # Volcado a pedido desde otra terminal: kill -USR1 <pid> (no existe en Windows)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        try:
+            signal.signal(signal.SIGUSR1, lambda *_: volcar_metricas())
+        except (ValueError, OSError) as e:
+            print(f"AVISO: No se pudo registrar SIGUSR1 para las métricas: {e}", file=sys.stderr)
+
+
+def metricas_activas():
+    """
+    Returns:
+        bool: True si se están registrando métricas
+    """
+    return METRICAS["activo"]
+
+
+def reiniciar_metricas():
+    """
+    Descarta los valores acumulados (el registro sigue activo o apagado como estaba).
+    """
+    with BLOQUEO_METRICAS:
+        METRICAS["contadores"] = {}
+        METRICAS["latencias"] = {}
+        if METRICAS["activo"]:
+            METRICAS["desde"] = time.time()
+
+
+def contar(nombre, cantidad=1):
+    """
+    Suma `cantidad` al contador `nombre` (si las métricas están activas).
+    """
+    if not METRICAS["activo"]:
+        return
+    with BLOQUEO_METRICAS:
+        contadores = METRICAS["contadores"]
+        contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+
+def registrar_latencia(nombre, segundos):
+    """
+    Agrega una duración al histograma de latencias de `nombre` (si las métricas están activas).
+    """
+    if not METRICAS["activo"]:
+        return
+
+    ms = segundos * 1000
+    intervalo = len(LIMITES_MS)
+    for i, limite in enumerate(LIMITES_MS):
+        if ms <= limite:
+            intervalo = i
+            break
+
+    with BLOQUEO_METRICAS:
+        histograma = METRICAS["latencias"].get(nombre)
+        if histograma is None:
+            histograma = METRICAS["latencias"][nombre] = _histograma_vacio()
+        histograma["cantidad"] += 1
+        histograma["total_ms"] += ms
+        histograma["maximo_ms"] = max(histograma["maximo_ms"], ms)
+        if histograma["minimo_ms"] is None or ms < histograma["minimo_ms"]:
+            histograma["minimo_ms"] = ms
+        histograma["intervalos"][intervalo] += 1
+
+
+@contextmanager
+def medir(nombre):
+    """
+    Mide la duración del bloque: `with medir("menu.estadisticas"): ...`
+    (se registra aunque el bloque termine con una excepción)
+    """
+    if not METRICAS["activo"]:
+        yield
+        return
+
+    comienzo = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_latencia(nombre, time.perf_counter() - comienzo)
+
+
+def medido(nombre):
+    """
+    Decorador: registra la latencia de cada llamada a la función con el nombre dado.
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not METRICAS["activo"]:
+                return funcion(*args, **kwargs)
+            comienzo = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar_latencia(nombre, time.perf_counter() - comienzo)
+        return envoltura
+    return decorador
+
+
+def _percentil(histograma, fraccion):
+    """
+    Percentil aproximado: límite superior del intervalo donde cae (máximo si es el último).
+    """
+    objetivo = fraccion * histograma["cantidad"]
+    acumulado = 0
+    for i, cantidad in enumerate(histograma["intervalos"]):
+        acumulado += cantidad
+        if acumulado >= objetivo and cantidad:
+            return LIMITES_MS[i] if i < len(LIMITES_MS) else round(histograma["maximo_ms"], 3)
+    return None
+
+
+def resumen_metricas():
+    """
+    Copia de las métricas acumuladas, lista para mostrar o convertir a JSON.
+
+    Returns:
+        dict: {"desde", "duracion_s", "contadores", "latencias"}; cada latencia con
+              cantidad, media, mínimo, máximo, percentiles aproximados e histograma
+    """
+    with BLOQUEO_METRICAS:
+        contadores = dict(sorted(METRICAS["contadores"].items()))
+        histogramas = {nombre: dict(h, intervalos=list(h["intervalos"]))
+                       for nombre, h in sorted(METRICAS["latencias"].items())}
+        desde = METRICAS["desde"]
+
+    latencias = {}
+    for nombre, h in histogramas.items():
+        latencias[nombre] = {
+            "cantidad": h["cantidad"],
+            "media_ms": round(h["total_ms"] / h["cantidad"], 3) if h["cantidad"] else 0,
+            "minimo_ms": round(h["minimo_ms"] or 0, 3),
+            "maximo_ms": round(h["maximo_ms"], 3),
+            "total_ms": round(h["total_ms"], 3),
+            "p50_ms": _percentil(h, 0.50),
+            "p95_ms": _percentil(h, 0.95),
+            "p99_ms": _percentil(h, 0.99),
+            # Límite superior de cada intervalo en ms ("inf" = sin límite) -> llamadas
+            "histograma": {str(limite): cantidad for limite, cantidad
+                           in zip(list(LIMITES_MS) + ["inf"], h["intervalos"])},
+        }
+
+    return {
+        "desde": desde,
+        "duracion_s": round(time.time() - desde, 3) if desde else 0,
+        "contadores": contadores,
+        "latencias": latencias,
+    }
+
+
+def texto_metricas(resumen=None):
+    """
+    Returns:
+        str: Métricas en forma de tabla de texto
+    """
+    resumen = resumen or resumen_metricas()
+    lineas = [f"Métricas de la Pokédex ({resumen['duracion_s']:.1f} s)"]
+
+    lineas.append("\nContadores:")
+    if not resumen["contadores"]:
+        lineas.append("  (sin datos)")
+    for nombre, total in resumen["contadores"].items():
+        lineas.append(f"  {nombre:<32} {total:>14,}")
+
+    lineas.append("\nLatencias (ms; percentiles aproximados por intervalo):")
+    if not resumen["latencias"]:
+        lineas.append("  (sin datos)")
+    else:
+        lineas.append(f"  {'operación':<32} {'n':>6} {'media':>9} {'mín':>9} {'máx':>9} "
+                      f"{'p50≤':>7} {'p95≤':>7} {'p99≤':>7}")
+    for nombre, l in resumen["latencias"].items():
+        lineas.append(f"  {nombre:<32} {l['cantidad']:>6} {l['media_ms']:>9.1f} {l['minimo_ms']:>9.1f} "
+                      f"{l['maximo_ms']:>9.1f} {l['p50_ms']:>7} {l['p95_ms']:>7} {l['p99_ms']:>7}")
+
+    return "\n".join(lineas) + "\n"
+
+
+def volcar_metricas(destino=None, formato=None):
+    """
+    Escribe las métricas acumuladas.
+
+    Args:
+        destino: Archivo (se reemplaza); None para el indicado al activarlas,
+                 "-" para la salida de errores
+        formato: "texto" o "json"; None para deducirlo de la extensión del archivo
+
+    Returns:
+        bool: True si se escribieron
+    """
+    if not METRICAS["activo"]:
+        return False
+
+    destino = destino or METRICAS["destino"] or "-"
+    if formato is None:
+        formato = "json" if destino.lower().endswith(".json") else "texto"
+
+    resumen = resumen_metricas()
+    if formato == "json":
+        contenido = json.dumps(resumen, ensure_ascii=False, indent=2) + "\n"
+    else:
+        contenido = texto_metricas(resumen)
+
+    try:
+        if destino == "-":
+            sys.stderr.write("\n" + contenido)
+            sys.stderr.flush()
+        else:
+            with open(destino, "w", encoding="utf-8") as f:
+                f.write(contenido)
+        return True
+
+    except (IOError, OSError) as e:
+        print(f"AVISO: No se pudieron guardar las métricas en {destino}: {e}", file=sys.stderr)
+        return False
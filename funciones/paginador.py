@@ -1,34 +1,50 @@
-def formatear_pokemon(pokemon, index, tipo_formato='simple'):
+import sys
+from collections import OrderedDict
+from itertools import chain
+from .indice import nombres_localizados_de
+from .flujo import limitar
+
+# Marca de fin de flujo al mirar el siguiente elemento
+_FIN = object()
+
+
+# Formatos de fila disponibles
+FORMATOS = ('simple', 'detallado', 'completo')
+
+# Filas ya formateadas: (formato, valores de CAMPOS_FILA) -> texto sin número.
+# La clave son los valores mismos: si un Pokémon cambia (en este proceso o en los
+# CSV desde otro) su clave es otra, y las filas que no cambiaron siguen valiendo
+CACHE_FILAS = OrderedDict()
+MAXIMO_CACHE_FILAS = 1024
+
+# Campos que usa el texto de una fila (ver _cuerpo_pokemon)
+CAMPOS_FILA = ('id', 'nombre', 'tipo', 'tipos', 'altura', 'peso', 'base_experience',
+               'habilidades', 'generacion', 'nombres_localizados')
+
+
+def normalizar_formato(tipo_formato):
     '''
-    Formatea la información de un Pokémon para mostrar en pantalla.
-    
-    Args:
-        pokemon (dict): Diccionario con información del Pokémon
-        index (int): Número de índice a mostrar
-        tipo_formato (str): Tipo de formato: 'simple', 'detallado', 'completo'
+    Valida el tipo de formato y lo deja en minúsculas.
     
     Returns:
-        str: String formateado con la información del Pokémon
+        str: Uno de FORMATOS ('simple' si no es válido)
+    '''
+    if not isinstance(tipo_formato, str):
+        return 'simple'
+    
+    tipo_formato = tipo_formato.lower().strip()
+    return tipo_formato if tipo_formato in FORMATOS else 'simple'
+
+
+def _cuerpo_pokemon(pokemon, tipo_formato):
+    '''
+    Arma el texto de un Pokémon sin el número de la fila.
+    El formato ya debe venir normalizado (ver normalizar_formato).
     '''
     try:
         # Validar que pokemon sea un diccionario
         if not isinstance(pokemon, dict):
-            return f' {index}. Error: Datos inválidos'
-        
-        # Validar que index sea un número
-        if not isinstance(index, int):
-            try:
-                index = int(index)
-            except (ValueError, TypeError):
-                index = 0
-        
-        # Validar tipo_formato
-        if not isinstance(tipo_formato, str):
-            tipo_formato = 'simple'
-        
-        tipo_formato = tipo_formato.lower().strip()
-        if tipo_formato not in ['simple', 'detallado', 'completo']:
-            tipo_formato = 'simple'
+            return 'Error: Datos inválidos'
         
         # Obtener valores con validación
         nombre = pokemon.get('nombre', 'Desconocido')
@@ -39,6 +55,12 @@ def formatear_pokemon(pokemon, index, tipo_formato='simple'):
         if not isinstance(tipo, str):
             tipo = str(tipo)
         
+        # Mostrar todos los tipos si están guardados (ej: Water/Ground)
+        tipo_texto = tipo.capitalize()
+        tipos = pokemon.get('tipos', '')
+        if isinstance(tipos, str) and tipos.strip():
+            tipo_texto = '/'.join(t.strip().capitalize() for t in tipos.split(',') if t.strip())
+        
         generacion = pokemon.get('generacion', 'unknown')
         if not isinstance(generacion, str):
             generacion = str(generacion)
@@ -54,9 +76,15 @@ def formatear_pokemon(pokemon, index, tipo_formato='simple'):
             if not isinstance(habilidades, str):
                 habilidades = str(habilidades)
             
-            return (f' {index}. {nombre.upper()}\n'
+            # Nombre en español si está guardado y es distinto
+            encabezado = nombre.upper()
+            nombre_es = nombres_localizados_de(pokemon).get('es', '')
+            if nombre_es and nombre_es.lower() != nombre.lower():
+                encabezado = f'{encabezado} ({nombre_es})'
+            
+            return (f'{encabezado}\n'
                     f'   ├─ ID: #{pokemon_id}\n'
-                    f'   ├─ Tipo: {tipo.capitalize()}\n'
+                    f'   ├─ Tipo: {tipo_texto}\n'
                     f'   ├─ Generación: {generacion}\n'
                     f'   ├─ Peso: {peso} | Altura: {altura}\n'
                     f'   ├─ Experiencia base: {base_exp}\n'
@@ -64,32 +92,95 @@ def formatear_pokemon(pokemon, index, tipo_formato='simple'):
 
         # Formato detallado: información resumida en 3 líneas
         elif tipo_formato == 'detallado':
-            return (f' {index}. {nombre.upper()}\n'
-                    f'   Tipo: {tipo.capitalize()} | Generación: {generacion}\n'
+            return (f'{nombre.upper()}\n'
+                    f'   Tipo: {tipo_texto} | Generación: {generacion}\n'
                     f'   Peso: {peso} | Altura: {altura} | EXP: {base_exp}')
 
         # Formato simple (por defecto): una sola línea
         else:
-            return (f' {index}. {nombre.upper()} - '
-                    f'Tipo: {tipo.capitalize()} | '
+            return (f'{nombre.upper()} - '
+                    f'Tipo: {tipo_texto} | '
                     f'Generación: {generacion}')
 
     # Si falta alguna clave esperada en el diccionario
     except KeyError as e:
-        return f' {index}. Error: Falta el campo {e}'
+        return f'Error: Falta el campo {e}'
 
     # Si se reciben tipos erróneos o hay problemas de formato
     except (TypeError, ValueError) as e:
-        return f' {index}. Error de formato: {e}'
+        return f'Error de formato: {e}'
     
     except Exception as e:
-        return f' {index}. Error inesperado: {e}'
+        return f'Error inesperado: {e}'
+
+
+def cuerpo_en_cache(pokemon, tipo_formato):
+    '''
+    Devuelve el texto de un Pokémon (sin número) usando la caché de filas,
+    indexada por los valores de la fila.
+    
+    Args:
+        pokemon (dict): Diccionario del Pokémon
+        tipo_formato (str): Formato ya normalizado
+    
+    Returns:
+        str: Texto formateado
+    '''
+    if not isinstance(pokemon, dict):
+        return _cuerpo_pokemon(pokemon, tipo_formato)
+    
+    # Los valores que no son texto (ej: nombres_localizados como dict) entran por su repr
+    valores = tuple(
+        valor if valor is None or isinstance(valor, (str, int, float)) else repr(valor)
+        for valor in (pokemon.get(campo) for campo in CAMPOS_FILA)
+    )
+    clave = (tipo_formato,) + valores
+    texto = CACHE_FILAS.get(clave)
+    
+    if texto is not None:
+        CACHE_FILAS.move_to_end(clave)
+        return texto
+    
+    texto = _cuerpo_pokemon(pokemon, tipo_formato)
+    CACHE_FILAS[clave] = texto
+    CACHE_FILAS.move_to_end(clave)
+    
+    while len(CACHE_FILAS) > MAXIMO_CACHE_FILAS:
+        CACHE_FILAS.popitem(last=False)
+    
+    return texto
+
+
+def formatear_pokemon(pokemon, index, tipo_formato='simple'):
+    '''
+    Formatea la información de un Pokémon para mostrar en pantalla.
+    
+    Args:
+        pokemon (dict): Diccionario con información del Pokémon
+        index (int): Número de índice a mostrar
+        tipo_formato (str): Tipo de formato: 'simple', 'detallado', 'completo'
+    
+    Returns:
+        str: String formateado con la información del Pokémon
+    '''
+    # Validar que index sea un número
+    if not isinstance(index, int):
+        try:
+            index = int(index)
+        except (ValueError, TypeError):
+            index = 0
+    
+    return f' {index}. {_cuerpo_pokemon(pokemon, normalizar_formato(tipo_formato))}'
 
 
 def mostrar_pagina_pokemon(pokemon_lista, inicio_idx, titulo_pagina, tipo_formato='simple'):
     '''
     Función auxiliar para mostrar una página de Pokémon.
     
+    La página se arma completa en memoria y se escribe de una vez (una sola
+    escritura por página, en vez de un print por línea), con las filas tomadas
+    de la caché de filas formateadas.
+    
     Args:
         pokemon_lista (list): Lista de Pokémon a mostrar
         inicio_idx (int): Índice inicial para la numeración visual
@@ -113,38 +204,166 @@ def mostrar_pagina_pokemon(pokemon_lista, inicio_idx, titulo_pagina, tipo_format
         if not isinstance(titulo_pagina, str):
             titulo_pagina = "Resultados"
         
-        # Validar tipo_formato
-        if not isinstance(tipo_formato, str):
-            tipo_formato = 'simple'
+        # El formato se valida una vez por página, no por fila
+        tipo_formato = normalizar_formato(tipo_formato)
         
         # Encabezado visual de la página
-        print('\n' + '=' * 80)
-        print(f'{titulo_pagina}')
-        print('=' * 80, '\n')
+        partes = ['\n', '=' * 80, '\n', titulo_pagina, '\n', '=' * 80, ' \n\n']
 
-        # Recorre y muestra cada Pokémon usando el formateador elegido
+        # Recorre cada Pokémon usando el formateador elegido
         for i, pokemon in enumerate(pokemon_lista, start=inicio_idx):
             try:
-                print(formatear_pokemon(pokemon, i, tipo_formato))
+                partes.append(f' {i}. {cuerpo_en_cache(pokemon, tipo_formato)}\n')
             except Exception as e:
-                print(f' {i}. Error al mostrar Pokémon: {e}')
+                partes.append(f' {i}. Error al mostrar Pokémon: {e}\n')
 
         # Separador inferior
-        print('\n' + '-' * 80)
+        partes.append('\n' + '-' * 80 + '\n')
+        
+        sys.stdout.write(''.join(partes))
+        sys.stdout.flush()
         
     except Exception as e:
         print(f"\nAVISO: Error al mostrar página: {e}")
 
 
-def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_formato='completo'):
+# Páginas visitadas que se conservan en memoria para volver con "A = Anterior"
+TAMANO_BUFFER = 3
+
+# Hasta cuántos resultados se muestran en una sola pantalla, sin paginar
+MAXIMO_SIN_PAGINAR = 10
+
+
+def crear_cursor(resultados, pokemon_por_pagina, total=None):
+    '''
+    Prepara el origen de datos del paginador sin leerlo completo.
+    
+    Args:
+        resultados: Lista, iterador/generador o función sin argumentos que
+                    devuelve un iterador nuevo (permite volver a leer desde el inicio)
+        pokemon_por_pagina (int): Tamaño de página
+        total (int): Cantidad total si se conoce de antemano (por ejemplo, del índice)
+    
+    Returns:
+        dict: Estado del cursor o None si los resultados no son válidos
+    '''
+    cursor = {
+        "lista": None,        # acceso directo cuando los resultados ya son una lista
+        "fabrica": None,      # función para reabrir el origen
+        "fuente": None,       # iterador actual
+        "posicion": 0,        # elementos ya consumidos de la fuente
+        "agotado": False,
+        "total": total if isinstance(total, int) and total >= 0 else None,
+        "por_pagina": pokemon_por_pagina,
+        "buffer": OrderedDict(),
+    }
+    
+    if isinstance(resultados, list):
+        cursor["lista"] = resultados
+        cursor["total"] = len(resultados)
+        cursor["agotado"] = True
+        return cursor
+    
+    try:
+        if callable(resultados):
+            cursor["fabrica"] = resultados
+            cursor["fuente"] = iter(resultados())
+        else:
+            cursor["fuente"] = iter(resultados)
+    except TypeError:
+        return None
+    
+    return cursor
+
+
+def obtener_pagina(cursor, numero):
+    '''
+    Devuelve los Pokémon de una página, leyendo del origen solo lo necesario.
+    
+    Args:
+        cursor (dict): Estado creado por crear_cursor
+        numero (int): Número de página (desde 1)
+    
+    Returns:
+        list: Pokémon de la página (vacía si está más allá del final),
+              o None si la página ya no está disponible (iterador que no se puede reabrir)
+    '''
+    por_pagina = cursor["por_pagina"]
+    inicio = (numero - 1) * por_pagina
+    
+    if cursor["lista"] is not None:
+        return cursor["lista"][inicio:inicio + por_pagina]
+    
+    buffer = cursor["buffer"]
+    if numero in buffer:
+        buffer.move_to_end(numero)
+        return buffer[numero]
+    
+    # La página quedó atrás: reabrir el origen o informar que no está disponible
+    if inicio < cursor["posicion"]:
+        if cursor["fabrica"] is None:
+            return None
+        cursor["fuente"] = iter(cursor["fabrica"]())
+        cursor["posicion"] = 0
+    
+    fuente = cursor["fuente"]
+    
+    # Saltar (sin guardar) los elementos de las páginas intermedias
+    saltados = sum(1 for _ in limitar(fuente, inicio - cursor["posicion"]))
+    cursor["posicion"] += saltados
+    
+    pagina = list(limitar(fuente, por_pagina)) if cursor["posicion"] == inicio else []
+    cursor["posicion"] += len(pagina)
+    
+    # Mirar un elemento más para saber si esta es la última página
+    if len(pagina) == por_pagina:
+        siguiente = next(fuente, _FIN)
+        if siguiente is not _FIN:
+            cursor["fuente"] = chain([siguiente], fuente)
+        else:
+            cursor["agotado"] = True
+    else:
+        cursor["agotado"] = True
+    
+    if cursor["agotado"]:
+        # El total real reemplaza a la estimación
+        cursor["total"] = cursor["posicion"]
+    
+    if pagina:
+        buffer[numero] = pagina
+        while len(buffer) > TAMANO_BUFFER:
+            buffer.popitem(last=False)
+    
+    return pagina
+
+
+def total_paginas_de(cursor):
+    '''
+    Calcula el total de páginas si se conoce el total de Pokémon.
+    
+    Returns:
+        int: Total de páginas o None si todavía no se sabe
+    '''
+    if cursor["total"] is None:
+        return None
+    return max(1, (cursor["total"] + cursor["por_pagina"] - 1) // cursor["por_pagina"])
+
+
+def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_formato='completo', total=None):
     '''
     Muestra una lista de Pokémon con sistema de paginación interactivo.
     
+    Los resultados pueden ser una lista, un flujo (por ejemplo, iterar_recursivo) o una
+    función que devuelve un flujo nuevo. Con flujos solo se leen las páginas visitadas
+    y se guardan las últimas TAMANO_BUFFER para volver atrás; la primera página se
+    muestra sin leer el resto de la Pokédex.
+    
     Args:
-        resultados (list): Lista de diccionarios con datos de Pokémon
+        resultados (iterable | callable): Lista, flujo o función que devuelve un flujo
         pokemon_por_pagina (int): Cantidad de Pokémon por página (default: 10)
         titulo (str): Título del listado
         tipo_formato (str): Formato de visualización: 'simple', 'detallado', 'completo'
+        total (int): Total de Pokémon si se conoce sin recorrer el flujo (opcional)
     
     Controles de navegación:
         - Enter: Avanza a la siguiente página (o vuelve a la primera si está en la última)
@@ -153,16 +372,6 @@ def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_
         - S: Sale de la paginación
     '''
     try:
-        # Validar que resultados sea una lista
-        if not isinstance(resultados, list):
-            print('\nAVISO: Formato de resultados inválido.')
-            return
-        
-        # Verificar si hay resultados para mostrar
-        if not resultados:
-            print('\nNo hay Pokémon para mostrar.')
-            return
-
         # Validar que pokemon_por_pagina sea un entero positivo
         if not isinstance(pokemon_por_pagina, int) or pokemon_por_pagina <= 0:
             pokemon_por_pagina = 5
@@ -178,81 +387,110 @@ def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_
         if not isinstance(tipo_formato, str):
             tipo_formato = 'completo'
 
-        # Total de elementos y cálculo de páginas (redondeo hacia arriba)
-        total_pokemon = len(resultados)
+        cursor = crear_cursor(resultados, pokemon_por_pagina, total)
+        if cursor is None:
+            print('\nAVISO: Formato de resultados inválido.')
+            return
+        
+        # Leer solo los primeros resultados para decidir si hace falta paginar
+        if cursor["lista"] is not None:
+            muestra = cursor["lista"][:MAXIMO_SIN_PAGINAR + 1]
+        else:
+            muestra = list(limitar(cursor["fuente"], MAXIMO_SIN_PAGINAR + 1))
+            cursor["fuente"] = chain(muestra, cursor["fuente"])
         
-        if total_pokemon == 0:
+        # Verificar si hay resultados para mostrar
+        if not muestra:
             print('\nNo hay Pokémon para mostrar.')
             return
-        
-        total_paginas = (total_pokemon + pokemon_por_pagina - 1) // pokemon_por_pagina
 
         # Caso simple: 10 o menos resultados → una sola pantalla y volver
-        if total_pokemon <= 10:
-            titulo_completo = f'{titulo}\nMostrando {total_pokemon} Pokémon'
-            mostrar_pagina_pokemon(resultados, 1, titulo_completo, tipo_formato)
+        if len(muestra) <= MAXIMO_SIN_PAGINAR:
+            titulo_completo = f'{titulo}\nMostrando {len(muestra)} Pokémon'
+            mostrar_pagina_pokemon(muestra, 1, titulo_completo, tipo_formato)
             input('\nPresione Enter para continuar...')
             return
 
         # Paginación interactiva para más de 10 resultados
         pagina_actual = 1
+        pagina_mostrada = None
         
         while True:
             try:
                 # Validar que pagina_actual esté en rango
+                total_paginas = total_paginas_de(cursor)
                 if pagina_actual < 1:
                     pagina_actual = 1
-                elif pagina_actual > total_paginas:
+                elif total_paginas is not None and pagina_actual > total_paginas:
                     pagina_actual = total_paginas
                 
-                # Determina el rango (slice) de la página actual
-                inicio = (pagina_actual - 1) * pokemon_por_pagina
-                fin = min(inicio + pokemon_por_pagina, total_pokemon)
+                pokemon_pagina = obtener_pagina(cursor, pagina_actual)
                 
-                # Validar rangos
-                if inicio < 0:
-                    inicio = 0
-                if fin > total_pokemon:
-                    fin = total_pokemon
+                if pokemon_pagina is None:
+                    # Flujo de una sola lectura: la página salió del buffer
+                    print(f'\nLa página {pagina_actual} ya no está disponible '
+                          f'(se guardan las últimas {TAMANO_BUFFER} páginas).')
+                    input('Presione Enter para continuar...')
+                    pagina_actual = pagina_mostrada or 1
+                    continue
+                
+                if not pokemon_pagina:
+                    # Se pidió una página más allá del final: ahora se conoce el total
+                    pagina_actual = total_paginas_de(cursor)
+                    print(f'\nPágina inválida. Debe estar entre 1 y {pagina_actual}.')
+                    input('Presione Enter para continuar...')
+                    continue
                 
-                pokemon_pagina = resultados[inicio:fin]
+                pagina_mostrada = pagina_actual
+                total_paginas = total_paginas_de(cursor)
+                inicio = (pagina_actual - 1) * pokemon_por_pagina
+                fin = inicio + len(pokemon_pagina)
+                total_pokemon = cursor["total"]
 
                 # Muestra la página actual con título informativo
-                titulo_pagina = (
-                    f'{titulo}\n'
-                    f'Página {pagina_actual} de {total_paginas}\n'
-                    f'Mostrando {inicio + 1}-{fin} de {total_pokemon} Pokémon'
-                )
+                if total_paginas is not None:
+                    titulo_pagina = (
+                        f'{titulo}\n'
+                        f'Página {pagina_actual} de {total_paginas}\n'
+                        f'Mostrando {inicio + 1}-{fin} de {total_pokemon} Pokémon'
+                    )
+                else:
+                    titulo_pagina = (
+                        f'{titulo}\n'
+                        f'Página {pagina_actual}\n'
+                        f'Mostrando {inicio + 1}-{fin} Pokémon (el total se calcula al avanzar)'
+                    )
                 mostrar_pagina_pokemon(pokemon_pagina, inicio + 1, titulo_pagina, tipo_formato)
 
+                es_ultima = cursor["agotado"] and fin >= total_pokemon
+
                 # Construcción de controles visibles según el contexto
                 controles = []
                 
                 # Enter (siguiente / volver a 1 en última)
-                if pagina_actual < total_paginas:
+                if not es_ultima:
                     controles.append('Enter = Siguiente')
                 else:
                     controles.append('Enter = Volver a página 1')
                 
                 # A (Anterior) si no estamos en la primera
-                if total_paginas >= 2 and pagina_actual > 1:
+                if pagina_actual > 1:
                     controles.append('A = Anterior')
                 
                 # [Número] para ir a una página específica (si hay más de 2 páginas)
-                if total_paginas > 2:
+                if total_paginas is None or total_paginas > 2:
                     controles.append('[Número] = Ir a página')
                 
-                # S (Salir) disponible si hay 2 o más páginas
-                if total_paginas >= 2:
-                    controles.append('S = Salir')
+                # S (Salir): siempre hay 2 o más páginas
+                controles.append('S = Salir')
 
                 # Muestra controles y lee la opción del usuario
                 print(' | '.join(controles))
                 print('-' * 80)
                 opcion = input('\nSeleccione una opción: ').lower().strip()
 
-                # Opción salir (con 2 o más páginas)
-                if opcion == 's' and total_paginas >= 2:
+                # Opción salir
+                if opcion == 's':
                     break
 
                 # Ir a la página anterior (si es posible)
@@ -265,34 +503,30 @@ def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_
 
                 # Enter: avanzar; si estamos en la última, volver a la primera
                 elif opcion == '':
-                    if pagina_actual < total_paginas:
+                    if not es_ultima:
                         pagina_actual += 1
                     else:
                         pagina_actual = 1
 
-                # Número: ir a una página específica (solo si hay > 2 páginas)
-                elif opcion.isdigit() and total_paginas > 2:
-                    try:
-                        pagina_destino = int(opcion)
-                        if 1 <= pagina_destino <= total_paginas:
-                            pagina_actual = pagina_destino
-                        else:
-                            print(f'\nPágina inválida. Debe estar entre 1 y {total_paginas}.')
-                            input('Presione Enter para continuar...')
-                    except ValueError:
-                        print('\nNúmero de página inválido.')
+                # Número: ir a una página específica
+                elif opcion.isdigit() and (total_paginas is None or total_paginas > 2):
+                    pagina_destino = int(opcion)
+                    if pagina_destino >= 1 and (total_paginas is None or pagina_destino <= total_paginas):
+                        pagina_actual = pagina_destino
+                    else:
+                        limite = f'entre 1 y {total_paginas}' if total_paginas is not None else 'mayor que 0'
+                        print(f'\nPágina inválida. Debe estar {limite}.')
                         input('Presione Enter para continuar...')
 
                 # Opción no reconocida: muestra ayuda contextual
                 else:
                     print(f'\nOpción "{opcion}" no reconocida.')
                     opciones_validas = ['Enter']
-                    if total_paginas >= 2 and pagina_actual > 1:
+                    if pagina_actual > 1:
                         opciones_validas.append('A (anterior)')
-                    if total_paginas > 2:
+                    if total_paginas is None or total_paginas > 2:
                         opciones_validas.append('[número] (ir a página)')
-                    if total_paginas >= 2:
-                        opciones_validas.append('S (salir)')
+                    opciones_validas.append('S (salir)')
                     print(f'Opciones válidas: {", ".join(opciones_validas)}')
                     input('Presione Enter para continuar...')
                     
@@ -309,4 +543,4 @@ def paginar_pokemon(resultados, pokemon_por_pagina=5, titulo='Resultados', tipo_
 
     # Cualquier otro error inesperado se informa sin romper la app
     except Exception as e:
-        print(f'\nAVISO: Error inesperado en el paginador - {e}')
\ No newline at end of file
+        print(f'\nAVISO: Error inesperado en el paginador - {e}')
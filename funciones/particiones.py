@@ -0,0 +1,263 @@
+import os
+import sys
+import csv
+import json
+import tempfile
+import threading
+from .indice import tipos_de
+from .concurrencia import BLOQUEO_POKEDEX, lectura
+from .metricas import contar
+
+# Archivo con el conteo de filas y tipos de cada partición (dentro de la pokédex)
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+
+# La lectura, el recuento y la escritura del manifiesto se hacen de a un hilo.
+# Se toma siempre después de lectura(BLOQUEO_POKEDEX) (nunca al revés), así un hilo
+# que escribe en la Pokédex y otro que lista particiones no se esperan entre sí.
+BLOQUEO_MANIFIESTO = threading.Lock()
+
+
+def buscar_particiones_recursivo(ruta, relativa=""):
+    """
+    Busca recursivamente todos los CSV de la pokédex (cada uno es una partición).
+
+    Recursión:
+        - Caso base: Un archivo .csv es una partición
+        - Paso recursivo: Entra a subcarpetas
+
+    Args:
+        ruta: Directorio actual a explorar
+        relativa: Ruta relativa acumulada desde la base (para la recursión)
+
+    Returns:
+        list: Rutas relativas de los CSV con "/" como separador
+              (ej: "generation-i/fire/pokemon.csv")
+    """
+    try:
+        if not isinstance(ruta, str) or not ruta.strip():
+            return []
+
+        if not os.path.isdir(ruta):
+            return []
+
+        try:
+            elementos = sorted(os.listdir(ruta))
+        except PermissionError:
+            print(f"\nAVISO: Sin permisos para acceder a: {ruta}", file=sys.stderr)
+            return []
+        except OSError as e:
+            print(f"\nAVISO: Error al listar {ruta}: {e}", file=sys.stderr)
+            return []
+
+        particiones = []
+        for elemento in elementos:
+            ruta_completa = os.path.join(ruta, elemento)
+            relativa_elemento = f"{relativa}/{elemento}" if relativa else elemento
+
+            if os.path.isdir(ruta_completa):
+                # Paso recursivo: explorar subdirectorio
+                particiones.extend(buscar_particiones_recursivo(ruta_completa, relativa_elemento))
+            elif elemento.endswith(".csv"):
+                # Caso base: archivo CSV
+                particiones.append(relativa_elemento)
+
+        return particiones
+
+    except RecursionError:
+        print("\nAVISO: Límite de recursión alcanzado", file=sys.stderr)
+        return []
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al buscar particiones: {e}", file=sys.stderr)
+        return []
+
+
+def contar_particion(archivo):
+    """
+    Cuenta las filas de un CSV y cuántas tienen cada tipo.
+
+    Args:
+        archivo: Ruta del CSV
+
+    Returns:
+        dict: {"filas": int, "tipos": {tipo: cantidad}}
+    """
+    conteo = {"filas": 0, "tipos": {}}
+
+    try:
+        with lectura(BLOQUEO_POKEDEX), open(archivo, newline="", encoding="utf-8") as f:
+            contar("csv.archivos_abiertos")
+            for row in csv.DictReader(f):
+                conteo["filas"] += 1
+                for tipo in tipos_de(row):
+                    conteo["tipos"][tipo] = conteo["tipos"].get(tipo, 0) + 1
+        contar("csv.filas_leidas", conteo["filas"])
+
+    except IOError as e:
+        print(f"\nAVISO: Error al leer {archivo}: {e}", file=sys.stderr)
+    except csv.Error as e:
+        print(f"\nAVISO: Error de CSV en {archivo}: {e}", file=sys.stderr)
+
+    return conteo
+
+
+def cargar_manifiesto(base_dir="pokedex"):
+    """
+    Lee el manifiesto de particiones.
+
+    Returns:
+        dict: Manifiesto con la clave "particiones" (vacío si no existe o es inválido)
+    """
+    try:
+        archivo = os.path.join(base_dir, ARCHIVO_MANIFIESTO)
+
+        if not os.path.isfile(archivo):
+            return {"particiones": {}}
+
+        with open(archivo, encoding="utf-8") as f:
+            manifiesto = json.load(f)
+
+        if not isinstance(manifiesto, dict) or not isinstance(manifiesto.get("particiones"), dict):
+            return {"particiones": {}}
+
+        return manifiesto
+
+    except (IOError, ValueError):
+        return {"particiones": {}}
+
+
+def guardar_manifiesto(base_dir, manifiesto):
+    """
+    Escribe el manifiesto de forma atómica (archivo temporal + reemplazo).
+    El temporal tiene un nombre único: otro proceso que escriba a la vez no lo pisa.
+    """
+    temporal = None
+    try:
+        archivo = os.path.join(base_dir, ARCHIVO_MANIFIESTO)
+        descriptor, temporal = tempfile.mkstemp(prefix=ARCHIVO_MANIFIESTO + ".", suffix=".tmp", dir=base_dir)
+
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=1)
+
+        os.replace(temporal, archivo)
+        temporal = None
+
+    except (IOError, OSError) as e:
+        print(f"\nAVISO: No se pudo guardar el manifiesto: {e}", file=sys.stderr)
+    finally:
+        if temporal is not None and os.path.exists(temporal):
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+
+
+def listar_particiones(base_dir="pokedex"):
+    """
+    Lista las particiones de la pokédex con su conteo de filas y de tipos.
+
+    Los nombres de generación y tipo salen de los nombres de las carpetas. Los
+    conteos salen del manifiesto y solo se recalculan para los CSV cuyo tamaño o
+    fecha de modificación cambió, así que no se vuelve a leer la pokédex completa.
+
+    Args:
+        base_dir: Directorio base de la pokédex
+
+    Returns:
+        dict: {particion: {"archivo", "generacion", "tipo", "filas", "tipos", "tamano", "mtime_ns"}}
+    """
+    try:
+        if not isinstance(base_dir, str) or not os.path.isdir(base_dir):
+            return {}
+
+        # Leer, recontar y guardar el manifiesto sin que otro hilo lo haga a la vez
+        with lectura(BLOQUEO_POKEDEX), BLOQUEO_MANIFIESTO:
+            manifiesto = cargar_manifiesto(base_dir)
+            anteriores = manifiesto["particiones"]
+            actuales = {}
+            cambios = False
+
+            for particion in buscar_particiones_recursivo(base_dir):
+                archivo = os.path.join(base_dir, *particion.split("/"))
+
+                try:
+                    estado = os.stat(archivo)
+                except OSError:
+                    continue
+
+                entrada = anteriores.get(particion)
+
+                # Recontar solo si el archivo cambió desde la última vez
+                if (not isinstance(entrada, dict)
+                        or entrada.get("tamano") != estado.st_size
+                        or entrada.get("mtime_ns") != estado.st_mtime_ns):
+                    entrada = contar_particion(archivo)
+                    entrada["tamano"] = estado.st_size
+                    entrada["mtime_ns"] = estado.st_mtime_ns
+                    cambios = True
+
+                actuales[particion] = entrada
+
+            if cambios or len(actuales) != len(anteriores):
+                manifiesto["particiones"] = actuales
+                guardar_manifiesto(base_dir, manifiesto)
+
+        particiones = {}
+        for particion, entrada in actuales.items():
+            carpetas = particion.split("/")
+            particiones[particion] = {
+                "archivo": os.path.join(base_dir, *carpetas),
+                "generacion": carpetas[0] if len(carpetas) > 1 else "",
+                "tipo": carpetas[1] if len(carpetas) > 2 else "",
+                "filas": entrada.get("filas", 0),
+                "tipos": entrada.get("tipos", {}),
+                "tamano": entrada.get("tamano"),
+                "mtime_ns": entrada.get("mtime_ns"),
+            }
+
+        return particiones
+
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al listar particiones: {e}", file=sys.stderr)
+        return {}
+
+
+def contar_por_generacion(particiones):
+    """
+    Suma las filas de las particiones agrupando por generación.
+
+    Returns:
+        dict: {generacion: cantidad}
+    """
+    conteo = {}
+    for datos in particiones.values():
+        if datos["generacion"] and datos["filas"]:
+            conteo[datos["generacion"]] = conteo.get(datos["generacion"], 0) + datos["filas"]
+    return conteo
+
+
+def contar_tipos(particiones):
+    """
+    Suma los conteos de tipos de todas las particiones (incluye tipos secundarios).
+
+    Returns:
+        dict: {tipo: cantidad}
+    """
+    conteo = {}
+    for datos in particiones.values():
+        for tipo, cantidad in datos["tipos"].items():
+            conteo[tipo] = conteo.get(tipo, 0) + cantidad
+    return conteo
+
+
+def particiones_de_generacion(particiones, generacion):
+    """
+    Devuelve las particiones que pertenecen a una generación.
+    """
+    return [p for p, datos in particiones.items() if datos["generacion"] == generacion]
+
+
+def particiones_con_tipos(particiones, tipos):
+    """
+    Devuelve las particiones que contienen filas de todos los tipos indicados.
+    """
+    return [p for p, datos in particiones.items() if all(datos["tipos"].get(t) for t in tipos)]
@@ -0,0 +1,166 @@
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Modo de perfilado: `python main.py --perfilar DIR` ejecuta cada opción del menú (y cada
+# comando) dentro de cProfile y tracemalloc, y deja por cada ejecución en DIR:
+#   NNN-<acción>.prof   perfil de CPU (abrir con `python -m pstats` o snakeviz)
+#   NNN-<acción>.txt    duración, pico de memoria, funciones más costosas y líneas
+#                       que más memoria reservaron
+#   resumen.txt         una línea por ejecución (acción, duración, pico de memoria)
+#
+# cProfile solo mide el hilo que ejecuta la acción: el trabajo de la precarga en
+# segundo plano no aparece en el perfil de CPU. tracemalloc, en cambio, cuenta las
+# reservas de todos los hilos, así que el pico puede incluir las de la precarga.
+
+# Cuántas funciones y líneas de memoria mostrar en cada informe
+FUNCIONES_INFORME = 30
+LINEAS_MEMORIA_INFORME = 15
+
+PERFILADO = {"directorio": None, "ejecuciones": 0}
+BLOQUEO_PERFILADO = threading.Lock()
+
+
+def activar_perfilado(directorio):
+    """
+    Activa el perfilado de las acciones; los informes se guardan en `directorio`.
+
+    Args:
+        directorio: Carpeta de destino (se crea si no existe)
+
+    Returns:
+        bool: True si el perfilado quedó activo
+    """
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        PERFILADO["directorio"] = directorio
+        return True
+    except OSError as e:
+        print(f"AVISO: No se pudo crear la carpeta de perfiles {directorio}: {e}", file=sys.stderr)
+        return False
+
+
+def perfilado_activo():
+    """
+    Returns:
+        bool: True si se están perfilando las acciones
+    """
+    return PERFILADO["directorio"] is not None
+
+
+def _tamano_legible(cantidad):
+    for unidad in ("B", "KB", "MB"):
+        if abs(cantidad) < 1024:
+            return f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.1f} GB"
+
+
+def _texto_informe(nombre, duracion, pico, perfil, memoria):
+    """
+    Arma el informe de texto de una ejecución.
+    """
+    salida = io.StringIO()
+    salida.write(f"Acción: {nombre}\n")
+    salida.write(f"Duración: {duracion * 1000:.1f} ms\n")
+    salida.write(f"Pico de memoria (tracemalloc, todos los hilos): {_tamano_legible(pico)}\n")
+
+    salida.write(f"\nFunciones con más tiempo acumulado (primeras {FUNCIONES_INFORME}):\n")
+    if perfil is not None:
+        estadisticas = pstats.Stats(perfil, stream=salida)
+        estadisticas.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(FUNCIONES_INFORME)
+    else:
+        salida.write("  (sin perfil de CPU)\n")
+
+    salida.write(f"\nLíneas con más memoria reservada al terminar (primeras {LINEAS_MEMORIA_INFORME}):\n")
+    if memoria is not None:
+        for estadistica in memoria.statistics("lineno")[:LINEAS_MEMORIA_INFORME]:
+            marco = estadistica.traceback[0]
+            salida.write(f"  {_tamano_legible(estadistica.size):>10}  {estadistica.count:>7} bloques  "
+                         f"{marco.filename}:{marco.lineno}\n")
+    else:
+        salida.write("  (sin datos de memoria)\n")
+
+    return salida.getvalue()
+
+
+def guardar_perfil(nombre, duracion, pico, perfil, memoria):
+    """
+    Guarda el perfil (.prof), el informe (.txt) y la línea del resumen de una ejecución.
+
+    Returns:
+        str: Ruta base de los archivos (sin extensión) o None si no se pudieron guardar
+    """
+    directorio = PERFILADO["directorio"]
+
+    with BLOQUEO_PERFILADO:
+        PERFILADO["ejecuciones"] += 1
+        numero = PERFILADO["ejecuciones"]
+
+    base = os.path.join(directorio, f"{numero:03d}-{nombre}")
+
+    try:
+        if perfil is not None:
+            perfil.dump_stats(base + ".prof")
+
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(_texto_informe(nombre, duracion, pico, perfil, memoria))
+
+        with open(os.path.join(directorio, "resumen.txt"), "a", encoding="utf-8") as f:
+            f.write(f"{numero:03d}  {nombre:<28} {duracion * 1000:>10.1f} ms  "
+                    f"pico {_tamano_legible(pico):>10}\n")
+
+        return base
+
+    except (IOError, OSError) as e:
+        print(f"AVISO: No se pudo guardar el perfil de {nombre}: {e}", file=sys.stderr)
+        return None
+
+
+@contextmanager
+def perfilar(nombre):
+    """
+    Ejecuta el bloque con cProfile y tracemalloc y guarda sus informes
+    (si el perfilado está activo): `with perfilar("estadisticas"): ...`
+    """
+    if not perfilado_activo():
+        yield
+        return
+
+    # tracemalloc se enciende solo durante la acción: fuera de ella no agrega costo
+    ya_rastreaba = tracemalloc.is_tracing()
+    if not ya_rastreaba:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    perfil = cProfile.Profile()
+    try:
+        perfil.enable()
+    except ValueError as e:
+        # Otro perfilador activo (ej: ejecutado bajo `python -m cProfile`)
+        print(f"AVISO: No se pudo perfilar la CPU de {nombre}: {e}", file=sys.stderr)
+        perfil = None
+
+    comienzo = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - comienzo
+        if perfil is not None:
+            perfil.disable()
+
+        pico = tracemalloc.get_traced_memory()[1]
+        memoria = tracemalloc.take_snapshot()
+        if not ya_rastreaba:
+            tracemalloc.stop()
+
+        base = guardar_perfil(nombre, duracion, pico, perfil, memoria)
+        if base is not None:
+            print(f"[Perfil de {nombre}: {duracion * 1000:.0f} ms, pico {_tamano_legible(pico)} -> {base}.txt]",
+                  file=sys.stderr)
@@ -1,22 +1,88 @@
 import os
+import sys
 import csv
+import time
+from .concurrencia import BLOQUEO_POKEDEX, lectura, escritura, leyendo
+from .indice import (
+    INDICE, indice_cargado, indice_activo, reiniciar_indice, particion_cargada, incrementar_version,
+    agregar_particion, quitar_particion, renovar_sello, registrar_pokemon, quitar_pokemon,
+    actualizar_campo, ruta_particion
+)
+from .particiones import listar_particiones
+from .metricas import contar
 
 # Campos globales que tendrán todos los Pokémon en los CSV
 CAMPOS = [
     "id",
     "nombre",
     "tipo",
+    "tipos",
     "altura",
     "peso",
     "base_experience",
     "habilidades",
     "areas_encuentro",
-    "generacion"
+    "generacion",
+    "nombres_localizados"
 ]
 
 
+# Las escrituras en los CSV y en el índice se hacen con escritura(BLOQUEO_POKEDEX)
+# (exclusiva) y las lecturas de los CSV con lectura(BLOQUEO_POKEDEX), que pueden ir
+# en paralelo: así nadie lee un CSV a medio reescribir (ver concurrencia.py).
+
+
+# Instantánea de solo lectura para otros procesos (ver instantanea.py). Cada escritura
+# la descarta: los procesos que la usan lo notan y la vuelven a publicar.
+ARCHIVO_INSTANTANEA = "instantanea.bin"
+
+
+def descartar_instantanea(base_dir):
+    """
+    Borra la instantánea publicada de la pokédex, si existe.
+    Los procesos que ya la tienen abierta siguen leyendo la copia anterior.
+    """
+    try:
+        os.remove(os.path.join(base_dir, ARCHIVO_INSTANTANEA))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"\nAVISO: No se pudo descartar la instantánea: {e}", file=sys.stderr)
+
+
+# Otro proceso puede cambiar los CSV mientras el índice está cargado. Antes de cada
+# lectura se compara el tamaño y la fecha de modificación de cada partición (según el
+# manifiesto) con los que tenía al leerla, como mucho una vez cada tantos segundos.
+INTERVALO_VERIFICACION = 1.0
+VERIFICACION = {"ultima": 0.0}
+
+
+def sello_csv(archivo):
+    """
+    Obtiene el sello de un CSV: su tamaño y su fecha de modificación.
+
+    Returns:
+        tuple: (tamaño, mtime_ns) o None si el archivo no existe
+    """
+    try:
+        estado = os.stat(archivo)
+        return (estado.st_size, estado.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def avisador(silencioso):
+    """
+    Devuelve la función para mostrar mensajes: print, o una que no muestra nada
+    cuando la operación se hace en segundo plano.
+    """
+    if silencioso:
+        return lambda *args, **kwargs: None
+    return print
+
+
 # CREATE / UPDATE
-def guardar_pokemon(pokemon, base_dir="pokedex"):
+def guardar_pokemon(pokemon, base_dir="pokedex", silencioso=False):
     """
     Guarda un Pokémon en su CSV correspondiente.
     Si el archivo no existe, lo crea.
@@ -25,73 +91,133 @@ def guardar_pokemon(pokemon, base_dir="pokedex"):
     Args:
         pokemon: Diccionario con los datos del Pokémon
         base_dir: Directorio base de la pokédex
+        silencioso: True para no mostrar mensajes (precarga en segundo plano)
     """
-    try:
-        # Validar que pokemon sea un diccionario
-        if not isinstance(pokemon, dict):
-            print("\nAVISO: Los datos del Pokémon deben ser un diccionario")
-            return
-        
-        # Validar que base_dir sea un string
-        if not isinstance(base_dir, str) or not base_dir.strip():
-            print("\nAVISO: Directorio base inválido")
-            return
-        
-        # Validar campos requeridos
-        campos_requeridos = ["generacion", "tipo", "nombre"]
-        for campo in campos_requeridos:
-            if campo not in pokemon:
-                print(f"\nAVISO: Falta el campo requerido: {campo}")
+    avisar = avisador(silencioso)
+    
+    with escritura(BLOQUEO_POKEDEX):
+        try:
+            # Validar que pokemon sea un diccionario
+            if not isinstance(pokemon, dict):
+                avisar("\nAVISO: Los datos del Pokémon deben ser un diccionario", file=sys.stderr)
                 return
-            if not isinstance(pokemon[campo], str) or not pokemon[campo].strip():
-                print(f"\nAVISO: El campo '{campo}' debe ser un texto válido")
+            
+            # Validar que base_dir sea un string
+            if not isinstance(base_dir, str) or not base_dir.strip():
+                avisar("\nAVISO: Directorio base inválido", file=sys.stderr)
+                return
+            
+            # Validar campos requeridos
+            campos_requeridos = ["generacion", "tipo", "nombre"]
+            for campo in campos_requeridos:
+                if campo not in pokemon:
+                    avisar(f"\nAVISO: Falta el campo requerido: {campo}", file=sys.stderr)
+                    return
+                if not isinstance(pokemon[campo], str) or not pokemon[campo].strip():
+                    avisar(f"\nAVISO: El campo '{campo}' debe ser un texto válido", file=sys.stderr)
+                    return
+            
+            # Construir ruta según jerarquía
+            path = os.path.join(base_dir, pokemon["generacion"], pokemon["tipo"])
+            
+            # Crear directorios si no existen
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError as e:
+                avisar(f"\nAVISO: No se pudo crear el directorio {path}: {e}", file=sys.stderr)
                 return
-        
-        # Construir ruta según jerarquía
-        path = os.path.join(base_dir, pokemon["generacion"], pokemon["tipo"])
-        
-        # Crear directorios si no existen
-        try:
-            os.makedirs(path, exist_ok=True)
-        except OSError as e:
-            print(f"\nAVISO: No se pudo crear el directorio {path}: {e}")
-            return
 
-        archivo = os.path.join(path, "pokemon.csv")
+            archivo = os.path.join(path, "pokemon.csv")
 
-        # Verificar si ya existe el Pokémon
-        if existe_pokemon_en_csv(pokemon["nombre"], archivo):
-            print(f"\nAVISO: {pokemon['nombre']} ya existe en {archivo}. No se duplicará.")
-            return
+            # Verificar si ya existe el Pokémon
+            if existe_pokemon_en_csv(pokemon["nombre"], archivo):
+                avisar(f"\nAVISO: {pokemon['nombre']} ya existe en {archivo}. No se duplicará.", file=sys.stderr)
+                return
 
-        # Escribir o crear CSV
-        try:
-            with open(archivo, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=CAMPOS)
+            sello_previo = sello_csv(archivo)
+
+            # Actualizar encabezados de versiones anteriores antes de agregar filas
+            migrar_encabezado_csv(archivo)
+
+            # Escribir o crear CSV
+            try:
+                with open(archivo, "a", newline="", encoding="utf-8") as f:
+                    contar("csv.archivos_abiertos")
+                    writer = csv.DictWriter(f, fieldnames=CAMPOS)
+                    
+                    # Escribir encabezado si el archivo está vacío
+                    if f.tell() == 0:
+                        writer.writeheader()
+                    
+                    # Asegurar que todos los campos existan en el diccionario
+                    pokemon_completo = {campo: pokemon.get(campo, "") for campo in CAMPOS}
+                    writer.writerow(pokemon_completo)
+
+                # Mantener el índice en memoria al día (con valores como en el CSV)
+                if indice_activo(os.path.normpath(base_dir)):
+                    registrar_pokemon({campo: str(valor) for campo, valor in pokemon_completo.items()})
+                    renovar_sello(ruta_particion(pokemon), sello_previo, sello_csv(archivo))
+                incrementar_version()
+                descartar_instantanea(base_dir)
+
+                avisar(f"\n✓ Pokémon agregado correctamente:")
+                avisar(f"Archivo: {archivo}")
+                avisar(f"Datos guardados:")
+                for campo in CAMPOS:
+                    valor = pokemon.get(campo, "—")
+                    avisar(f"  {campo}: {valor}")
+                avisar("-" * 40)
                 
-                # Escribir encabezado si el archivo está vacío
-                if f.tell() == 0:
-                    writer.writeheader()
+            except IOError as e:
+                avisar(f"\nAVISO: Error al escribir en el archivo {archivo}: {e}", file=sys.stderr)
+            except csv.Error as e:
+                avisar(f"\nAVISO: Error de CSV al guardar: {e}", file=sys.stderr)
                 
-                # Asegurar que todos los campos existan en el diccionario
-                pokemon_completo = {campo: pokemon.get(campo, "") for campo in CAMPOS}
-                writer.writerow(pokemon_completo)
-
-            print(f"\n✓ Pokémon agregado correctamente:")
-            print(f"Archivo: {archivo}")
-            print(f"Datos guardados:")
-            for campo in CAMPOS:
-                valor = pokemon.get(campo, "—")
-                print(f"  {campo}: {valor}")
-            print("-" * 40)
+        except Exception as e:
+            avisar(f"\nAVISO: Error inesperado al guardar Pokémon: {e}", file=sys.stderr)
+
+
+def migrar_encabezado_csv(archivo):
+    """
+    Reescribe un CSV con los CAMPOS actuales si su encabezado es de una versión anterior.
+    Las columnas nuevas quedan vacías en las filas existentes.
+    
+    Args:
+        archivo: Ruta del archivo CSV
+        
+    Returns:
+        bool: True si el archivo fue migrado
+    """
+    try:
+        if not isinstance(archivo, str) or not os.path.isfile(archivo):
+            return False
+        
+        with open(archivo, newline="", encoding="utf-8") as f:
+            contar("csv.archivos_abiertos")
+            encabezado = next(csv.reader(f), None)
             
-        except IOError as e:
-            print(f"\nAVISO: Error al escribir en el archivo {archivo}: {e}")
-        except csv.Error as e:
-            print(f"\nAVISO: Error de CSV al guardar: {e}")
+            # Archivo vacío o ya actualizado
+            if not encabezado or encabezado == CAMPOS:
+                return False
             
-    except Exception as e:
-        print(f"\nAVISO: Error inesperado al guardar Pokémon: {e}")
+            f.seek(0)
+            filas = list(csv.DictReader(f))
+            contar("csv.filas_leidas", len(filas))
+        
+        with open(archivo, "w", newline="", encoding="utf-8") as f:
+            contar("csv.archivos_abiertos")
+            writer = csv.DictWriter(f, fieldnames=CAMPOS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(filas)
+        
+        return True
+        
+    except IOError as e:
+        print(f"\nAVISO: Error al migrar el archivo {archivo}: {e}", file=sys.stderr)
+        return False
+    except csv.Error as e:
+        print(f"\nAVISO: Error de CSV al migrar {archivo}: {e}", file=sys.stderr)
+        return False
 
 
 def existe_pokemon_en_csv(nombre, archivo):
@@ -120,30 +246,37 @@ def existe_pokemon_en_csv(nombre, archivo):
         if not os.path.isfile(archivo):
             return False
 
-        with open(archivo, newline="", encoding="utf-8") as f:
+        with lectura(BLOQUEO_POKEDEX), open(archivo, newline="", encoding="utf-8") as f:
+            contar("csv.archivos_abiertos")
             reader = csv.DictReader(f)
+            leidas = 0
             
-            for row in reader:
-                # Validar que row sea un diccionario
-                if not isinstance(row, dict):
-                    continue
-                
-                nombre_row = row.get("nombre", "")
-                
-                # Validar y comparar nombres
-                if isinstance(nombre_row, str) and nombre_row.lower() == nombre.lower():
-                    return True
+            try:
+                for row in reader:
+                    leidas += 1
+                    
+                    # Validar que row sea un diccionario
+                    if not isinstance(row, dict):
+                        continue
+                    
+                    nombre_row = row.get("nombre", "")
+                    
+                    # Validar y comparar nombres
+                    if isinstance(nombre_row, str) and nombre_row.lower() == nombre.lower():
+                        return True
+            finally:
+                contar("csv.filas_leidas", leidas)
         
         return False
         
     except IOError as e:
-        print(f"\nAVISO: Error al leer archivo {archivo}: {e}")
+        print(f"\nAVISO: Error al leer archivo {archivo}: {e}", file=sys.stderr)
         return False
     except csv.Error as e:
-        print(f"\nAVISO: Error de CSV: {e}")
+        print(f"\nAVISO: Error de CSV: {e}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"\nAVISO: Error inesperado al verificar existencia: {e}")
+        print(f"\nAVISO: Error inesperado al verificar existencia: {e}", file=sys.stderr)
         return False
 
 
@@ -156,74 +289,254 @@ def leer_recursivo(ruta):
         - Caso base: Lee archivos .csv
         - Paso recursivo: Entra a subcarpetas
     
+    La lista se arma en una sola pasada consumiendo iterar_recursivo(),
+    sin copiar listas parciales en cada nivel de la recursión.
+    
     Args:
         ruta: Directorio raíz desde donde leer
     
     Returns:
         list: Lista de diccionarios con datos de Pokémon
     """
+    try:
+        return list(iterar_recursivo(ruta))
+        
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado en lectura recursiva: {e}", file=sys.stderr)
+        return []
+
+
+def iterar_recursivo(ruta):
+    """
+    Versión perezosa de leer_recursivo: entrega los Pokémon uno a uno
+    a medida que se leen los CSV, sin acumular más de un CSV en memoria.
+    
+    Recursión:
+        - Caso base: Lee archivos .csv fila por fila
+        - Paso recursivo: Entra a subcarpetas (yield from)
+    
+    Args:
+        ruta: Directorio raíz desde donde leer
+    
+    Yields:
+        dict: Datos de un Pokémon
+    """
     try:
         # Validar que ruta sea un string
         if not isinstance(ruta, str) or not ruta.strip():
-            return []
-        
-        # Verificar que la ruta existe
-        if not os.path.exists(ruta):
-            return []
+            return
         
-        # Verificar que sea un directorio
+        # Verificar que la ruta existe y sea un directorio
         if not os.path.isdir(ruta):
-            return []
+            return
         
-        datos = []
-
         try:
             elementos = os.listdir(ruta)
         except PermissionError:
-            print(f"\nAVISO: Sin permisos para acceder a: {ruta}")
-            return []
+            print(f"\nAVISO: Sin permisos para acceder a: {ruta}", file=sys.stderr)
+            return
         except OSError as e:
-            print(f"\nAVISO: Error al listar {ruta}: {e}")
-            return []
-
+            print(f"\nAVISO: Error al listar {ruta}: {e}", file=sys.stderr)
+            return
+        
         for elemento in elementos:
-            try:
-                ruta_completa = os.path.join(ruta, elemento)
-
-                if os.path.isdir(ruta_completa):
-                    # Paso recursivo: explorar subdirectorio
-                    datos.extend(leer_recursivo(ruta_completa))
-                    
-                elif ruta_completa.endswith(".csv"):
-                    # Caso base: leer archivo CSV
-                    try:
-                        with open(ruta_completa, newline="", encoding="utf-8") as f:
-                            reader = csv.DictReader(f)
-                            
-                            for row in reader:
-                                # Validar que row sea un diccionario
-                                if isinstance(row, dict):
-                                    datos.append(row)
-                                    
-                    except IOError as e:
-                        print(f"\nAVISO: Error al leer {ruta_completa}: {e}")
-                    except csv.Error as e:
-                        print(f"\nAVISO: Error de CSV en {ruta_completa}: {e}")
+            ruta_completa = os.path.join(ruta, elemento)
+            
+            if os.path.isdir(ruta_completa):
+                # Paso recursivo: explorar subdirectorio
+                yield from iterar_recursivo(ruta_completa)
+                
+            elif ruta_completa.endswith(".csv"):
+                # Caso base: leer el archivo CSV con el bloqueo de lectura (para no verlo
+                # a medio escribir) y entregar sus filas después, ya sin el bloqueo
+                try:
+                    with lectura(BLOQUEO_POKEDEX), open(ruta_completa, newline="", encoding="utf-8") as f:
+                        contar("csv.archivos_abiertos")
+                        # Validar que cada fila sea un diccionario
+                        filas = [row for row in csv.DictReader(f) if isinstance(row, dict)]
+                        contar("csv.filas_leidas", len(filas))
                         
-            except Exception as e:
-                # Continuar con el siguiente elemento si hay error
-                continue
-
-        return datos
+                except IOError as e:
+                    print(f"\nAVISO: Error al leer {ruta_completa}: {e}", file=sys.stderr)
+                    continue
+                except csv.Error as e:
+                    print(f"\nAVISO: Error de CSV en {ruta_completa}: {e}", file=sys.stderr)
+                    continue
+                
+                yield from filas
         
     except RecursionError:
-        print("\nAVISO: Límite de recursión alcanzado")
+        print("\nAVISO: Límite de recursión alcanzado", file=sys.stderr)
+
+
+def leer_csv(archivo):
+    """
+    Lee un único CSV de la pokédex.
+    
+    Args:
+        archivo: Ruta del archivo CSV
+    
+    Returns:
+        list: Lista de diccionarios con datos de Pokémon
+    """
+    try:
+        with lectura(BLOQUEO_POKEDEX), open(archivo, newline="", encoding="utf-8") as f:
+            contar("csv.archivos_abiertos")
+            filas = [row for row in csv.DictReader(f) if isinstance(row, dict)]
+            contar("csv.filas_leidas", len(filas))
+            return filas
+    except IOError as e:
+        print(f"\nAVISO: Error al leer {archivo}: {e}", file=sys.stderr)
         return []
-    except Exception as e:
-        print(f"\nAVISO: Error inesperado en lectura recursiva: {e}")
+    except csv.Error as e:
+        print(f"\nAVISO: Error de CSV en {archivo}: {e}", file=sys.stderr)
         return []
 
 
+def cargar_particiones(ruta, particiones):
+    """
+    Lee al índice en memoria solo las particiones indicadas que aún no estén cargadas.
+    
+    Args:
+        ruta: Directorio base de la pokédex
+        particiones: Lista de rutas relativas de CSV (ej: "generation-i/fire/pokemon.csv")
+    
+    Returns:
+        bool: True si las particiones quedaron disponibles
+    """
+    if not isinstance(ruta, str) or not ruta.strip():
+        return False
+    
+    ruta = os.path.normpath(ruta)
+    refrescar_indice(ruta)
+    
+    # Todo cargado: no hace falta el bloqueo de escritura (se puede llamar leyendo)
+    if indice_activo(ruta) and all(particion_cargada(p) for p in particiones):
+        return True
+    
+    with escritura(BLOQUEO_POKEDEX):
+        try:
+            # Si el índice es de otra pokédex, empezar de nuevo
+            if not indice_activo(ruta):
+                reiniciar_indice(ruta)
+            
+            for particion in particiones:
+                if not particion_cargada(particion):
+                    archivo = os.path.join(ruta, *particion.split("/"))
+                    # El sello se toma antes de leer: si el CSV cambia mientras tanto, se relee
+                    sello = sello_csv(archivo)
+                    agregar_particion(particion, leer_csv(archivo), sello)
+            
+            return True
+            
+        except Exception as e:
+            print(f"\nAVISO: Error inesperado al cargar particiones: {e}", file=sys.stderr)
+            return False
+
+
+def sellos_en_disco(ruta):
+    """
+    Obtiene el sello de cada CSV de la pokédex según el manifiesto (listar_particiones,
+    que lo pone al día con lo que hay en disco).
+
+    Returns:
+        dict: {particion: (tamaño, mtime_ns)}
+    """
+    return {particion: (datos["tamano"], datos["mtime_ns"])
+            for particion, datos in listar_particiones(ruta).items()}
+
+
+def _particiones_desactualizadas(en_disco):
+    """
+    Particiones del índice cuyo sello no coincide con el del disco (cambiadas o
+    borradas) y, con el índice completo, las que aparecieron en disco.
+    """
+    sellos = INDICE["sellos"]
+    desactualizadas = [p for p in INDICE["particiones"] if sellos.get(p) != en_disco.get(p)]
+    if INDICE["cargado"]:
+        desactualizadas += [p for p in en_disco if p not in INDICE["particiones"]]
+    return desactualizadas
+
+
+def refrescar_indice(ruta):
+    """
+    Vuelve a leer al índice las particiones cuyo CSV cambió en disco desde que se
+    leyeron (por ejemplo, porque otro proceso escribió la pokédex) y quita las que ya
+    no existen. Compara el tamaño y la fecha de modificación de cada CSV según el
+    manifiesto con el sello guardado al leerlo. Se comprueba como mucho una vez cada
+    INTERVALO_VERIFICACION segundos, y no se hace si el hilo está leyendo (no podría
+    tomar la escritura).
+
+    Args:
+        ruta: Directorio base de la pokédex (normalizado)
+
+    Returns:
+        bool: True si se volvió a leer o se quitó alguna partición
+    """
+    if not indice_activo(ruta) or leyendo(BLOQUEO_POKEDEX):
+        return False
+
+    ahora = time.monotonic()
+    if ahora - VERIFICACION["ultima"] < INTERVALO_VERIFICACION:
+        return False
+    VERIFICACION["ultima"] = ahora
+
+    en_disco = sellos_en_disco(ruta)
+
+    with lectura(BLOQUEO_POKEDEX):
+        if not _particiones_desactualizadas(en_disco):
+            return False
+
+    with escritura(BLOQUEO_POKEDEX):
+        # Se vuelve a calcular con el bloqueo tomado: otro hilo pudo releerlas
+        desactualizadas = _particiones_desactualizadas(en_disco)
+        for particion in desactualizadas:
+            quitar_particion(particion)
+            archivo = os.path.join(ruta, *particion.split("/"))
+            sello = sello_csv(archivo)
+            if sello is not None:
+                agregar_particion(particion, leer_csv(archivo), sello)
+
+        if desactualizadas:
+            incrementar_version()
+        return bool(desactualizadas)
+
+
+def cargar_indice(ruta="pokedex"):
+    """
+    Carga en el índice en memoria todas las particiones de la Pokédex que falten.
+    Las lecturas siguientes se sirven desde memoria y las escrituras lo mantienen al día;
+    si ya estaba cargado, se vuelven a leer las particiones que cambiaron en disco.
+    
+    Args:
+        ruta: Directorio base de la pokédex
+    
+    Returns:
+        bool: True si el índice quedó disponible
+    """
+    try:
+        if not isinstance(ruta, str) or not ruta.strip():
+            return False
+        
+        ruta = os.path.normpath(ruta)
+        
+        if not indice_cargado(ruta):
+            # Se vuelve a consultar con el bloqueo tomado: otro hilo pudo cargarlo mientras tanto
+            with escritura(BLOQUEO_POKEDEX):
+                if not indice_cargado(ruta):
+                    if not cargar_particiones(ruta, list(listar_particiones(ruta))):
+                        return False
+                    INDICE["cargado"] = True
+        else:
+            refrescar_indice(ruta)
+        
+        return True
+        
+    except Exception as e:
+        print(f"\nAVISO: Error inesperado al cargar el índice: {e}", file=sys.stderr)
+        return False
+
+
 def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
     """
     Busca y modifica un Pokémon de forma recursiva en la estructura de directorios.
@@ -259,7 +572,9 @@ def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
         if os.path.isfile(ruta) and ruta.endswith(".csv"):
             try:
                 with open(ruta, newline="", encoding="utf-8") as f:
+                    contar("csv.archivos_abiertos")
                     data = list(csv.DictReader(f))
+                    contar("csv.filas_leidas", len(data))
                 
                 # Validar que data sea una lista
                 if not isinstance(data, list):
@@ -281,6 +596,7 @@ def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
                 
                 if modificado:
                     with open(ruta, "w", newline="", encoding="utf-8") as f:
+                        contar("csv.archivos_abiertos")
                         writer = csv.DictWriter(f, fieldnames=CAMPOS)
                         writer.writeheader()
                         writer.writerows(data)
@@ -290,10 +606,10 @@ def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
                 return False
                 
             except IOError as e:
-                print(f"\nAVISO: Error al acceder al archivo {ruta}: {e}")
+                print(f"\nAVISO: Error al acceder al archivo {ruta}: {e}", file=sys.stderr)
                 return False
             except csv.Error as e:
-                print(f"\nAVISO: Error de CSV en {ruta}: {e}")
+                print(f"\nAVISO: Error de CSV en {ruta}: {e}", file=sys.stderr)
                 return False
         
         # Paso recursivo: explorar subdirectorios
@@ -301,10 +617,10 @@ def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
             try:
                 elementos = os.listdir(ruta)
             except PermissionError:
-                print(f"\nAVISO: Sin permisos para acceder a: {ruta}")
+                print(f"\nAVISO: Sin permisos para acceder a: {ruta}", file=sys.stderr)
                 return False
             except OSError as e:
-                print(f"\nAVISO: Error al listar {ruta}: {e}")
+                print(f"\nAVISO: Error al listar {ruta}: {e}", file=sys.stderr)
                 return False
             
             for elemento in elementos:
@@ -318,13 +634,27 @@ def buscar_y_modificar_recursivo(ruta, nombre, campo, nuevo_valor):
         return False
         
     except RecursionError:
-        print("\nAVISO: Límite de recursión alcanzado")
+        print("\nAVISO: Límite de recursión alcanzado", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"\nAVISO: Error inesperado al modificar: {e}")
+        print(f"\nAVISO: Error inesperado al modificar: {e}", file=sys.stderr)
         return False
 
 
+def sello_de_pokemon(ruta_base, nombre):
+    """
+    Obtiene la partición donde el índice tiene a un Pokémon y el sello actual de su CSV,
+    para renovarlo después de modificarlo o eliminarlo.
+
+    Returns:
+        tuple: (particion, sello); (None, None) si no está en el índice
+    """
+    particion = INDICE["particion_de"].get(nombre.strip().lower())
+    if particion is None:
+        return None, None
+    return particion, sello_csv(os.path.join(ruta_base, *particion.split("/")))
+
+
 # UPDATE
 def modificar_pokemon(nombre, campo, nuevo_valor, ruta_base="pokedex"):
     """
@@ -339,29 +669,39 @@ def modificar_pokemon(nombre, campo, nuevo_valor, ruta_base="pokedex"):
     Returns:
         bool: True si se modificó exitosamente
     """
-    try:
-        # Validar parámetros
-        if not isinstance(nombre, str) or not nombre.strip():
-            print("\nAVISO: Nombre inválido")
-            return False
-        
-        if not isinstance(campo, str) or not campo.strip():
-            print("\nAVISO: Campo inválido")
+    with escritura(BLOQUEO_POKEDEX):
+        try:
+            # Validar parámetros
+            if not isinstance(nombre, str) or not nombre.strip():
+                print("\nAVISO: Nombre inválido", file=sys.stderr)
+                return False
+            
+            if not isinstance(campo, str) or not campo.strip():
+                print("\nAVISO: Campo inválido", file=sys.stderr)
+                return False
+            
+            if not isinstance(ruta_base, str) or not ruta_base.strip():
+                print("\nAVISO: Ruta base inválida", file=sys.stderr)
+                return False
+            
+            particion, sello_previo = sello_de_pokemon(ruta_base, nombre)
+
+            if buscar_y_modificar_recursivo(ruta_base, nombre, campo, nuevo_valor):
+                if indice_activo(os.path.normpath(ruta_base)):
+                    actualizar_campo(nombre, campo, str(nuevo_valor))
+                    if particion is not None:
+                        archivo = os.path.join(ruta_base, *particion.split("/"))
+                        renovar_sello(particion, sello_previo, sello_csv(archivo))
+                incrementar_version()
+                descartar_instantanea(ruta_base)
+                return True
+            
+            print("\nAVISO: Pokémon no encontrado.", file=sys.stderr)
             return False
-        
-        if not isinstance(ruta_base, str) or not ruta_base.strip():
-            print("\nAVISO: Ruta base inválida")
+            
+        except Exception as e:
+            print(f"\nAVISO: Error inesperado al modificar Pokémon: {e}", file=sys.stderr)
             return False
-        
-        if buscar_y_modificar_recursivo(ruta_base, nombre, campo, nuevo_valor):
-            return True
-        
-        print("\nAVISO: Pokémon no encontrado.")
-        return False
-        
-    except Exception as e:
-        print(f"\nAVISO: Error inesperado al modificar Pokémon: {e}")
-        return False
 
 
 def eliminar_pokemon_recursivo(ruta, nombre):
@@ -391,7 +731,9 @@ def eliminar_pokemon_recursivo(ruta, nombre):
         if os.path.isfile(ruta) and ruta.endswith(".csv"):
             try:
                 with open(ruta, newline="", encoding="utf-8") as f:
+                    contar("csv.archivos_abiertos")
                     data = list(csv.DictReader(f))
+                    contar("csv.filas_leidas", len(data))
                 
                 # Validar que data sea una lista
                 if not isinstance(data, list):
@@ -408,6 +750,7 @@ def eliminar_pokemon_recursivo(ruta, nombre):
                 # Si se eliminó algún registro
                 if len(nueva_lista) != len(data):
                     with open(ruta, "w", newline="", encoding="utf-8") as f:
+                        contar("csv.archivos_abiertos")
                         writer = csv.DictWriter(f, fieldnames=CAMPOS)
                         writer.writeheader()
                         writer.writerows(nueva_lista)
@@ -418,10 +761,10 @@ def eliminar_pokemon_recursivo(ruta, nombre):
                 return False
                 
             except IOError as e:
-                print(f"\nAVISO: Error al acceder al archivo {ruta}: {e}")
+                print(f"\nAVISO: Error al acceder al archivo {ruta}: {e}", file=sys.stderr)
                 return False
             except csv.Error as e:
-                print(f"\nAVISO: Error de CSV en {ruta}: {e}")
+                print(f"\nAVISO: Error de CSV en {ruta}: {e}", file=sys.stderr)
                 return False
         
         # Paso recursivo: explorar subdirectorios
@@ -429,10 +772,10 @@ def eliminar_pokemon_recursivo(ruta, nombre):
             try:
                 elementos = os.listdir(ruta)
             except PermissionError:
-                print(f"\nAVISO: Sin permisos para acceder a: {ruta}")
+                print(f"\nAVISO: Sin permisos para acceder a: {ruta}", file=sys.stderr)
                 return False
             except OSError as e:
-                print(f"\nAVISO: Error al listar {ruta}: {e}")
+                print(f"\nAVISO: Error al listar {ruta}: {e}", file=sys.stderr)
                 return False
             
             for elemento in elementos:
@@ -446,10 +789,10 @@ def eliminar_pokemon_recursivo(ruta, nombre):
         return False
         
     except RecursionError:
-        print("\nAVISO: Límite de recursión alcanzado")
+        print("\nAVISO: Límite de recursión alcanzado", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"\nAVISO: Error inesperado al eliminar: {e}")
+        print(f"\nAVISO: Error inesperado al eliminar: {e}", file=sys.stderr)
         return False
 
 
@@ -465,18 +808,31 @@ def eliminar_pokemon(nombre, ruta="pokedex"):
     Returns:
         bool: True si se eliminó exitosamente
     """
-    try:
-        # Validar parámetros
-        if not isinstance(nombre, str) or not nombre.strip():
-            print("\nAVISO: Nombre inválido")
-            return False
-        
-        if not isinstance(ruta, str) or not ruta.strip():
-            print("\nAVISO: Ruta inválida")
+    with escritura(BLOQUEO_POKEDEX):
+        try:
+            # Validar parámetros
+            if not isinstance(nombre, str) or not nombre.strip():
+                print("\nAVISO: Nombre inválido", file=sys.stderr)
+                return False
+            
+            if not isinstance(ruta, str) or not ruta.strip():
+                print("\nAVISO: Ruta inválida", file=sys.stderr)
+                return False
+            
+            particion, sello_previo = sello_de_pokemon(ruta, nombre)
+
+            if eliminar_pokemon_recursivo(ruta, nombre):
+                if indice_activo(os.path.normpath(ruta)):
+                    quitar_pokemon(nombre)
+                    if particion is not None:
+                        archivo = os.path.join(ruta, *particion.split("/"))
+                        renovar_sello(particion, sello_previo, sello_csv(archivo))
+                incrementar_version()
+                descartar_instantanea(ruta)
+                return True
+
             return False
-        
-        return eliminar_pokemon_recursivo(ruta, nombre)
-        
-    except Exception as e:
-        print(f"\nAVISO: Error inesperado al eliminar Pokémon: {e}")
-        return False
\ No newline at end of file
+            
+        except Exception as e:
+            print(f"\nAVISO: Error inesperado al eliminar Pokémon: {e}", file=sys.stderr)
+            return False
\ No newline at end of file
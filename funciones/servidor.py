@@ -0,0 +1,480 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from .persistencia import cargar_indice
+from .concurrencia import con_lectura
+from .indice import (INDICE, ORDENES, version_datos, ordenar_pokemon, pokemon_de_particiones,
+                     pokemon_de_tipos, tipos_de, resolver_nombre, pokemon_por_id)
+from .busqueda import buscar_pokemon_por_similitud, buscar_por_habilidad, buscar_por_id
+from .columnas import calcular_estadisticas
+from .metricas import contar, metricas_activas, resumen_metricas
+from .instantanea import (
+    adjuntar_instantanea, instantanea_adjunta, sello_instantanea, total_instantanea, iterar_instantanea,
+    filas_instantanea, particiones_de_generacion_instantanea, pokemon_en_rango_id_instantanea,
+    resolver_nombre_instantanea
+)
+
+# Modo servidor: expone la Pokédex como una API JSON de solo lectura.
+# Todas las respuestas salen del índice en memoria (se carga al iniciar y se vuelven
+# a leer solo las particiones que cambian en disco). Cada respuesta lleva un ETag que
+# es un hash de su cuerpo, así que sigue valiendo si se reinicia el servidor y cambia
+# en cuanto cambian los datos que muestra: si el cliente lo manda en If-None-Match,
+# se responde 304 sin cuerpo (la respuesta sale de la caché si no hubo escrituras).
+#
+#   GET /pokemon?pagina=1&por_pagina=20&orden=1     listado paginado
+#   GET /pokemon/<nombre o ID>                       un Pokémon
+#   GET /filtrar?tipo=fire[,flying]&generacion=generation-i&orden=3
+#   GET /buscar?q=pika&modo=nombre|habilidad|id&umbral=60
+#   GET /estadisticas
+#   GET /metricas                                    contadores y latencias (con --metricas)
+#
+# Con `servir --instantanea` (varios procesos servidores en el mismo equipo) las
+# consultas se responden desde la instantánea compartida por mmap (instantanea.py) y
+# no desde un índice propio: antes de cada consulta se comprueba si se publicó otra
+# (o si hace falta publicarla tras una escritura) y la caché se guarda con su sello.
+
+BASE_DIR = "pokedex"  # la búsqueda trabaja sobre esta carpeta
+
+# Origen de las consultas: el índice en memoria o la instantánea compartida
+MODO = {"instantanea": False}
+
+POR_PAGINA = 20
+MAXIMO_POR_PAGINA = 100
+
+# Caché de respuestas ya serializadas: clave de consulta -> (versión, código, cuerpo, ETag)
+RESPUESTAS = OrderedDict()
+MAXIMO_RESPUESTAS = 256
+BLOQUEO_RESPUESTAS = threading.Lock()
+
+
+def entero_parametro(parametros, nombre, defecto, minimo, maximo):
+    """
+    Lee un parámetro entero de la consulta y lo limita al rango indicado.
+
+    Args:
+        parametros: dict {nombre: [valores]} de parse_qs
+        nombre: Nombre del parámetro
+        defecto: Valor si el parámetro no está
+        minimo / maximo: Rango permitido
+
+    Returns:
+        int: Valor del parámetro
+
+    Raises:
+        ValueError: Si el parámetro no es un número entero
+    """
+    valor = parametros.get(nombre, [str(defecto)])[0].strip()
+    if not valor.lstrip("-").isdigit():
+        raise ValueError(f"El parámetro '{nombre}' debe ser un número entero")
+    return max(minimo, min(maximo, int(valor)))
+
+
+def paginar_resultados(filas, total, parametros):
+    """
+    Arma una página de resultados. Solo se recorren las filas hasta el final de la página.
+
+    Args:
+        filas: Iterable de resultados (lista o iterador)
+        total: Cantidad total de resultados
+        parametros: dict de la consulta (pagina, por_pagina)
+
+    Returns:
+        dict: {total, pagina, por_pagina, paginas, resultados}
+    """
+    por_pagina = entero_parametro(parametros, "por_pagina", POR_PAGINA, 1, MAXIMO_POR_PAGINA)
+    paginas = max(1, (total + por_pagina - 1) // por_pagina)
+    pagina = entero_parametro(parametros, "pagina", 1, 1, paginas)
+    inicio = (pagina - 1) * por_pagina
+
+    return {
+        "total": total,
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "paginas": paginas,
+        "resultados": list(islice(filas, inicio, inicio + por_pagina)),
+    }
+
+
+def orden_parametro(parametros):
+    """
+    Devuelve la opción de ORDENES pedida en la consulta o None.
+
+    Raises:
+        ValueError: Si el orden no es una opción válida
+    """
+    orden = parametros.get("orden", [""])[0].strip()
+    if orden and orden not in ORDENES:
+        raise ValueError(f"Orden inválido (usa: {', '.join(sorted(ORDENES))})")
+    return orden or None
+
+
+def ordenar_si_corresponde(filas, orden, completa=False):
+    if orden is None:
+        return filas
+    criterio, descendente, _ = ORDENES[orden]
+    return ordenar_pokemon(filas, criterio, descendente, completa)
+
+
+@con_lectura
+def consulta_listar(parametros):
+    """
+    GET /pokemon: listado de toda la Pokédex.
+    """
+    orden = orden_parametro(parametros)
+
+    if instantanea_adjunta():
+        # Solo se decodifican las filas de la página pedida
+        return 200, paginar_resultados(filas_instantanea(orden), total_instantanea(), parametros)
+
+    registros = INDICE["registros"]
+
+    if orden is None:
+        # Sin orden se recorre el índice directamente, sin copiarlo
+        return 200, paginar_resultados(iter(registros.values()), len(registros), parametros)
+
+    filas = ordenar_si_corresponde(list(registros.values()), orden, completa=True)
+    return 200, paginar_resultados(filas, len(filas), parametros)
+
+
+def consulta_pokemon(identificador):
+    """
+    GET /pokemon/<nombre o ID>: un Pokémon por nombre (o nombre localizado) o por ID.
+    """
+    identificador = identificador.strip()
+
+    if instantanea_adjunta():
+        if identificador.isdigit():
+            encontrados = pokemon_en_rango_id_instantanea(identificador, identificador)
+            pokemon = encontrados[0] if encontrados else None
+        else:
+            pokemon = resolver_nombre_instantanea(identificador)
+    elif identificador.isdigit():
+        encontrados = pokemon_por_id(identificador)
+        pokemon = encontrados[0] if encontrados else None
+    else:
+        pokemon = resolver_nombre(identificador)
+
+    if pokemon is None:
+        return 404, {"error": f"No existe el Pokémon '{identificador}'"}
+    return 200, pokemon
+
+
+@con_lectura
+def consulta_filtrar(parametros):
+    """
+    GET /filtrar: Pokémon de una generación y/o con uno o dos tipos.
+    """
+    generacion = parametros.get("generacion", [""])[0].strip().lower()
+    tipos = [t.strip().lower() for valor in parametros.get("tipo", []) for t in valor.split(",") if t.strip()]
+
+    if not generacion and not tipos:
+        return 400, {"error": "Indica 'generacion' y/o 'tipo'"}
+    if len(tipos) > 2:
+        return 400, {"error": "Se pueden indicar como máximo dos tipos"}
+
+    orden = orden_parametro(parametros)
+
+    if instantanea_adjunta():
+        particiones = particiones_de_generacion_instantanea(generacion) if generacion else None
+        filas = [p for p in filas_instantanea(orden, particiones) if all(t in tipos_de(p) for t in tipos)]
+        return 200, paginar_resultados(filas, len(filas), parametros)
+
+    if generacion:
+        # Las particiones cargadas en el índice ya están separadas por generación
+        particiones = [p for p in INDICE["particiones"] if p.split("/")[0] == generacion]
+        filas = pokemon_de_particiones(particiones)
+        if tipos:
+            filas = [p for p in filas if all(t in tipos_de(p) for t in tipos)]
+    else:
+        filas = pokemon_de_tipos(tipos)
+
+    filas = ordenar_si_corresponde(filas, orden)
+    return 200, paginar_resultados(filas, len(filas), parametros)
+
+
+def consulta_buscar(parametros):
+    """
+    GET /buscar: búsqueda difusa por nombre o habilidad, o por ID / rango de IDs.
+    """
+    termino = parametros.get("q", [""])[0].strip()
+    modo = parametros.get("modo", ["nombre"])[0].strip().lower()
+    umbral = entero_parametro(parametros, "umbral", 60, 0, 100)
+
+    if modo not in ("nombre", "habilidad", "id"):
+        return 400, {"error": "Modo inválido (usa: nombre, habilidad, id)"}
+
+    if modo == "id":
+        filas = buscar_por_id(termino)
+        if filas is None:
+            return 400, {"error": "Ingresa un número (ej: 25) o un rango (ej: 1-151)"}
+
+    elif len(termino) < 3:
+        return 400, {"error": "Debes ingresar al menos 3 caracteres para buscar"}
+
+    elif modo == "habilidad":
+        # Un Pokémon puede aparecer por varias habilidades: se queda la más parecida
+        vistos = set()
+        filas = []
+        for pokemon, habilidad, similitud in buscar_por_habilidad(termino, umbral):
+            if id(pokemon) not in vistos:
+                vistos.add(id(pokemon))
+                filas.append({**pokemon, "habilidad": habilidad, "similitud": similitud})
+
+    else:
+        filas = [{**pokemon, "similitud": similitud}
+                 for pokemon, similitud in buscar_pokemon_por_similitud(termino, umbral)]
+
+    return 200, paginar_resultados(filas, len(filas), parametros)
+
+
+@con_lectura
+def consulta_estadisticas(parametros):
+    """
+    GET /estadisticas: las mismas estadísticas del menú, calculadas desde el índice
+    (o desde la instantánea adjunta).
+    """
+    if instantanea_adjunta():
+        return 200, calcular_estadisticas(iterar_instantanea())
+    return 200, calcular_estadisticas(INDICE["registros"].values())
+
+
+# Rutas con parámetros en la consulta: ruta -> función(parametros) -> (código, datos)
+RUTAS = {
+    "/pokemon": consulta_listar,
+    "/filtrar": consulta_filtrar,
+    "/buscar": consulta_buscar,
+    "/estadisticas": consulta_estadisticas,
+}
+
+
+def resolver_consulta(ruta, parametros):
+    """
+    Ejecuta la consulta que corresponde a la ruta.
+
+    Returns:
+        tuple: (código HTTP, datos serializables a JSON)
+    """
+    try:
+        if ruta.startswith("/pokemon/"):
+            return consulta_pokemon(unquote(ruta[len("/pokemon/"):]))
+
+        if ruta not in RUTAS:
+            return 404, {"error": f"Ruta desconocida: {ruta}", "rutas": sorted(RUTAS) + ["/pokemon/<nombre o ID>"]}
+
+        return RUTAS[ruta](parametros)
+
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+def clave_consulta(ruta, parametros):
+    """
+    Normaliza una consulta (ruta + parámetros ordenados) para usarla como clave.
+    """
+    ruta = ruta.rstrip("/") or "/"
+    partes = [f"{nombre}={valor}" for nombre in sorted(parametros) for valor in parametros[nombre]]
+    return ruta + "?" + "&".join(partes)
+
+
+def etag_de(cuerpo):
+    """
+    ETag de una respuesta: hash de su cuerpo. A diferencia de la versión de los datos
+    (que vuelve a empezar en cada proceso), solo coincide si el contenido es el mismo.
+    """
+    return f'"{hashlib.blake2b(cuerpo, digest_size=16).hexdigest()}"'
+
+
+def etag_coincide(encabezado, etag):
+    """
+    Indica si un encabezado If-None-Match incluye el ETag de la respuesta.
+    Es "*" o una lista de ETags separados por comas; la comparación es débil
+    (W/"x" coincide con "x"), como pide HTTP para If-None-Match.
+
+    Args:
+        encabezado: Valor de If-None-Match (None si no vino)
+        etag: ETag de la respuesta actual (entre comillas)
+
+    Returns:
+        bool: True si el cliente ya tiene esa respuesta
+    """
+    if not encabezado:
+        return False
+
+    for candidato in encabezado.split(","):
+        candidato = candidato.strip()
+        if candidato == "*":
+            return True
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == etag:
+            return True
+
+    return False
+
+
+def a_json(valor):
+    # Los resúmenes numéricos pueden traer escalares de numpy
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+
+def obtener_respuesta(ruta, parametros):
+    """
+    Devuelve la respuesta de una consulta, desde la caché si los datos no cambiaron.
+
+    Returns:
+        tuple: (código HTTP, ETag, cuerpo en bytes)
+    """
+    clave = clave_consulta(ruta, parametros)
+
+    # La versión se toma antes de calcular: si hay una escritura mientras tanto, la
+    # respuesta queda con una versión vieja y el cliente la vuelve a pedir completa
+    if MODO["instantanea"] and adjuntar_instantanea(BASE_DIR):
+        version = ("instantanea", sello_instantanea())
+    else:
+        cargar_indice(BASE_DIR)
+        version = version_datos()
+
+    with BLOQUEO_RESPUESTAS:
+        guardada = RESPUESTAS.get(clave)
+        if guardada is not None and guardada[0] == version:
+            contar("servidor.cache_aciertos")
+            RESPUESTAS.move_to_end(clave)
+            return guardada[1], guardada[3], guardada[2]
+
+    contar("servidor.cache_fallos")
+
+    # Las consultas toman el bloqueo de lectura: varias se atienden a la vez
+    codigo, datos = resolver_consulta(ruta.rstrip("/") or "/", parametros)
+    cuerpo = json.dumps(datos, ensure_ascii=False, default=a_json).encode("utf-8")
+    etag = etag_de(cuerpo)
+
+    with BLOQUEO_RESPUESTAS:
+        RESPUESTAS[clave] = (version, codigo, cuerpo, etag)
+        RESPUESTAS.move_to_end(clave)
+        while len(RESPUESTAS) > MAXIMO_RESPUESTAS:
+            RESPUESTAS.popitem(last=False)
+
+    return codigo, etag, cuerpo
+
+
+class ManejadorPokedex(BaseHTTPRequestHandler):
+    """
+    Atiende las consultas GET de la API (un hilo por conexión).
+    """
+    server_version = "Pokedex/1.0"
+
+    def do_GET(self):
+        try:
+            partes = urlsplit(self.path)
+            ruta = partes.path.rstrip("/") or "/"
+            parametros = parse_qs(partes.query)
+
+            # Métricas: cambian en cada consulta, así que no pasan por la caché ni llevan ETag
+            if ruta == "/metricas":
+                if metricas_activas():
+                    self.responder_json(200, resumen_metricas())
+                else:
+                    self.responder_json(404, {"error": "Métricas desactivadas (iniciar con --metricas)"})
+                return
+
+            codigo, etag, cuerpo = obtener_respuesta(ruta, parametros)
+
+            # Revalidación: el cliente ya tiene este mismo cuerpo -> 304
+            if codigo == 200 and etag_coincide(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                return
+
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            if codigo == 200:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente cerró la conexión antes de recibir la respuesta
+            pass
+        except Exception as e:
+            print(f"\nAVISO: Error inesperado al atender {self.path}: {e}")
+            try:
+                self.send_error(500, "Error interno")
+            except Exception:
+                pass
+
+    def responder_json(self, codigo, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        if not self.server.silencioso:
+            super().log_message(formato, *args)
+
+
+def crear_servidor(host="127.0.0.1", puerto=8000, silencioso=False, instantanea=False):
+    """
+    Carga el índice (o adjunta la instantánea) y crea el servidor HTTP (sin empezar a atender).
+
+    Args:
+        host: Dirección donde escuchar
+        puerto: Puerto TCP (0 = uno libre)
+        silencioso: True para no registrar cada consulta en la consola
+        instantanea: True para responder desde la instantánea compartida
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever(), o None si no se pudo crear
+    """
+    try:
+        MODO["instantanea"] = instantanea
+        if not (instantanea and adjuntar_instantanea(BASE_DIR)):
+            cargar_indice(BASE_DIR)
+
+        servidor = ThreadingHTTPServer((host, puerto), ManejadorPokedex)
+        servidor.daemon_threads = True
+        servidor.silencioso = silencioso
+        return servidor
+
+    except OSError as e:
+        print(f"\nAVISO: No se pudo abrir el puerto {puerto}: {e}")
+        return None
+
+
+def servir(host="127.0.0.1", puerto=8000, silencioso=False, instantanea=False):
+    """
+    Atiende la API JSON hasta que se interrumpa con Ctrl+C.
+
+    Returns:
+        bool: True si el servidor se detuvo normalmente
+    """
+    servidor = crear_servidor(host, puerto, silencioso, instantanea)
+    if servidor is None:
+        return False
+
+    host, puerto = servidor.server_address[:2]
+    if instantanea_adjunta():
+        print(f"Sirviendo la Pokédex ({total_instantanea()} Pokémon, instantánea compartida) en http://{host}:{puerto}")
+    else:
+        print(f"Sirviendo la Pokédex ({len(INDICE['registros'])} Pokémon) en http://{host}:{puerto}")
+    print("Presiona Ctrl+C para detener.")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo el servidor...")
+    finally:
+        servidor.server_close()
+
+    return True
@@ -1,7 +1,25 @@
+import time
+
+# Momento de inicio, antes de importar los módulos del sistema (para medir el arranque)
+INICIO = time.perf_counter()
+
+import sys
 from funciones.crud import agregar_pokemon, mostrar_todos, buscar_pokemon, editar_pokemon, borrar_pokemon, estadisticas
-from funciones.carga_automatica import precargar_pokemon
+from funciones.carga_automatica import iniciar_precarga_en_segundo_plano, texto_progreso_precarga, detener_precarga
 from funciones.filtros import filtrar_por_generacion, filtrar_por_tipo
 from funciones.menu import menu
+from funciones.cli import ejecutar_cli
+from funciones.metricas import medir
+from funciones.perfilado import perfilar
+
+
+def ejecutar_accion(accion):
+    """
+    Ejecuta una opción del menú, registrando su duración (con --metricas)
+    y su perfil de CPU y memoria (con --perfilar DIR).
+    """
+    with medir(f"menu.{accion.__name__}"), perfilar(accion.__name__):
+        accion()
 
 
 def main():
@@ -10,17 +28,19 @@ def main():
     Maneja el ciclo principal del menú y las excepciones globales.
     """
     try:
-        # Precarga automática al iniciar
+        # Precarga automática al iniciar (en segundo plano: el menú se puede usar enseguida)
         print("\n" + "="*70)
         print("Iniciando Pokédex")
         print("="*70)
         
-        precargar_pokemon()
+        iniciar_precarga_en_segundo_plano()
+        
+        print(f"Pokédex lista en {(time.perf_counter() - INICIO) * 1000:.0f} ms")
         
         # Ciclo principal del menú
         while True:
             try:
-                opcion = menu()
+                opcion = menu(texto_progreso_precarga())
                 
                 # Validar que se ingresó algo
                 if not opcion:
@@ -41,21 +61,21 @@ def main():
 
                 match opcion_int:
                     case 1:
-                        agregar_pokemon()
+                        ejecutar_accion(agregar_pokemon)
                     case 2:
-                        mostrar_todos()
+                        ejecutar_accion(mostrar_todos)
                     case 3:
-                        buscar_pokemon()
+                        ejecutar_accion(buscar_pokemon)
                     case 4:
-                        filtrar_por_generacion()
+                        ejecutar_accion(filtrar_por_generacion)
                     case 5:
-                        filtrar_por_tipo()
+                        ejecutar_accion(filtrar_por_tipo)
                     case 6:
-                        editar_pokemon()
+                        ejecutar_accion(editar_pokemon)
                     case 7:
-                        borrar_pokemon()
+                        ejecutar_accion(borrar_pokemon)
                     case 8:
-                        estadisticas()
+                        ejecutar_accion(estadisticas)
                     case 9:
                         print("\n✓ Cerrando sesión de Pokédex...")
                         print("✓ Apagando Pokédex......")
@@ -105,12 +125,18 @@ def main():
     
     finally:
         # Este bloque siempre se ejecuta al salir
+        detener_precarga()
         print("="*70)
         print("Gracias por usar el sistema Pokédex")
         print("="*70 + "\n")
 
 
 if __name__ == "__main__":
+    # Con argumentos se ejecuta un solo comando (ver funciones/cli.py); sin ellos, el menú
+    # (que también se abre con opciones generales y sin comando, ej: --metricas, --perfilar DIR)
+    if len(sys.argv) > 1:
+        sys.exit(ejecutar_cli(sys.argv[1:], INICIO, main))
+
     try:
         main()
     except Exception as e: